@@ -19,11 +19,10 @@
 """
 import numba
 import numpy as np
-from scipy.interpolate import BSpline
-from scipy.optimize import minimize_scalar
+from scipy.interpolate import BSpline, PPoly
 
 from eemeter.common.adaptive_loss_tck import TCK
-from eemeter.common.utils import OoM_numba
+from eemeter.common.utils import OoM_numba, pairwise_sum
 
 LOSS_ALPHA_MIN = -100.0
 
@@ -374,10 +373,61 @@ ln_Z_fit = BSpline.construct_fast(*TCK)
 ln_Z_inf = 11.206072645530174
 
 
+def _ln_Z_table(spline):
+    """
+    Tabulates the spline as polynomial coefficients of each non-empty knot interval.
+    Coefficients are in decreasing order of power of (alpha - breakpoint).
+    """
+
+    ppoly = PPoly.from_spline(spline)
+    idx = np.flatnonzero(np.diff(ppoly.x) > 0)
+
+    breaks = np.ascontiguousarray(ppoly.x[idx], dtype=np.float64)
+    coeffs = np.ascontiguousarray(ppoly.c[:, idx].T, dtype=np.float64)
+
+    return breaks, coeffs
+
+
+# ln_Z_fit as a lookup table, max abs difference to the spline < 1E-12 within the knots, -100 <= alpha <= 100
+ln_Z_breaks, ln_Z_coeffs = _ln_Z_table(ln_Z_fit)
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def ln_Z_numba(alpha, alpha_min=-1e6):
+    """
+    Evaluates ln_Z from the lookup table of the spline's polynomial pieces. This is callable from numba code.
+    The polynomials of the first and last interval are used outside of the spline knots, as in the spline.
+
+    Parameters:
+    alpha (float): The alpha value for which Z is to be calculated.
+    alpha_min (float, optional): The minimum value of alpha. Defaults to -1E6.
+
+    Returns:
+    float: ln(Z) for the given alpha. If alpha is less than or equal to alpha_min,
+    the function returns the value at infinity, i.e. 11.2.
+    """
+
+    if alpha <= alpha_min:
+        return ln_Z_inf
+
+    i = np.searchsorted(ln_Z_breaks, alpha, side="right") - 1
+    i = min(max(i, 0), len(ln_Z_breaks) - 1)
+
+    dx = alpha - ln_Z_breaks[i]
+    c = ln_Z_coeffs[i]
+
+    res = c[0]
+    for j in range(1, len(c)):
+        res = res * dx + c[j]
+
+    return res
+
+
 def ln_Z(alpha, alpha_min=-1e6):
     """
     Function to fit a spline onto the data points. Since some points may have higher changes in their local neighborhood,
     we need to fit more points in that region via the spline. The spline is fit on the data points for alpha >= alpha_min.
+    The spline is evaluated from a lookup table, see ln_Z_numba.
 
     Parameters:
     alpha (float): The alpha value for which the spline of Z is to be calculated.
@@ -388,10 +438,7 @@ def ln_Z(alpha, alpha_min=-1e6):
     the function returns the value at infinity, i.e. 11.2.
     """
 
-    if alpha <= alpha_min:
-        return ln_Z_inf
-
-    return ln_Z_fit(alpha)
+    return ln_Z_numba(alpha, alpha_min)
 
 
 # penalize the loss function using approximate partition function
@@ -480,6 +527,194 @@ def alpha_scaled(s, a_max=2):
     return alpha
 
 
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _penalized_loss_sum(x, s):
+    """Sum of the penalized loss with alpha = alpha_scaled(s), as minimized over s"""
+
+    a = alpha_scaled(s)
+
+    loss = generalized_loss_fcn(x, a) + ln_Z_numba(a, LOSS_ALPHA_MIN)
+    if not np.isfinite(loss).all():
+        raise Exception("non-finite values in 'penalized_loss_fcn'")
+
+    return pairwise_sum(loss)
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _fminbound(
+    x, x1, x2, xatol=1e-5, maxiter=500, x0=np.nan, f0=np.nan, f1=np.nan, f2=np.nan
+):
+    """
+    Bounded Brent minimization of _penalized_loss_sum(x, s) over s in [x1, x2].
+    Without a starting point this follows scipy.optimize.minimize_scalar(method="Bounded") step for step.
+
+    If x0 and the losses at x0, x1 and x2 are given, the search starts from x0 with a parabolic step
+    through the three points rather than from the golden section of the bounds.
+
+    Returns:
+    tuple: The minimizer, the minimum and the number of function evaluations.
+    """
+
+    sqrt_eps = np.sqrt(2.2e-16)
+    golden_mean = 0.5 * (3.0 - np.sqrt(5.0))
+    a, b = x1, x2
+    if np.isfinite(x0):
+        xf = xi = x0
+        fx = f0
+        num = 0
+
+        # previous points are the bounds, the lower loss being the second best
+        if f1 <= f2:
+            nfc, fnfc, fulc, ffulc = x1, f1, x2, f2
+        else:
+            nfc, fnfc, fulc, ffulc = x2, f2, x1, f1
+
+        rat = e = b - a
+
+    else:
+        fulc = a + golden_mean * (b - a)
+        nfc, xf = fulc, fulc
+        rat = e = 0.0
+        xi = xf
+        fx = _penalized_loss_sum(x, xi)
+        num = 1
+
+        ffulc = fnfc = fx
+
+    xm = 0.5 * (a + b)
+    tol1 = sqrt_eps * np.abs(xf) + xatol / 3.0
+    tol2 = 2.0 * tol1
+
+    while np.abs(xf - xm) > (tol2 - 0.5 * (b - a)):
+        golden = True
+        # Check for parabolic fit
+        if np.abs(e) > tol1:
+            golden = False
+            r = (xf - nfc) * (fx - ffulc)
+            q = (xf - fulc) * (fx - fnfc)
+            p = (xf - fulc) * q - (xf - nfc) * r
+            q = 2.0 * (q - r)
+            if q > 0.0:
+                p = -p
+            q = np.abs(q)
+            r = e
+            e = rat
+
+            # Check for acceptability of parabola
+            if (
+                (np.abs(p) < np.abs(0.5 * q * r))
+                and (p > q * (a - xf))
+                and (p < q * (b - xf))
+            ):
+                rat = (p + 0.0) / q
+                xi = xf + rat
+
+                if ((xi - a) < tol2) or ((b - xi) < tol2):
+                    si = np.sign(xm - xf) + ((xm - xf) == 0)
+                    rat = tol1 * si
+            else:  # do a golden-section step
+                golden = True
+
+        if golden:  # do a golden-section step
+            if xf >= xm:
+                e = a - xf
+            else:
+                e = b - xf
+            rat = golden_mean * e
+
+        si = np.sign(rat) + (rat == 0)
+        xi = xf + si * max(np.abs(rat), tol1)
+        fu = _penalized_loss_sum(x, xi)
+        num += 1
+
+        if fu <= fx:
+            if xi >= xf:
+                a = xf
+            else:
+                b = xf
+            fulc, ffulc = nfc, fnfc
+            nfc, fnfc = xf, fx
+            xf, fx = xi, fu
+        else:
+            if xi < xf:
+                a = xi
+            else:
+                b = xi
+            if (fu <= fnfc) or (nfc == xf):
+                fulc, ffulc = nfc, fnfc
+                nfc, fnfc = xi, fu
+            elif (fu <= ffulc) or (fulc == xf) or (fulc == nfc):
+                fulc, ffulc = xi, fu
+
+        xm = 0.5 * (a + b)
+        tol1 = sqrt_eps * np.abs(xf) + xatol / 3.0
+        tol2 = 2.0 * tol1
+
+        if num >= maxiter:
+            break
+
+    return xf, fx, num
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def adaptive_alpha_solve(x, s0=np.nan, xatol=1e-5, s_step=0.02):
+    """
+    Finds the scaled alpha, s, minimizing the penalized loss of the standardized residuals x.
+    alpha is given by alpha_scaled(s).
+
+    Without a warm start (s0 is nan) this gives identical results to minimize_scalar over the
+    full bounds. With a warm start, the minimum is bracketed around s0 by expanding steps and then
+    refined within the bracket, which needs fewer loss evaluations when s0 is close to the solution.
+
+    Parameters:
+    x (numpy array): The standardized residuals.
+    s0 (float, optional): The previous solution used as a warm start. Default is nan (no warm start).
+    xatol (float, optional): Absolute tolerance of s. Default is 1e-5.
+    s_step (float, optional): Initial half-width of the warm start bracket. Default is 0.02.
+
+    Returns:
+    tuple: The scaled alpha s, the minimized loss and the number of loss evaluations.
+    """
+
+    s_min = -1e-5
+    s_max = 1 + 1e-5
+
+    if not np.isfinite(s0):
+        return _fminbound(x, s_min, s_max, xatol)
+
+    s0 = min(max(s0, s_min), s_max)
+    f0 = _penalized_loss_sum(x, s0)
+    num = 1
+
+    # bracket the minimum around s0
+    lo = hi = s0
+    f_lo = f_hi = f0
+    step = s_step
+    while True:
+        lo_new = max(s0 - step, s_min)
+        hi_new = min(s0 + step, s_max)
+        if lo_new < lo:
+            lo = lo_new
+            f_lo = _penalized_loss_sum(x, lo)
+            num += 1
+
+        if hi_new > hi:
+            hi = hi_new
+            f_hi = _penalized_loss_sum(x, hi)
+            num += 1
+
+        lo_bracketed = (f_lo > f0) or (lo == s_min)
+        hi_bracketed = (f_hi > f0) or (hi == s_max)
+        if lo_bracketed and hi_bracketed:
+            break
+
+        step *= 2
+
+    s, fun, num_bnd = _fminbound(x, lo, hi, xatol, 500, s0, f0, f_lo, f_hi)
+
+    return s, fun, num + num_bnd
+
+
 def adaptive_loss_fcn(x, mu=0, c=1, alpha="adaptive", replace_nonfinite=True):
     """
     This function calculates the adaptive loss function value and the alpha parameter.
@@ -506,16 +741,8 @@ def adaptive_loss_fcn(x, mu=0, c=1, alpha="adaptive", replace_nonfinite=True):
     ).sum()
 
     if alpha == "adaptive":  #
-        res = minimize_scalar(
-            lambda s: loss_alpha_fcn(alpha_scaled(s)),
-            bounds=[-1e-5, 1 + 1e-5],
-            method="Bounded",
-            options={"xatol": 1e-5},
-        )
-        loss_alpha = alpha_scaled(res.x)
-        # res = minimize(lambda s: loss_alpha_fcn(alpha_scaled(s[0])), x0=[0.7], bounds=[[0, 1]], method="L-BFGS-B")
-        # loss_alpha = alpha_scaled(res.x[0])
-        loss_fcn_val = res.fun
+        s, loss_fcn_val, _ = adaptive_alpha_solve(np.asarray(x, dtype=np.float64))
+        loss_alpha = alpha_scaled(s)
 
     else:
         loss_alpha = alpha
@@ -558,3 +785,70 @@ def adaptive_weights(
         )
 
     return generalized_loss_weights(x, a=alpha, min_weight=min_weight), C, alpha
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def adaptive_weights_fixed_alpha(x, alpha=2.0, sigma=3, quantile=0.25, min_weight=0.00):
+    """
+    Compiled equivalent of adaptive_weights for a fixed (numeric) alpha.
+
+    Parameters:
+    x (numpy.array): The input data.
+    alpha (float, optional): The alpha value for the loss function. Default is 2.0.
+    sigma (float, optional): The sigma threshold for outlier removal. Default is 3.
+    quantile (float, optional): The quantile for outlier removal. Default is 0.25.
+    min_weight (float, optional): The minimum weight. Default is 0.00.
+
+    Returns:
+    tuple: A tuple containing the generalized loss weights and C value.
+    """
+
+    # remove_outliers always uses quantile=0.25
+    outlier_bnds = IQR_outlier(x, None, sigma, 0.25)
+    x_no_outlier = x[(x >= outlier_bnds[0]) & (x <= outlier_bnds[1])]
+
+    mu = np.median(x_no_outlier)
+
+    C = get_C(x, mu, sigma, quantile)
+    x = (x - mu) / C
+
+    return generalized_loss_weights(x, alpha, min_weight), C
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def adaptive_weights_solve_alpha(
+    x, s0=np.nan, sigma=3, quantile=0.25, min_weight=0.00, replace_nonfinite=True
+):
+    """
+    Compiled equivalent of adaptive_weights for alpha="adaptive" that can be warm started.
+
+    Parameters:
+    x (numpy.array): The input data.
+    s0 (float, optional): The previous scaled alpha used as a warm start. Default is nan (no warm start).
+    sigma (float, optional): The sigma threshold for outlier removal. Default is 3.
+    quantile (float, optional): The quantile for outlier removal. Default is 0.25.
+    min_weight (float, optional): The minimum weight. Default is 0.00.
+    replace_nonfinite (bool, optional): Whether to replace non-finite values. Default is True.
+
+    Returns:
+    tuple: A tuple containing the generalized loss weights, C value, alpha value and scaled alpha.
+    """
+
+    # remove_outliers always uses quantile=0.25
+    outlier_bnds = IQR_outlier(x, None, sigma, 0.25)
+    x_no_outlier = x[(x >= outlier_bnds[0]) & (x <= outlier_bnds[1])]
+
+    mu = np.median(x_no_outlier)
+
+    C = get_C(x, mu, sigma, quantile)
+    x = (x - mu) / C
+
+    if replace_nonfinite:
+        finite = np.isfinite(x)
+        if not finite.all():
+            x[~finite] = np.max(x[finite])
+
+    s, _, _ = adaptive_alpha_solve(x, s0)
+    alpha = alpha_scaled(s)
+
+    return generalized_loss_weights(x, alpha, min_weight), C, alpha, s
@@ -277,3 +277,107 @@ def fast_std(x, weights=None, mean=None):
             mean = np.average(x, weights=weights)
 
         return weighted_std(x, weights, mean)
+
+
+@numba.jit(nopython=True, cache=True)
+def _pairwise_sum_block(x, start, n):
+    if n < 8:
+        res = 0.0
+        for i in range(start, start + n):
+            res += x[i]
+
+        return res
+
+    elif n <= 128:
+        r0, r1, r2, r3 = x[start], x[start + 1], x[start + 2], x[start + 3]
+        r4, r5, r6, r7 = x[start + 4], x[start + 5], x[start + 6], x[start + 7]
+
+        i = 8
+        while i < n - (n % 8):
+            j = start + i
+            r0 += x[j]
+            r1 += x[j + 1]
+            r2 += x[j + 2]
+            r3 += x[j + 3]
+            r4 += x[j + 4]
+            r5 += x[j + 5]
+            r6 += x[j + 6]
+            r7 += x[j + 7]
+            i += 8
+
+        res = ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+        while i < n:
+            res += x[start + i]
+            i += 1
+
+        return res
+
+    else:
+        n2 = n // 2
+        n2 -= n2 % 8
+
+        return _pairwise_sum_block(x, start, n2) + _pairwise_sum_block(
+            x, start + n2, n - n2
+        )
+
+
+@numba.jit(nopython=True, cache=True)
+def pairwise_sum(x):
+    """
+    Sum a 1D float array using the same pairwise summation order as numpy.
+
+    numba's np.sum accumulates sequentially, which can differ from numpy in the last bits.
+    This matches np.sum exactly for contiguous float64 arrays so that compiled code can
+    reproduce results calculated with numpy.
+
+    Parameters:
+    x (numpy.ndarray): The 1D input array.
+
+    Returns:
+    float: The sum of the array.
+    """
+
+    buffer_size = 8192  # numpy reduces in blocks of its default buffer size
+
+    res = 0.0
+    n = len(x)
+    for start in range(0, n, buffer_size):
+        res += _pairwise_sum_block(x, start, min(buffer_size, n - start))
+
+    return res
+
+
+@numba.jit(nopython=True, cache=True)
+def fast_std_numba(x, weights):
+    """
+    Compiled equivalent of fast_std(x, weights) with mean=None.
+
+    Like fast_std, weights may be normalized in place by weighted_std.
+
+    Parameters:
+    x (numpy.ndarray): The input array for which the standard deviation is to be calculated.
+    weights (numpy.ndarray): An array of weights for the input array.
+
+    Returns:
+    float: The calculated standard deviation.
+    """
+
+    n = len(x)
+
+    equal_weights = True
+    if len(weights) > 1:
+        for w in weights:
+            if not np.abs(w - weights[0]) <= 1e-8:  # np.allclose(w - w[0], 0)
+                equal_weights = False
+                break
+
+    if equal_weights:  # np.std(x)
+        mean = pairwise_sum(x) / n
+        resid = x - mean
+
+        return np.sqrt(pairwise_sum(resid * resid) / n)
+
+    else:  # np.average(x, weights=weights)
+        mean = pairwise_sum(x * weights) / pairwise_sum(weights)
+
+        return weighted_std(x, weights, mean)
@@ -19,4 +19,5 @@
 """
 
 from eemeter.eemeter.models import *
+from eemeter.eemeter.common.temperature_cache import *
 from eemeter.eemeter.utilities import *
@@ -181,6 +181,195 @@ def clean_billing_data(data, source_interval, warnings):
     return data["value"].to_frame()
 
 
+def _resample_labels(start, end, freq, origin="start_day"):
+    """Labels of the bins of ``resample(freq, origin=origin)`` over a series which
+    starts at `start` and ends at `end`."""
+    index = pd.DatetimeIndex([start, end])
+    return pd.Series(0, index=index).resample(freq, origin=origin).count().index
+
+
+def _grid_position(edges, start, step, n_points):
+    """Number of the grid points ``start + k * step``, ``0 <= k < n_points``, that
+    are earlier than each edge."""
+    offsets = edges.asi8 - start.value
+    return np.clip(-(-offsets // step.value), 0, n_points)
+
+
+def _is_left_closed_freq(freq):
+    grouper = pd.Grouper(freq=freq)
+    return grouper.closed == "left" and grouper.label == "left"
+
+
+def _interval_overlaps(codes, times, values, label_codes, labels, step, series_type):
+    """Sums and atomic counts of the source intervals that overlap each bin, for
+    many series at once.
+
+    The series are concatenated in order of their codes, as are their bin
+    labels, and `times` and `labels` are integer nanoseconds. The source
+    timestamps and bin labels split time into pieces which each lie in one
+    source interval and one bin, and the number of atomic grid points in each
+    piece is a difference of grid positions on the grid of its series, which
+    starts at its first timestamp. The first label of a series must not be
+    later than its first timestamp.
+
+    Returns
+    -------
+    totals : :any:`numpy.ndarray`
+        The sum of the atomic values in each bin, with 'cumulative' values
+        spread over their interval.
+    n_coverage : :any:`numpy.ndarray`
+        The number of non-null atomic values in each bin.
+    """
+    new_series = np.r_[True, codes[1:] != codes[:-1]]
+    last = np.r_[new_series[1:], True]
+
+    if series_type == "cumulative":
+        timedeltas = pd.TimedeltaIndex(np.append(np.diff(times), 0)).where(~last)
+        spread_factor = step.total_seconds() / timedeltas.total_seconds()
+        values = values * spread_factor.to_numpy()
+
+    grid_starts = np.zeros(codes[-1] + 1, dtype=np.int64)
+    grid_starts[codes[new_series]] = times[new_series]
+    n_atomic = np.zeros(codes[-1] + 1, dtype=np.int64)
+    n_atomic[codes[new_series]] = (times[last] - times[new_series]) // step.value + 1
+
+    # a timestamp sorts before a coincident label, and the last of the two is
+    # kept with both running indices set
+    n_times = times.size
+    is_label = np.r_[np.zeros(n_times, dtype=bool), np.ones(labels.size, dtype=bool)]
+    boundary_codes = np.r_[codes, label_codes]
+    boundaries = np.r_[times, labels]
+    order = np.lexsort((is_label, boundaries, boundary_codes))
+    sources = np.maximum.accumulate(
+        np.r_[np.arange(n_times), np.full(labels.size, -1)][order]
+    )
+    bins = np.maximum.accumulate(
+        np.r_[np.full(n_times, -1), np.arange(labels.size)][order]
+    )
+    boundary_codes = boundary_codes[order]
+    boundaries = boundaries[order]
+    keep = np.r_[
+        (boundary_codes[1:] != boundary_codes[:-1])
+        | (boundaries[1:] != boundaries[:-1]),
+        True,
+    ]
+    sources, bins = sources[keep], bins[keep]
+    boundary_codes, boundaries = boundary_codes[keep], boundaries[keep]
+
+    positions = np.clip(
+        -(-(boundaries - grid_starts[boundary_codes]) // step.value),
+        0,
+        n_atomic[boundary_codes],
+    )
+    series_last = np.r_[boundary_codes[1:] != boundary_codes[:-1], True]
+    next_positions = np.append(positions[1:], 0)
+    next_positions[series_last] = n_atomic[boundary_codes[series_last]]
+    counts = next_positions - positions
+
+    piece_values = np.where(sources >= 0, values[sources], np.nan)
+    covered = (counts > 0) & ~np.isnan(piece_values)
+    n_coverage = np.bincount(
+        bins[covered], weights=counts[covered], minlength=labels.size
+    ).astype(np.int64)
+    totals = np.bincount(
+        bins[covered],
+        weights=counts[covered] * piece_values[covered],
+        minlength=labels.size,
+    )
+    return totals, n_coverage
+
+
+def _resample_interval_overlaps(
+    series, freq, atomic_freq, series_type, origin="start_day"
+):
+    """Resample a series from the overlaps of its intervals with the target bins.
+
+    This gives the same result as forward filling `series` onto an `atomic_freq`
+    grid which starts at its first timestamp (spreading 'cumulative' values over
+    their interval) and resampling that to `freq`, without materializing the
+    atomic grid, see `_interval_overlaps`.
+
+    Returns
+    -------
+    resampled : :any:`pandas.Series`
+        The sum ('cumulative') or mean ('instantaneous') of each bin, NaN if the
+        bin has no non-null atomic values.
+    n_coverage : :any:`pandas.Series`
+        The number of non-null atomic values in each bin.
+    """
+    step = pd.Timedelta(atomic_freq)
+    times = series.index
+    start = times[0]
+    n_atomic = (times[-1] - start) // step + 1
+    labels = _resample_labels(start, start + (n_atomic - 1) * step, freq, origin)
+    labels = labels.rename(times.name)
+
+    totals, n_coverage = _interval_overlaps(
+        np.zeros(len(times), dtype=np.int64),
+        times.asi8,
+        series.to_numpy(dtype=float),
+        np.zeros(len(labels), dtype=np.int64),
+        labels.asi8,
+        step,
+        series_type,
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if series_type == "cumulative":
+            resampled = np.where(n_coverage > 0, totals, np.nan)
+        else:
+            resampled = np.where(n_coverage > 0, totals / n_coverage, np.nan)
+
+    return (
+        pd.Series(resampled, index=labels, name=series.name),
+        pd.Series(n_coverage, index=labels, name=series.name),
+    )
+
+
+def _coverage_totals(index, freq, atomic_freq):
+    """Number of atomic intervals in each bin, as counted by
+    ``resampled.resample(atomic_freq).count().resample(freq).count()`` for a
+    series resampled to `freq` with the given index."""
+    step = pd.Timedelta(atomic_freq)
+    grid_start = _resample_labels(index[0], index[0], atomic_freq)[0]
+    n_grid = (index[-1] - grid_start) // step + 1
+    labels = _resample_labels(grid_start, grid_start + (n_grid - 1) * step, freq)
+    n_total = np.diff(
+        np.append(_grid_position(labels, grid_start, step, n_grid), n_grid)
+    )
+    return pd.Series(n_total, index=labels)
+
+
+def _instantaneous_last_bin(series, label, atomic_freq="1 Min"):
+    """Last row of ``as_freq(series, freq, atomic_freq, "instantaneous",
+    include_coverage=True)`` for a series whose last bin starts at `label`, on
+    the atomic grid of the series, without resampling the earlier bins."""
+    step = pd.Timedelta(atomic_freq)
+    times = series.index
+    first = times.searchsorted(label, side="right") - 1
+    values = series.to_numpy(dtype=float)[first:]
+    n_atomic = (times[-1] - label) // step + 1
+    offsets = np.maximum(times.asi8[first:], label.value) - label.value
+    counts = np.diff(
+        np.append(np.clip(-(-offsets // step.value), 0, n_atomic), n_atomic)
+    )
+
+    covered = (counts > 0) & ~np.isnan(values)
+    n_coverage = counts[covered].sum()
+    total = np.bincount(
+        np.zeros(covered.sum(), dtype=int),
+        weights=counts[covered] * values[covered],
+        minlength=1,
+    )[0]
+    value = total / n_coverage if n_coverage > 0 else np.nan
+
+    # the last bin has a coverage total of one atomic interval, see as_freq
+    return pd.DataFrame(
+        {"value": [value], "coverage": [min(float(n_coverage), 1.0)]},
+        index=pd.DatetimeIndex([label], name=times.name),
+    )
+
+
 def as_freq(
     data_series,
     freq,
@@ -193,11 +382,13 @@ def as_freq(
     This method can be used to upsample or downsample meter data. The
     assumption it makes to do so is that meter data is constant and averaged
     over the given periods. For instance, to convert billing-period data to
-    daily data, this method first upsamples to the atomic frequency
-    (1 minute freqency, by default), "spreading" usage evenly across all
-    minutes in each period. Then it downsamples to hourly frequency and
-    returns that result. With instantaneous series, the data is copied to all
-    contiguous time intervals and the mean over `freq` is returned.
+    daily data, usage is "spread" evenly across all atomic intervals (1 minute
+    by default) in each period, and the atomic intervals in each day are summed.
+    With instantaneous series, the data is copied to all contiguous time
+    intervals and the mean over `freq` is returned. For frequencies with bins
+    closed on the left (e.g., 'H', 'D' or 'MS'), this is computed from the
+    overlaps of the source periods with each bin rather than by materializing
+    the atomic series.
 
     **Caveats**:
 
@@ -215,9 +406,8 @@ def as_freq(
         The frequency to resample to. This should be given in a form recognized
         by the :any:`pandas.Series.resample` method.
     atomic_freq : :any:`str`, optional
-        The "atomic" frequency of the intermediate data form. This can be
-        adjusted to a higher atomic frequency to increase speed or memory
-        performance.
+        The "atomic" frequency at which source periods are divided between
+        target periods.
     series_type : :any:`str`, {'cumulative', ‘instantaneous’},
         default 'cumulative'
         Type of data sampling. 'cumulative' data can be spread over smaller
@@ -247,8 +437,14 @@ def as_freq(
     timedeltas = (series.index[1:] - series.index[:-1]).append(
         pd.TimedeltaIndex([pd.NaT])
     )
+    exact = _is_left_closed_freq(freq)
 
-    if series_type == "cumulative":
+    if exact and series_type in ["cumulative", "instantaneous"]:
+        resampled, n_coverage = _resample_interval_overlaps(
+            series, freq, atomic_freq, series_type, origin=series.index[0]
+        )
+
+    elif series_type == "cumulative":
         spread_factor = target_freq.total_seconds() / timedeltas.total_seconds()
         series_spread = series * spread_factor
         atomic_series = series_spread.asfreq(atomic_freq, method="ffill")
@@ -281,7 +477,10 @@ def as_freq(
             .mean()
         )
     if include_coverage:
-        n_total = resampled.resample(atomic_freq).count().resample(freq).count()
+        if exact:
+            n_total = _coverage_totals(resampled.index, freq, atomic_freq)
+        else:
+            n_total = resampled.resample(atomic_freq).count().resample(freq).count()
         resampled = resampled.to_frame("value")
         resampled["coverage"] = n_coverage / n_total
 
@@ -295,20 +494,21 @@ def as_freq(
         return resampled
 
 
+def _missing_high_frequency_meter_data_warning(days):
+    return EEMeterWarning(
+        qualified_name="eemeter.sufficiency_criteria.missing_high_frequency_meter_data",
+        description=("More than 50% of the high frequency Meter data is missing."),
+        data=[timestamp.isoformat() for timestamp in days],
+    )
+
+
 def downsample_and_clean_daily_data(dataset, warnings):
     dataset = as_freq(dataset, "D", include_coverage=True)
 
     if not dataset[dataset.coverage <= 0.5].empty:
         warnings.append(
-            EEMeterWarning(
-                qualified_name="eemeter.sufficiency_criteria.missing_high_frequency_meter_data",
-                description=(
-                    "More than 50% of the high frequency Meter data is missing."
-                ),
-                data=[
-                    timestamp.isoformat()
-                    for timestamp in dataset[dataset.coverage <= 0.5].index
-                ],
+            _missing_high_frequency_meter_data_warning(
+                dataset[dataset.coverage <= 0.5].index
             )
         )
 
@@ -381,6 +581,14 @@ def compute_minimum_granularity(index: pd.Series, default_granularity: Optional[
     return min_granularity
 
 
+def _no_data_warning():
+    return EEMeterWarning(
+        qualified_name="eemeter.sufficiency_criteria.no_data",
+        description=("No data available."),
+        data={},
+    )
+
+
 def sufficiency_criteria_baseline(
     data,
     requested_start=None,
@@ -394,19 +602,12 @@ def sufficiency_criteria_baseline(
     """
     Refer to usage_per_day.py in eemeter/caltrack/ folder
     """
-    warnings = []
-    if data.dropna().empty:
-        warnings.append(
-            EEMeterWarning(
-                qualified_name="eemeter.sufficiency_criteria.no_data",
-                description=("No data available."),
-                data={},
-            )
-        )
-        return data, warnings, []
+    non_null_data_index = data.dropna().index
+    if non_null_data_index.empty:
+        return data, [_no_data_warning()], []
 
-    data_start = data.dropna().index.min()
-    data_end = data.dropna().index.max()
+    data_start = non_null_data_index.min()
+    data_end = non_null_data_index.max()
     n_days_data = (
         data_end - data_start
     ).days + 1  # TODO confirm. no longer using last row nan
@@ -464,21 +665,10 @@ def sufficiency_criteria_baseline(
 
     n_days_total = n_days_data + n_days_start_gap + n_days_end_gap
 
+    n_negative_meter_values = None
     if not is_reporting_data and not is_electricity_data:
-        n_negative_meter_values = data.observed[data.observed < 0].shape[0]
-
         # TODO : This check should only be done for non electric data
-        if n_negative_meter_values > 0:
-            # CalTrack 2.3.5
-            critical_warnings.append(
-                EEMeterWarning(
-                    qualified_name=(
-                        "eemeter.sufficiency_criteria" ".negative_meter_values"
-                    ),
-                    description=("Found negative meter data values"),
-                    data={"n_negative_meter_values": n_negative_meter_values},
-                )
-            )
+        n_negative_meter_values = data.observed[data.observed < 0].shape[0]
 
     # TODO(philngo): detect and report unsorted or repeated values.
 
@@ -500,19 +690,99 @@ def sufficiency_criteria_baseline(
     row_day_counts = day_counts(data.index)
 
     # apply masks, giving total
+    n_valid_meter_value_days = None
     if not is_reporting_data:
         n_valid_meter_value_days = int((valid_meter_value_rows * row_day_counts).sum())
     n_valid_temperature_days = int((valid_temperature_rows * row_day_counts).sum())
     n_valid_days = int((valid_rows * row_day_counts).sum())
 
+    observed_statistics = None
     if not is_reporting_data:
         median = data.observed.median()
         upper_quantile = data.observed.quantile(0.75)
         lower_quantile = data.observed.quantile(0.25)
         iqr = upper_quantile - lower_quantile
         extreme_value_limit = median + (3 * iqr)
-        n_extreme_values = data.observed[data.observed > extreme_value_limit].shape[0]
-        max_value = float(data.observed.max())
+        observed_statistics = {
+            "n_extreme_values": data.observed[
+                data.observed > extreme_value_limit
+            ].shape[0],
+            "median": median,
+            "upper_quantile": upper_quantile,
+            "lower_quantile": lower_quantile,
+            "extreme_value_limit": extreme_value_limit,
+            "max_value": float(data.observed.max()),
+        }
+
+    # Check for 90% for individual months present:
+    non_null_temp_percentage_per_month = (
+        data["temperature"].notna().groupby(data.index.month).mean()
+    )
+    missing_monthly_temperature_data = (
+        non_null_temp_percentage_per_month < min_fraction_daily_coverage
+    ).any()
+
+    # if not is_reporting_data:
+    #     non_null_meter_percentage_per_month = data['observed'].groupby(data.index.month).apply(lambda x: x.notna().mean())
+    #     if (non_null_meter_percentage_per_month < min_fraction_daily_coverage).any():
+    #         critical_warnings.append(
+    #             EEMeterWarning(
+    #                 qualified_name="eemeter.sufficiency_criteria.missing_monthly_meter_data",
+    #                 description=("More than 10% of the monthly meter data is missing."),
+    #                 data={
+    #                     #TODO report percentage
+    #                 },
+    #             )
+    #         )
+
+    # TODO : Check 90% of seasons & weekday/weekend available?
+
+    criteria_warnings, non_critical_warnings = _sufficiency_warnings(
+        n_days_total,
+        n_valid_days,
+        n_valid_meter_value_days,
+        n_valid_temperature_days,
+        n_negative_meter_values,
+        missing_monthly_temperature_data,
+        observed_statistics,
+        num_days=num_days,
+        min_fraction_daily_coverage=min_fraction_daily_coverage,
+        is_reporting_data=is_reporting_data,
+    )
+    critical_warnings.extend(criteria_warnings)
+
+    return data, critical_warnings, non_critical_warnings
+
+
+def _sufficiency_warnings(
+    n_days_total,
+    n_valid_days,
+    n_valid_meter_value_days,
+    n_valid_temperature_days,
+    n_negative_meter_values,
+    missing_monthly_temperature_data,
+    observed_statistics,
+    num_days,
+    min_fraction_daily_coverage,
+    is_reporting_data,
+):
+    """Critical and non critical warnings of the sufficiency criteria, from the
+    day counts and meter statistics that `sufficiency_criteria_baseline` takes
+    from the data. The meter arguments are None for reporting data."""
+    critical_warnings = []
+    non_critical_warnings = []
+
+    if n_negative_meter_values is not None and n_negative_meter_values > 0:
+        # CalTrack 2.3.5
+        critical_warnings.append(
+            EEMeterWarning(
+                qualified_name=(
+                    "eemeter.sufficiency_criteria" ".negative_meter_values"
+                ),
+                description=("Found negative meter data values"),
+                data={"n_negative_meter_values": n_negative_meter_values},
+            )
+        )
 
     if n_days_total > 0:
         if not is_reporting_data:
@@ -593,11 +863,7 @@ def sufficiency_criteria_baseline(
             )
         )
 
-    # Check for 90% for individual months present:
-    non_null_temp_percentage_per_month = (
-        data["temperature"].groupby(data.index.month).apply(lambda x: x.notna().mean())
-    )
-    if (non_null_temp_percentage_per_month < min_fraction_daily_coverage).any():
+    if missing_monthly_temperature_data:
         critical_warnings.append(
             EEMeterWarning(
                 qualified_name="eemeter.sufficiency_criteria.missing_monthly_temperature_data",
@@ -610,22 +876,7 @@ def sufficiency_criteria_baseline(
             )
         )
 
-    # if not is_reporting_data:
-    #     non_null_meter_percentage_per_month = data['observed'].groupby(data.index.month).apply(lambda x: x.notna().mean())
-    #     if (non_null_meter_percentage_per_month < min_fraction_daily_coverage).any():
-    #         critical_warnings.append(
-    #             EEMeterWarning(
-    #                 qualified_name="eemeter.sufficiency_criteria.missing_monthly_meter_data",
-    #                 description=("More than 10% of the monthly meter data is missing."),
-    #                 data={
-    #                     #TODO report percentage
-    #                 },
-    #             )
-    #         )
-
-    # TODO : Check 90% of seasons & weekday/weekend available?
-
-    if not is_reporting_data and n_extreme_values > 0:
+    if observed_statistics is not None and observed_statistics["n_extreme_values"] > 0:
         # CalTRACK 2.3.6
         non_critical_warnings.append(
             EEMeterWarning(
@@ -636,15 +887,179 @@ def sufficiency_criteria_baseline(
                     "Extreme values (greater than (median + (3 * IQR)),"
                     " must be flagged for manual review."
                 ),
-                data={
-                    "n_extreme_values": n_extreme_values,
-                    "median": median,
-                    "upper_quantile": upper_quantile,
-                    "lower_quantile": lower_quantile,
-                    "extreme_value_limit": extreme_value_limit,
-                    "max_value": max_value,
-                },
+                data=dict(observed_statistics),
             )
         )
 
-    return data, critical_warnings, non_critical_warnings
+    return critical_warnings, non_critical_warnings
+
+
+def _equal_length_segments(starts, lengths):
+    """Segments of a concatenated array grouped by their length, as the indices
+    of the segments and a matrix of their positions with one row per segment.
+
+    A reduction over the rows of the matrix gives the same result as over each
+    segment on its own, including the pairwise summation of `numpy.sum` that
+    `pandas.Series.sum` uses.
+    """
+    for length in np.unique(lengths):
+        segments = np.flatnonzero(lengths == length)
+        yield segments, starts[segments, np.newaxis] + np.arange(length)
+
+
+def _grouped_sufficiency_criteria_baseline(
+    starts,
+    index,
+    observed,
+    temperature,
+    temperature_not_null,
+    temperature_null,
+    num_days=365,
+    min_fraction_daily_coverage=0.9,
+    min_fraction_hourly_temperature_coverage_per_period=0.9,
+    is_reporting_data=False,
+    is_electricity_data=True,
+):
+    """
+    `sufficiency_criteria_baseline` for the data of many meters at once.
+
+    The rows of each meter are contiguous and start at its entry of `starts`.
+    They stand for the `data` of the meter: `index` is the timezone aware index
+    of all the rows and the other arguments are their columns, with `observed`
+    all NaN for a meter without an observed column. Any other column of `data`
+    is taken to be non null. Requested start and end dates are not supported.
+
+    Returns
+    -------
+    list
+        The critical and non critical warnings of each meter, or None for
+        baseline data without an observed column, for which
+        `sufficiency_criteria_baseline` raises.
+    """
+    n_meters = starts.size
+    lengths = np.diff(np.append(starts, len(index)))
+    codes = np.repeat(np.arange(n_meters), lengths)
+    last = np.zeros(len(index), dtype=bool)
+    last[starts + lengths - 1] = True
+    times = index.values.astype("datetime64[ns]").view(np.int64)
+
+    observed_not_null = ~np.isnan(observed)
+    has_observed = np.bincount(codes[observed_not_null], minlength=n_meters) > 0
+    non_null = (
+        ~np.isnan(temperature)
+        & ~np.isnan(temperature_not_null)
+        & ~np.isnan(temperature_null)
+        & (observed_not_null | ~has_observed[codes])
+    )
+
+    # days from the first to the last non null row of each meter
+    non_null_rows = np.flatnonzero(non_null)
+    non_null_codes = codes[non_null_rows]
+    new_meter = np.r_[True, non_null_codes[1:] != non_null_codes[:-1]]
+    has_data = np.zeros(n_meters, dtype=bool)
+    has_data[non_null_codes[new_meter]] = True
+    n_days_total = np.zeros(n_meters, dtype=np.int64)
+    n_days_total[non_null_codes[new_meter]] = (
+        times[non_null_rows[np.r_[new_meter[1:], True]]]
+        - times[non_null_rows[new_meter]]
+    ) // pd.Timedelta(days=1).value + 1
+
+    n_negative_meter_values = np.bincount(codes[observed < 0], minlength=n_meters)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid_temperature_rows = (
+            temperature_not_null / (temperature_not_null + temperature_null)
+        ) > min_fraction_hourly_temperature_coverage_per_period
+    valid_rows = valid_temperature_rows & (observed_not_null | is_reporting_data)
+
+    # days per row as day_counts gives them, where the NaN of the last row of a
+    # meter is skipped by the sum
+    row_day_counts = pd.TimedeltaIndex(
+        np.append(np.diff(times), 0)
+    ).total_seconds().to_numpy() / (60 * 60 * 24)
+    row_day_counts[last] = 0
+
+    def _n_valid_days(valid):
+        weighted_days = np.where(valid, row_day_counts, 0.0)
+        n_valid_days = np.zeros(n_meters)
+        for segments, rows in _equal_length_segments(starts, lengths):
+            n_valid_days[segments] = weighted_days[rows].sum(axis=1)
+        return n_valid_days
+
+    n_valid_meter_value_days = _n_valid_days(observed_not_null)
+    n_valid_temperature_days = _n_valid_days(valid_temperature_rows)
+    n_valid_days = _n_valid_days(valid_rows)
+
+    # statistics of the non null meter values of each meter
+    observed_codes = codes[observed_not_null]
+    observed_values = observed[observed_not_null]
+    n_observed = np.bincount(observed_codes, minlength=n_meters)
+    observed_starts = np.cumsum(n_observed) - n_observed
+    median, upper_quantile, lower_quantile, max_value = np.full((4, n_meters), np.nan)
+    observed_meters = np.flatnonzero(has_observed)
+    for segments, rows in _equal_length_segments(
+        observed_starts[observed_meters], n_observed[observed_meters]
+    ):
+        segments = observed_meters[segments]
+        values = observed_values[rows]
+        median[segments] = np.median(values, axis=1)
+        upper_quantile[segments], lower_quantile[segments] = np.percentile(
+            values, [75.0, 25.0], axis=1
+        )
+        max_value[segments] = values.max(axis=1)
+    iqr = upper_quantile - lower_quantile
+    extreme_value_limit = median + (3 * iqr)
+    n_extreme_values = np.bincount(
+        observed_codes[observed_values > extreme_value_limit[observed_codes]],
+        minlength=n_meters,
+    )
+
+    # Check for 90% for individual months present:
+    meter_months = codes * 12 + index.month.to_numpy() - 1
+    n_month_rows = np.bincount(meter_months, minlength=n_meters * 12)
+    n_month_not_null = np.bincount(
+        meter_months[~np.isnan(temperature)], minlength=n_meters * 12
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        missing_months = (n_month_rows > 0) & (
+            n_month_not_null / n_month_rows < min_fraction_daily_coverage
+        )
+    missing_monthly_temperature_data = missing_months.reshape(n_meters, 12).any(axis=1)
+
+    results = []
+    for code in range(n_meters):
+        if not has_data[code]:
+            results.append(([_no_data_warning()], []))
+            continue
+        if not is_reporting_data and not has_observed[code]:
+            results.append(None)
+            continue
+
+        observed_statistics = None
+        if not is_reporting_data:
+            observed_statistics = {
+                "n_extreme_values": int(n_extreme_values[code]),
+                "median": median[code],
+                "upper_quantile": upper_quantile[code],
+                "lower_quantile": lower_quantile[code],
+                "extreme_value_limit": extreme_value_limit[code],
+                "max_value": float(max_value[code]),
+            }
+        results.append(
+            _sufficiency_warnings(
+                int(n_days_total[code]),
+                int(n_valid_days[code]),
+                None if is_reporting_data else int(n_valid_meter_value_days[code]),
+                int(n_valid_temperature_days[code]),
+                None
+                if is_reporting_data or is_electricity_data
+                else int(n_negative_meter_values[code]),
+                missing_monthly_temperature_data[code],
+                observed_statistics,
+                num_days=num_days,
+                min_fraction_daily_coverage=min_fraction_daily_coverage,
+                is_reporting_data=is_reporting_data,
+            )
+        )
+
+    return results
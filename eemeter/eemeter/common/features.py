@@ -296,6 +296,264 @@ def _degree_day_columns(
     return agg_funcs
 
 
+def _grouped_temperature_features(
+    meter_data_index,
+    temperature_data,
+    tolerance,
+    heating_balance_points,
+    cooling_balance_points,
+    data_quality,
+    temperature_mean,
+    degree_day_method,
+    percent_hourly_coverage_per_day,
+    percent_hourly_coverage_per_billing_period,
+    use_mean_daily_values,
+):
+    # Reference groupby implementation of the daily/billing route, used when the
+    # meter index is not sorted, see compute_temperature_features.
+    temp_agg_funcs = []
+    temp_agg_column_renames = {}
+
+    # heating/cooling degree day aggregations. Needed for n_days fields as well.
+    temp_agg_funcs.extend(
+        _degree_day_columns(
+            heating_balance_points=heating_balance_points,
+            cooling_balance_points=cooling_balance_points,
+            degree_day_method=degree_day_method,
+            percent_hourly_coverage_per_day=percent_hourly_coverage_per_day,
+            percent_hourly_coverage_per_billing_period=percent_hourly_coverage_per_billing_period,
+            use_mean_daily_values=use_mean_daily_values,
+        )
+    )
+    temp_agg_column_renames.update(
+        {("temp", "degree_day_columns"): "degree_day_columns"}
+    )
+
+    if data_quality:
+        temp_agg_funcs.extend(
+            [("not_null", "count"), ("null", lambda x: x.isnull().sum())]
+        )
+        temp_agg_column_renames.update(
+            {
+                ("temp", "not_null"): "temperature_not_null",
+                ("temp", "null"): "temperature_null",
+            }
+        )
+
+    if temperature_mean:
+        temp_agg_funcs.extend([("mean", "mean")])
+        temp_agg_column_renames.update({("temp", "mean"): "temperature_mean"})
+
+    # aggregate temperatures
+    temp_df = temperature_data.to_frame("temp")
+    temp_groups = _matching_groups(meter_data_index, temp_df, tolerance)
+    temp_aggregations = temp_groups.agg({"temp": temp_agg_funcs})
+
+    # expand temp aggregations by faking and deleting the `meter_value` column.
+    # I haven't yet figured out a way to avoid this and get the desired
+    # structure and behavior. (philngo)
+    meter_value = pd.DataFrame({"meter_value": 0}, index=meter_data_index)
+    df = pd.concat([meter_value, temp_aggregations], axis=1).rename(
+        columns=temp_agg_column_renames
+    )
+    del df["meter_value"]
+
+    if "degree_day_columns" in df:
+        if df["degree_day_columns"].dropna().empty:
+            column_defaults = {
+                column: np.full(df["degree_day_columns"].shape, np.nan)
+                for column in ["n_days_dropped", "n_days_kept"]
+            }
+            df = df.drop(["degree_day_columns"], axis=1).assign(**column_defaults)
+        else:
+            df = pd.concat(
+                [
+                    df.drop(["degree_day_columns"], axis=1),
+                    df["degree_day_columns"].dropna().apply(pd.Series),
+                ],
+                axis=1,
+            )
+
+    return df
+
+
+def _epoch_nanoseconds(index):
+    # integer nanoseconds since the epoch of a timezone aware index, whatever
+    # its timezone or resolution
+    return index.values.astype("datetime64[ns]", copy=False).view(np.int64)
+
+
+def _compensated_segment_means(values, segment_starts, n_not_null):
+    # means of the non-null values of each contiguous segment, summed in row
+    # order with the compensated summation of the pandas groupby mean so they
+    # match the groupby path bit for bit. Segments of up to a day of rows are
+    # summed side by side one row position at a time; longer ones (billing
+    # periods) go through the groupby itself, whose row loop is faster there.
+    lengths = np.diff(np.r_[segment_starts, values.size])
+    width = lengths.max()
+    segments = np.arange(segment_starts.size)
+    if width > 24:
+        return pd.Series(values).groupby(np.repeat(segments, lengths)).mean().to_numpy()
+
+    if (lengths == width).all():
+        matrix = values.reshape(segment_starts.size, width)
+    else:
+        positions = np.arange(values.size) - np.repeat(segment_starts, lengths)
+        matrix = np.full((segment_starts.size, width), np.nan)
+        matrix[np.repeat(segments, lengths), positions] = values
+    sums = np.zeros(segment_starts.size)
+    compensation = np.zeros(segment_starts.size)
+    for column in matrix.T:
+        valid = ~np.isnan(column)
+        y = column - compensation
+        t = sums + y
+        compensation = np.where(valid, t - sums - y, compensation)
+        sums = np.where(valid, t, sums)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / n_not_null
+
+
+def _period_temperature_features(
+    meter_data_index,
+    temperature_data,
+    tolerance,
+    heating_balance_points,
+    cooling_balance_points,
+    data_quality,
+    temperature_mean,
+    degree_day_method,
+    percent_hourly_coverage_per_day,
+    percent_hourly_coverage_per_billing_period,
+    use_mean_daily_values,
+):
+    # Vectorized equivalent of :any:`_grouped_temperature_features`. Each
+    # temperature is assigned to the closest previous meter period (within
+    # tolerance), which keeps the rows of every period contiguous, so all
+    # aggregates are segment sums over period (and 24-row "day") boundaries.
+    if degree_day_method not in ("daily", "hourly"):
+        raise ValueError("method not supported: {}".format(degree_day_method))
+
+    period_starts = _epoch_nanoseconds(meter_data_index)
+    temperature_times = _epoch_nanoseconds(temperature_data.index)
+    temps = temperature_data.to_numpy(dtype=float)
+
+    periods = np.searchsorted(period_starts, temperature_times, side="right") - 1
+    matched = periods >= 0
+    if tolerance is not None:
+        lag = temperature_times - period_starts[np.maximum(periods, 0)]
+        matched &= lag <= pd.Timedelta(tolerance).value
+    periods = periods[matched]
+    temps = temps[matched]
+
+    index = meter_data_index.rename(None)
+    if periods.size == 0:
+        empty_columns = []
+        if data_quality:
+            empty_columns.extend(["temperature_not_null", "temperature_null"])
+        if temperature_mean:
+            empty_columns.append("temperature_mean")
+        empty_columns.extend(["n_days_dropped", "n_days_kept"])
+        return pd.DataFrame(np.nan, index=index, columns=empty_columns)
+
+    # first row of each matched period
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    rows = periods[starts]
+    n_rows = np.diff(np.r_[starts, periods.size])
+
+    not_null = ~np.isnan(temps)
+    filled_temps = np.where(not_null, temps, 0.0)
+    n_not_null = np.add.reduceat(not_null.astype(np.int64), starts)
+
+    means = _compensated_segment_means(temps, starts, n_not_null)
+
+    columns = {}
+    if data_quality:
+        columns["temperature_not_null"] = n_not_null
+        columns["temperature_null"] = n_rows - n_not_null
+    if temperature_mean:
+        columns["temperature_mean"] = means
+
+    balance_points = np.array(
+        list(cooling_balance_points) + list(heating_balance_points), dtype=float
+    )
+    # +1 for cooling (temp - bp), -1 for heating (bp - temp)
+    signs = np.r_[
+        np.ones(len(cooling_balance_points)), -np.ones(len(heating_balance_points))
+    ][:, np.newaxis]
+    bp_columns = ["cdd_%s" % bp for bp in cooling_balance_points] + [
+        "hdd_%s" % bp for bp in heating_balance_points
+    ]
+
+    def _degree_days(temperatures):
+        # balance point x temperature matrix of degree days
+        return np.maximum(signs * (temperatures - balance_points[:, np.newaxis]), 0)
+
+    if degree_day_method == "hourly":
+        columns["n_hours_kept"] = n_not_null
+        columns["n_hours_dropped"] = n_rows - n_not_null
+        if use_mean_daily_values:
+            n_days = 1
+        else:
+            n_days = n_rows / 24.0
+        degree_days = np.where(not_null, _degree_days(filled_temps), 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            degree_days = (
+                np.add.reduceat(degree_days, starts, axis=1) / n_not_null * n_days
+            )
+    else:
+        # CalTRACK 2.2.2.3
+        n_limit_daily = 24 * percent_hourly_coverage_per_day
+
+        # split periods into consecutive 24 row days
+        period_position = np.arange(periods.size) - np.repeat(starts, n_rows)
+        day_starts = np.flatnonzero(period_position % 24 == 0)
+        n_days_total = -(-n_rows // 24)
+        day_periods = np.repeat(np.arange(starts.size), n_days_total)
+        period_day_starts = np.cumsum(n_days_total) - n_days_total
+        day_n_not_null = np.add.reduceat(not_null.astype(np.int64), day_starts)
+        day_means = _compensated_segment_means(temps, day_starts, day_n_not_null)
+
+        multi_day = n_rows > 24
+        # CalTrack 2.2.3.2
+        n_limit_period = percent_hourly_coverage_per_billing_period * n_rows
+        period_covered = n_not_null >= n_limit_period
+        # CalTRACK 2.2.2.3
+        day_kept = (day_n_not_null > n_limit_daily) & period_covered[day_periods]
+        n_days_kept = np.add.reduceat(day_kept.astype(np.int64), period_day_starts)
+
+        # single day periods count all rows, null or not, towards coverage
+        single_day_kept = n_rows > n_limit_daily
+        n_days_kept = np.where(multi_day, n_days_kept, single_day_kept)
+        columns["n_days_kept"] = n_days_kept
+        columns["n_days_dropped"] = n_days_total - n_days_kept
+
+        if use_mean_daily_values:
+            n_days = 1
+        else:
+            n_days = n_days_total
+
+        # mean degree days over the kept days of each period
+        kept_days = np.flatnonzero(day_kept)
+        kept_periods = day_periods[kept_days]
+        kept_starts = np.flatnonzero(np.r_[True, kept_periods[1:] != kept_periods[:-1]])
+        degree_days = np.full((balance_points.size, starts.size), np.nan)
+        if kept_days.size > 0:
+            degree_days[:, kept_periods[kept_starts]] = np.add.reduceat(
+                _degree_days(day_means[kept_days]), kept_starts, axis=1
+            )
+        degree_days = degree_days / n_days_kept * n_days
+
+        # CalTrack 3.3.4.1.1, 3.3.5.1.1
+        single_day_degree_days = np.where(single_day_kept, _degree_days(means), np.nan)
+        degree_days = np.where(multi_day, degree_days, single_day_degree_days)
+
+    columns.update(zip(bp_columns, degree_days))
+
+    values = np.full((len(index), len(columns)), np.nan)
+    values[rows] = np.column_stack(list(columns.values()))
+    return pd.DataFrame(values, index=index, columns=list(columns))
+
+
 def compute_temperature_features(
     meter_data_index,
     temperature_data,
@@ -411,9 +669,6 @@ def compute_temperature_features(
     if meter_data_index.duplicated().any():
         raise ValueError("Duplicates found in input meter trace index.")
 
-    temp_agg_funcs = []
-    temp_agg_column_renames = {}
-
     if heating_balance_points is None:
         heating_balance_points = []
     if cooling_balance_points is None:
@@ -477,65 +732,27 @@ def compute_temperature_features(
             del df["temperature_mean"]
     else:
         # daily/billing route
-        # heating/cooling degree day aggregations. Needed for n_days fields as well.
-        temp_agg_funcs.extend(
-            _degree_day_columns(
-                heating_balance_points=heating_balance_points,
-                cooling_balance_points=cooling_balance_points,
-                degree_day_method=degree_day_method,
-                percent_hourly_coverage_per_day=percent_hourly_coverage_per_day,
-                percent_hourly_coverage_per_billing_period=percent_hourly_coverage_per_billing_period,
-                use_mean_daily_values=use_mean_daily_values,
-            )
+        aggregate_kwargs = dict(
+            meter_data_index=meter_data_index,
+            temperature_data=temperature_data,
+            tolerance=tolerance,
+            heating_balance_points=heating_balance_points,
+            cooling_balance_points=cooling_balance_points,
+            data_quality=data_quality,
+            temperature_mean=temperature_mean,
+            degree_day_method=degree_day_method,
+            percent_hourly_coverage_per_day=percent_hourly_coverage_per_day,
+            percent_hourly_coverage_per_billing_period=percent_hourly_coverage_per_billing_period,
+            use_mean_daily_values=use_mean_daily_values,
         )
-        temp_agg_column_renames.update(
-            {("temp", "degree_day_columns"): "degree_day_columns"}
-        )
-
-        if data_quality:
-            temp_agg_funcs.extend(
-                [("not_null", "count"), ("null", lambda x: x.isnull().sum())]
-            )
-            temp_agg_column_renames.update(
-                {
-                    ("temp", "not_null"): "temperature_not_null",
-                    ("temp", "null"): "temperature_null",
-                }
-            )
-
-        if temperature_mean:
-            temp_agg_funcs.extend([("mean", "mean")])
-            temp_agg_column_renames.update({("temp", "mean"): "temperature_mean"})
-
-        # aggregate temperatures
-        temp_df = temperature_data.to_frame("temp")
-        temp_groups = _matching_groups(meter_data_index, temp_df, tolerance)
-        temp_aggregations = temp_groups.agg({"temp": temp_agg_funcs})
-
-        # expand temp aggregations by faking and deleting the `meter_value` column.
-        # I haven't yet figured out a way to avoid this and get the desired
-        # structure and behavior. (philngo)
-        meter_value = pd.DataFrame({"meter_value": 0}, index=meter_data_index)
-        df = pd.concat([meter_value, temp_aggregations], axis=1).rename(
-            columns=temp_agg_column_renames
-        )
-        del df["meter_value"]
-
-        if "degree_day_columns" in df:
-            if df["degree_day_columns"].dropna().empty:
-                column_defaults = {
-                    column: np.full(df["degree_day_columns"].shape, np.nan)
-                    for column in ["n_days_dropped", "n_days_kept"]
-                }
-                df = df.drop(["degree_day_columns"], axis=1).assign(**column_defaults)
-            else:
-                df = pd.concat(
-                    [
-                        df.drop(["degree_day_columns"], axis=1),
-                        df["degree_day_columns"].dropna().apply(pd.Series),
-                    ],
-                    axis=1,
-                )
+        if meter_data_index.is_monotonic_increasing:
+            df = _period_temperature_features(**aggregate_kwargs)
+        else:
+            # periods are matched to temperatures by a binary search over the
+            # meter index, which needs it sorted. Unsorted indexes go through
+            # the merge_asof of the groupby path, which raises for them as it
+            # always has.
+            df = _grouped_temperature_features(**aggregate_kwargs)
 
     if not keep_partial_nan_rows:
         df = overwrite_partial_rows_with_nan(df)
@@ -579,6 +796,68 @@ def _estimate_hour_of_week_occupancy(model_data, threshold):
     )  # guarantee an index value for all hours
 
 
+def _estimate_hour_of_week_occupancy_batched(data, segment_weights, threshold):
+    """Estimate occupancy for many segments at once.
+
+    Solves every segment's weighted least squares ("meter_value ~ cdd_65 + hdd_50")
+    from its 3x3 normal equations and counts positive residuals per hour of week
+    with :any:`numpy.bincount`. Gives the same lookup as calling
+    ``_estimate_hour_of_week_occupancy`` on each segment.
+    """
+    index = pd.CategoricalIndex(range(168))
+    n_segments = segment_weights.shape[1]
+
+    y = data["meter_value"].to_numpy(dtype=float)
+    X = np.column_stack(
+        [
+            np.ones(len(data)),
+            data["cdd_65"].to_numpy(dtype=float),
+            data["hdd_50"].to_numpy(dtype=float),
+        ]
+    )
+    # rows with nan weights or weights <= 0 are not part of a segment
+    in_segment = np.nan_to_num(segment_weights, nan=0.0) > 0
+    complete_rows = data.notna().all(axis=1).to_numpy()
+    model_rows = ~(np.isnan(y) | np.isnan(X).any(axis=1))
+
+    W = np.where(in_segment & model_rows[:, None], segment_weights, 0.0)
+    X = np.where(model_rows[:, None], X, 0.0)
+    y = np.where(model_rows, y, 0.0)
+
+    xtwx = np.einsum("ns,ni,nj->sij", W, X, X)
+    xtwy = np.einsum("ns,ni->si", W, X * y[:, None])
+    params = np.einsum("sij,sj->si", np.linalg.pinv(xtwx), xtwy)
+    positive_residuals = (y[:, None] - X @ params.T) > 0
+
+    # hours of week outside of 0-167 are dropped from the lookup
+    hour_of_week = pd.Index(range(168)).get_indexer(
+        np.asarray(data["hour_of_week"], dtype=float)
+    )
+    counted = (in_segment & model_rows[:, None]) & (hour_of_week >= 0)[:, None]
+    rows, segments = np.nonzero(counted)
+    bins = hour_of_week[rows] * n_segments + segments
+    n_residuals = np.bincount(bins, minlength=168 * n_segments)
+    n_positive_residuals = np.bincount(
+        bins,
+        weights=positive_residuals[rows, segments].astype(float),
+        minlength=168 * n_segments,
+    )
+    n_residuals = n_residuals.reshape(168, n_segments)
+    n_positive_residuals = n_positive_residuals.reshape(168, n_segments)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio_positive_residuals = n_positive_residuals / n_residuals
+    # hours of week without residuals are marked occupied
+    occupancy = (ratio_positive_residuals > threshold) | (n_residuals == 0)
+
+    return [
+        pd.Series(np.nan, index=index, name="occupancy")
+        if not (in_segment[:, i] & complete_rows).any()
+        else pd.Series(occupancy[:, i], index=index, name="occupancy")
+        for i in range(n_segments)
+    ]
+
+
 def estimate_hour_of_week_occupancy(data, segmentation=None, threshold=0.65):
     """Estimate occupancy features for each segment.
 
@@ -608,74 +887,68 @@ def estimate_hour_of_week_occupancy(data, segmentation=None, threshold=0.65):
         labeled by its segment name.
     """
 
-    occupancy_lookups = {}
-    segmented_datasets = iterate_segmented_dataset(data, segmentation)
-    for segment_name, segmented_data in segmented_datasets:
-        hour_of_week_occupancy = _estimate_hour_of_week_occupancy(
-            segmented_data, threshold
-        )
-        column = "occupancy" if segment_name is None else segment_name
-        occupancy_lookups[column] = hour_of_week_occupancy
+    if segmentation is None:
+        columns = ["occupancy"]
+        segment_weights = np.ones((len(data), 1))
+    else:
+        columns = segmentation.columns
+        segment_weights = segmentation.reindex(data.index).to_numpy(dtype=float)
+
+    hour_of_week_occupancies = _estimate_hour_of_week_occupancy_batched(
+        data, segment_weights, threshold
+    )
     # make sure columns stay in same order
-    columns = ["occupancy"] if segmentation is None else segmentation.columns
+    occupancy_lookups = dict(zip(columns, hour_of_week_occupancies))
     return pd.DataFrame(occupancy_lookups, columns=columns)
 
 
 def _fit_temperature_bins(temperature_data, default_bins, min_temperature_count):
-    def _compute_temp_summary(bins):
-        bins = [-np.inf] + bins + [np.inf]
-        bin_intervals = [
-            pd.Interval(bin_left, bin_right, closed="right")
-            for bin_left, bin_right in zip(bins, bins[1:])
-        ]
-        temp_bins = pd.cut(temperature_data, bins=bins).cat.set_categories(
-            bin_intervals
-        )
-        return (
-            pd.DataFrame({"temp": temperature_data, "bin": temp_bins})
-            .groupby("bin", observed=False)["temp"]
-            .count()
-            .rename("count")
-            .sort_index()
-        )
+    temperatures = np.asarray(temperature_data, dtype=float)
+    temperatures = np.sort(temperatures[~np.isnan(temperatures)])
+
+    # bins are closed on the right, so the number of temperatures at or below each
+    # endpoint gives every bin count as a difference of neighboring endpoints
+    test_bins = sorted(set(default_bins))
+    cumulative_counts = dict(
+        zip(test_bins, np.searchsorted(temperatures, test_bins, side="right"))
+    )
+    lowest_count = np.searchsorted(temperatures, -np.inf, side="right")
+
+    def _bin_counts(bins):
+        counts = [lowest_count] + [cumulative_counts[b] for b in bins]
+        return np.diff(counts + [len(temperatures)])
 
-    def _find_endpoints_to_remove(temp_summary):
-        if len(temp_summary) == 1:
+    def _find_endpoints_to_remove(bins):
+        if len(bins) == 0:
             return set()
 
-        def _bin_count_invalid(i):
-            count = temp_summary.iloc[i]
-            return count < min_temperature_count or np.isnan(count)
+        bin_count_invalid = _bin_counts(bins) < min_temperature_count
 
         # work from outside in assuming less density at distribution edges
         endpoints = set()
 
-        if _bin_count_invalid(0):  # first
-            endpoints.add(temp_summary.index[0].right)
+        if bin_count_invalid[0]:  # first
+            endpoints.add(bins[0])
 
-        if _bin_count_invalid(-1):  # last
-            endpoints.add(temp_summary.index[-1].left)
+        if bin_count_invalid[-1]:  # last
+            endpoints.add(bins[-1])
 
         if len(endpoints) == 0:
             # try points in middle
-            for i in range(1, len(temp_summary) - 1):
-                if _bin_count_invalid(i):
-                    endpoints.add(temp_summary.index[i].right)
+            for i in range(1, len(bins)):
+                if bin_count_invalid[i]:
+                    endpoints.add(bins[i])
 
         return endpoints
 
-    test_bins = set(default_bins)
-
     while True:
-        temp_summary = _compute_temp_summary(sorted(test_bins))
-        endpoints_to_remove = _find_endpoints_to_remove(temp_summary)
+        endpoints_to_remove = _find_endpoints_to_remove(test_bins)
 
         if len(endpoints_to_remove) == 0:
             break
-        for endpoint in endpoints_to_remove:
-            test_bins.discard(endpoint)
+        test_bins = [b for b in test_bins if b not in endpoints_to_remove]
 
-    return sorted(test_bins)
+    return test_bins
 
 
 def fit_temperature_bins(
@@ -716,10 +989,14 @@ def fit_temperature_bins(
 
     if occupancy_lookup is None:
         segmented_bins = {}
-        segmented_datasets = iterate_segmented_dataset(data, segmentation)
-        for segment_name, segmented_data in segmented_datasets:
+        segmented_datasets = iterate_segmented_dataset(
+            data, segmentation, segment_views=True
+        )
+        for segment_name, segment_view in segmented_datasets:
             segmented_bins[segment_name] = _fit_temperature_bins(
-                segmented_data.temperature_mean, default_bins, min_temperature_count
+                data.temperature_mean.iloc[segment_view.rows],
+                default_bins,
+                min_temperature_count,
             )
 
         if segmentation is None:
@@ -740,8 +1017,11 @@ def fit_temperature_bins(
     else:
         occupied_segmented_bins = {}
         unoccupied_segmented_bins = {}
-        segmented_datasets = iterate_segmented_dataset(data, segmentation)
-        for segment_name, segmented_data in segmented_datasets:
+        segmented_datasets = iterate_segmented_dataset(
+            data, segmentation, segment_views=True
+        )
+        for segment_name, segment_view in segmented_datasets:
+            segmented_data = segment_view.to_frame(["temperature_mean"])
             hourly_segmented_data = segmented_data.resample("H").mean(numeric_only=True)
             time_features = compute_time_features(
                 hourly_segmented_data.index,
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2024 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from eemeter.eemeter.common.data_processor_utilities import as_freq
+from eemeter.eemeter.common.features import compute_temperature_features
+
+__all__ = ("TemperatureFeatureCache", "WeatherStation")
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_station_frequencies = ("D", "H")
+
+
+class TemperatureFeatureCache:
+    """Bounded least recently used cache of weather station temperature features.
+
+    Entries are keyed by station, timezone and target frequency (see
+    :any:`WeatherStation`), so the features computed from a station's series
+    are shared by the meters the station serves.
+
+    Parameters
+    ----------
+    maxsize : :any:`int`, optional
+        Maximum number of entries held in memory. The least recently used entry
+        is evicted when it is exceeded.
+    path : :any:`str` or :any:`pathlib.Path`, optional
+        Directory in which entries are persisted between runs. Entries missing
+        from memory are loaded from it before they are computed, and computed
+        entries are written to it. Entries are pickled, so only use a
+        directory you trust.
+
+    The cache can be shared between threads. Concurrent misses on the same key
+    may each compute the entry, and the last one computed is kept.
+    """
+
+    def __init__(self, maxsize=128, path=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+
+        self.maxsize = maxsize
+        self.path = None if path is None else Path(path)
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the entry for `key`, calling `compute()` to create it on a miss.
+
+        Entries loaded from `path` count as hits. Returned entries are shared
+        and should not be modified.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+
+        # loading and computing happen outside of the lock, so that other
+        # keys can be served meanwhile
+        value = self._load(key)
+        hit = value is not None
+        if not hit:
+            value = compute()
+            self._dump(key, value)
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def cache_info(self):
+        """Hits, misses, maximum size and current size of the in-memory cache."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """Empty the in-memory cache and reset its statistics. Persisted entries
+        are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _file(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.path / "{}.pkl".format(digest)
+
+    def _load(self, key):
+        if self.path is None:
+            return None
+
+        file = self._file(key)
+        if not file.exists():
+            return None
+
+        stored_key, value = pd.read_pickle(file)
+        # guards against digest collisions
+        return value if stored_key == key else None
+
+    def _dump(self, key, value):
+        if self.path is None:
+            return
+
+        # write then rename, so that concurrent runs never read partial files
+        file = self._file(key)
+        tmp_file = file.with_suffix(".{}.tmp".format(os.getpid()))
+        pd.to_pickle((key, value), tmp_file)
+        os.replace(tmp_file, file)
+
+
+_default_cache = TemperatureFeatureCache()
+
+
+def _station_temperature_features(temperature_data, tz, freq):
+    """Temperature features of every local day ('D') or hour ('H') spanned by the
+    station series in timezone `tz`, as the data classes compute them for the
+    periods of a meter."""
+    temperature_data = _valid_temperature(temperature_data.tz_convert(tz))
+    if freq == "H":
+        # hourly data classes resample the temperature to hourly means
+        temperature_data = temperature_data.resample("H").mean()
+
+    start = temperature_data.index.min().floor(freq)
+    end = temperature_data.index.max().floor(freq)
+    if freq == "H":
+        index = pd.date_range(start, end + pd.Timedelta(hours=1), freq="H")
+    else:
+        # the buffer day absorbs the nan last row convention, as in the data classes
+        index = pd.date_range(start, end, freq="D").union([end + pd.Timedelta(days=1)])
+
+    features = compute_temperature_features(index, temperature_data, data_quality=True)
+    return features.iloc[:-1]
+
+
+def _station_resampled_temperature(temperature_data, tz):
+    """Daily mean temperature and coverage of the station series in timezone `tz`,
+    as ``as_freq`` resamples a series which starts at a local midnight."""
+    temperature_data = _valid_temperature(temperature_data.tz_convert(tz))
+    start = temperature_data.index[0].normalize()
+    if start != temperature_data.index[0]:
+        # anchors the days at midnight without covering the minutes before the
+        # first reading
+        temperature_data = pd.concat(
+            [pd.Series(np.nan, index=pd.DatetimeIndex([start])), temperature_data]
+        )
+
+    return as_freq(
+        temperature_data, "D", series_type="instantaneous", include_coverage=True
+    )
+
+
+def _valid_temperature(temperature_data):
+    # same edge trim as the data class from_series constructors
+    return temperature_data.loc[
+        temperature_data.first_valid_index() : temperature_data.last_valid_index()
+    ]
+
+
+class WeatherStation:
+    """Handle to the temperature series of a weather station, which shares the
+    temperature features computed from it between the meters it serves.
+
+    Pass it to the ``from_series`` constructors of the daily, billing and
+    hourly data classes in place of the temperature series. Hourly data uses
+    the cached hourly mean temperatures. Daily and billing data take the
+    features of the local days they span from the cache, both for hourly
+    temperature series and for series which are resampled with
+    :any:`eemeter.as_freq`, and only compute the last period for each meter.
+    They fall back to computing all the features from the series when a
+    meter's periods do not start at local midnights, when the meter's
+    timestamps add rows to the temperature data on those days, or for daily
+    temperature series, so a meter gets the same data as from the raw series.
+
+    The daily data classes also take it in place of the temperature array of
+    ``from_arrays``, which then uses the station's daily means and coverage
+    resampled from local midnights. The dataframe constructors of the data
+    classes take the temperature as a column of the input and do not accept a
+    station.
+
+    Parameters
+    ----------
+    temperature_data : :any:`pandas.Series` or :any:`pandas.DataFrame`
+        Timezone aware temperature series of the station, in Fahrenheit. A
+        dataframe's first column is used.
+    station_id : :any:`str`, optional
+        Identifier of the station. It must identify the series uniquely among
+        everything sharing the cache, and across runs if the cache is
+        persisted. If not given, a content hash of the series is used.
+    cache : :any:`TemperatureFeatureCache`, optional
+        Cache for the station's features. Defaults to a cache shared by all
+        stations.
+    """
+
+    def __init__(self, temperature_data, station_id=None, cache=None):
+        if isinstance(temperature_data, pd.DataFrame):
+            temperature_data = temperature_data.iloc[:, 0]
+        if not isinstance(temperature_data.index, pd.DatetimeIndex):
+            raise ValueError("Temperature data must have a DatetimeIndex.")
+        if temperature_data.index.tz is None:
+            raise ValueError("Temperature data is missing timezone information.")
+        if temperature_data.empty:
+            raise ValueError("Temperature data cannot be empty.")
+
+        self.temperature_data = temperature_data
+        self.station_id = station_id
+        self.cache = _default_cache if cache is None else cache
+        self._key = None
+        self._times = None
+
+    def __repr__(self):
+        return "WeatherStation({})".format(self.key)
+
+    @property
+    def key(self):
+        """The station id, or a content hash of the series if there is none."""
+        if self._key is None:
+            if self.station_id is not None:
+                self._key = str(self.station_id)
+            else:
+                digest = hashlib.sha1(self.temperature_data.index.asi8.tobytes())
+                digest.update(self.temperature_data.to_numpy(dtype=float).tobytes())
+                self._key = "sha1:{}".format(digest.hexdigest())
+        return self._key
+
+    def temperature_features(self, tz, freq="D"):
+        """Temperature features of the station in timezone `tz`.
+
+        Parameters
+        ----------
+        tz : :any:`str` or tzinfo
+            Timezone of the periods.
+        freq : :any:`str`, {'D', 'H'}, default 'D'
+            Local days ('D') or hours ('H').
+
+        Returns
+        -------
+        features : :any:`pandas.DataFrame`
+            Temperature features as computed by
+            :any:`eemeter.compute_temperature_features` with
+            ``data_quality=True`` for every period spanned by the series. The
+            dataframe is shared through the cache and should not be modified.
+        """
+        if freq not in _station_frequencies:
+            raise ValueError(
+                "freq must be one of {}".format(list(_station_frequencies))
+            )
+
+        return self.cache.get(
+            (self.key, str(tz), freq),
+            lambda: _station_temperature_features(self.temperature_data, tz, freq),
+        )
+
+    def resampled_temperature(self, tz):
+        """Daily mean temperature of the station in timezone `tz`, resampled with
+        :any:`eemeter.as_freq` from every local midnight.
+
+        Parameters
+        ----------
+        tz : :any:`str` or tzinfo
+            Timezone of the days.
+
+        Returns
+        -------
+        resampled : :any:`pandas.DataFrame`
+            The 'value' and 'coverage' columns of ``as_freq(...,
+            series_type="instantaneous", include_coverage=True)`` for every
+            day spanned by the series. The dataframe is shared through the
+            cache and should not be modified.
+        """
+        return self.cache.get(
+            (self.key, str(tz), "as_freq"),
+            lambda: _station_resampled_temperature(self.temperature_data, tz),
+        )
+
+    def _matches_rows(self, index, start, end):
+        """Whether the timestamps of `index` in [start, end) are exactly the
+        timestamps of the station there, so that features of the days between
+        them can be taken from the cache."""
+        if self._times is None:
+            self._times = np.sort(_valid_temperature(self.temperature_data).index.asi8)
+
+        times = index.asi8
+        rows = times[
+            np.searchsorted(times, start.value) : np.searchsorted(times, end.value)
+        ]
+        station_rows = self._times[
+            np.searchsorted(self._times, start.value) : np.searchsorted(
+                self._times, end.value
+            )
+        ]
+        return np.array_equal(rows, station_rows)
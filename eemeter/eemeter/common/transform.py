@@ -23,6 +23,11 @@ import numpy as np
 import pandas as pd
 import pytz
 
+from .data_processor_utilities import (
+    _coverage_totals,
+    _is_left_closed_freq,
+    _resample_interval_overlaps,
+)
 from .exceptions import NoBaselineDataError, NoReportingDataError
 from .warnings import EEMeterWarning
 
@@ -77,11 +82,13 @@ def as_freq(
     This method can be used to upsample or downsample meter data. The
     assumption it makes to do so is that meter data is constant and averaged
     over the given periods. For instance, to convert billing-period data to
-    daily data, this method first upsamples to the atomic frequency
-    (1 minute freqency, by default), "spreading" usage evenly across all
-    minutes in each period. Then it downsamples to hourly frequency and
-    returns that result. With instantaneous series, the data is copied to all
-    contiguous time intervals and the mean over `freq` is returned.
+    daily data, usage is "spread" evenly across all atomic intervals (1 minute
+    by default) in each period, and the atomic intervals in each day are summed.
+    With instantaneous series, the data is copied to all contiguous time
+    intervals and the mean over `freq` is returned. For frequencies with bins
+    closed on the left (e.g., 'H', 'D' or 'MS'), this is computed from the
+    overlaps of the source periods with each bin rather than by materializing
+    the atomic series.
 
     **Caveats**:
 
@@ -99,9 +106,8 @@ def as_freq(
         The frequency to resample to. This should be given in a form recognized
         by the :any:`pandas.Series.resample` method.
     atomic_freq : :any:`str`, optional
-        The "atomic" frequency of the intermediate data form. This can be
-        adjusted to a higher atomic frequency to increase speed or memory
-        performance.
+        The "atomic" frequency at which source periods are divided between
+        target periods.
     series_type : :any:`str`, {'cumulative', ‘instantaneous’},
         default 'cumulative'
         Type of data sampling. 'cumulative' data can be spread over smaller
@@ -131,8 +137,14 @@ def as_freq(
     timedeltas = (series.index[1:] - series.index[:-1]).append(
         pd.TimedeltaIndex([pd.NaT])
     )
+    exact = _is_left_closed_freq(freq)
+
+    if exact and series_type in ["cumulative", "instantaneous"]:
+        resampled, n_coverage = _resample_interval_overlaps(
+            series, freq, atomic_freq, series_type
+        )
 
-    if series_type == "cumulative":
+    elif series_type == "cumulative":
         spread_factor = target_freq.total_seconds() / timedeltas.total_seconds()
         series_spread = series * spread_factor
         atomic_series = series_spread.asfreq(atomic_freq, method="ffill")
@@ -154,7 +166,10 @@ def as_freq(
             .mean()
         )
     if include_coverage:
-        n_total = resampled.resample(atomic_freq).count().resample(freq).count()
+        if exact:
+            n_total = _coverage_totals(resampled.index, freq, atomic_freq)
+        else:
+            n_total = resampled.resample(atomic_freq).count().resample(freq).count()
         resampled = resampled.to_frame("value")
         resampled["coverage"] = n_coverage / n_total
         return resampled
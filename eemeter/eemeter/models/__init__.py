@@ -21,3 +21,4 @@
 from .hourly import *
 from .daily import *
 from .billing import *
+from .fleet import *
@@ -29,7 +29,7 @@ from eemeter.eemeter.common.data_processor_utilities import (
     compute_minimum_granularity,
     sufficiency_criteria_baseline,
 )
-from eemeter.eemeter.common.features import compute_temperature_features
+from eemeter.eemeter.common.temperature_cache import WeatherStation
 from eemeter.eemeter.common.warnings import EEMeterWarning
 from eemeter.eemeter.models.daily.data import _DailyData
 
@@ -175,9 +175,7 @@ class _BillingData(_DailyData):
             # TODO consider disallowing this until a later patch
             if temp_series.index.freq != "D":
                 # Downsample / Upsample the temperature data to daily
-                temperature_features = as_freq(
-                    temp_series, "D", series_type="instantaneous", include_coverage=True
-                )
+                temperature_features = self._resampled_temperature(temp_series)
                 # If high frequency data check for 50% data coverage in rollup
                 if len(temperature_features[temperature_features.coverage <= 0.5]) > 0:
                     self.warnings.append(
@@ -222,16 +220,9 @@ class _BillingData(_DailyData):
             temperature_features["n_days_kept"] = 0  # unused
             temperature_features["n_days_dropped"] = 0  # unused
         else:
-            if not meter_index.empty:
-                buffer_idx = meter_index.max() + pd.Timedelta(days=1)
-                meter_index = meter_index.union([buffer_idx])
-
-            temperature_features = compute_temperature_features(
-                meter_index,
-                temp_series,
-                data_quality=True,
+            temperature_features = self._hourly_temperature_features(
+                meter_index, temp_series
             )
-            temperature_features = temperature_features[:-1]
             # Only check for high frequency temperature data if it exists
             # TODO this check causes weird behavior with very sparse temp data.
             # will still get DQ'd, but final df receives non-nan temperatures
@@ -385,7 +376,7 @@ class BillingReportingData(_BillingData):
     def from_series(
         cls,
         meter_data: Optional[Union[pd.Series, pd.DataFrame]],
-        temperature_data: Union[pd.Series, pd.DataFrame],
+        temperature_data: Union[pd.Series, pd.DataFrame, WeatherStation],
         is_electricity_data: Optional[bool] = None,
         tzinfo=None,
     ):
@@ -397,8 +388,8 @@ class BillingReportingData(_BillingData):
 
         - meter_data: pd.Series or pd.DataFrame (Optional attribute)
             The meter data to be used for the BillingReportingData instance.
-        - temperature_data: pd.Series or pd.DataFrame (Required)
-            The temperature data to be used for the BillingReportingData instance.
+        - temperature_data: pd.Series or pd.DataFrame or WeatherStation (Required)
+            The temperature data to be used for the BillingReportingData instance, or the handle of its weather station.
         - is_electricity_data: bool (Optional)
             Flag indicating whether the meter data represents electricity data.
         - tzinfo: tz (optional)
@@ -419,9 +410,11 @@ class BillingReportingData(_BillingData):
                 "Must specify is_electricity_data when passing meter data."
             )
         if meter_data is None:
-            meter_data = pd.DataFrame(
-                {"observed": np.nan}, index=temperature_data.index
-            )
+            if isinstance(temperature_data, WeatherStation):
+                temperature_index = temperature_data.temperature_data.index
+            else:
+                temperature_index = temperature_data.index
+            meter_data = pd.DataFrame({"observed": np.nan}, index=temperature_index)
             if tzinfo:
                 meter_data = meter_data.tz_convert(tzinfo)
         if meter_data.empty:
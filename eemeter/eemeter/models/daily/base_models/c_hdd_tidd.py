@@ -31,12 +31,16 @@ from eemeter.eemeter.models.daily.objective_function import obj_fcn_decorator
 from eemeter.eemeter.models.daily.optimize import Optimizer, nlopt_algorithms
 from eemeter.eemeter.models.daily.parameters import ModelCoefficients, ModelType
 from eemeter.eemeter.models.daily.utilities.base_model import (
+    cumulative_sums,
     fix_identical_bnds,
     get_intercept,
     get_slope,
     get_T_bnds,
+    grid_search_candidates,
     linear_fit,
+    refine_grid_candidates,
 )
+from eemeter.eemeter.models.daily.utilities.config import InitialGuessAlgorithmChoice
 
 
 def fit_c_hdd_tidd(
@@ -141,8 +145,18 @@ def fit_c_hdd_tidd(
         model_fcn = _c_hdd_tidd
         weight_fcn = _c_hdd_tidd_weight
         TSS_fcn = _c_hdd_tidd_total_sum_of_squares
+    model_key = "c_hdd_tidd_smooth" if smooth else "c_hdd_tidd"
     obj_fcn = obj_fcn_decorator(
-        model_fcn, weight_fcn, TSS_fcn, T, obs, settings, alpha, coef_id, initial_fit
+        model_fcn,
+        weight_fcn,
+        TSS_fcn,
+        T,
+        obs,
+        settings,
+        alpha,
+        coef_id,
+        initial_fit,
+        model_key,
     )
     res = Optimizer(
         obj_fcn, x0.to_np_array(), bnds, coef_id, settings, opt_options
@@ -378,9 +392,6 @@ def _c_hdd_tidd_bp0(T, obs, alpha, settings, min_weight=0.0):
 
         return bp_obj_fcn
 
-    algorithm = nlopt_algorithms[settings.initial_guess_algorithm_choice]
-    # algorithm = nlopt.GN_DIRECT
-
     obj_fcn = bp_obj_fcn_dec(T, obs)
 
     T_min = T[min_T_idx - 1]
@@ -390,6 +401,22 @@ def _c_hdd_tidd_bp0(T, obs, alpha, settings, min_weight=0.0):
     x0 = np.array([T_range * 0.5]) + T_min
     bnds = np.array([[T_min, T_max]]).T
 
+    if (
+        settings.initial_guess_algorithm_choice
+        == InitialGuessAlgorithmChoice.GRID_SEARCH
+    ):
+        bp = grid_search_candidates(T, T_min, T_max)
+        scores = _c_hdd_tidd_grid_scores(T, obs, bp)
+
+        x_opt = refine_grid_candidates(
+            obj_fcn, bp[:, None], scores, bnds, initial_step=T_range * 0.05
+        )
+
+        return x_opt[0]
+
+    algorithm = nlopt_algorithms[settings.initial_guess_algorithm_choice]
+    # algorithm = nlopt.GN_DIRECT
+
     opt = nlopt.opt(algorithm, int(len(x0)))
     opt.set_min_objective(obj_fcn)
 
@@ -405,6 +432,72 @@ def _c_hdd_tidd_bp0(T, obs, alpha, settings, min_weight=0.0):
     return x_opt[0]
 
 
+def _c_hdd_tidd_grid_scores(T, obs, c_hdd_bp):
+    """
+    Approximates the breakpoint objective function for an array of breakpoints in one pass.
+
+    The slopes and intercepts are chosen as in the alpha = 2 breakpoint objective function and
+    the sum of squared residuals is calculated from cumulative sums over the sorted temperatures.
+
+    Parameters:
+    T (array-like): The sorted temperature array.
+    obs (array-like): The observation array sorted by temperature.
+    c_hdd_bp (array-like): The breakpoints.
+
+    Returns:
+    numpy array: The approximate objective function value of each breakpoint.
+    """
+
+    N = len(T)
+
+    # center data to limit cancellation in the sums
+    T_offset = np.mean(T)
+    obs_offset = np.mean(obs)
+    S = cumulative_sums(T - T_offset, obs - obs_offset)
+
+    idx_lt = np.searchsorted(T, c_hdd_bp, side="left")  # T < bp
+    idx_le = np.searchsorted(T, c_hdd_bp, side="right")  # T <= bp
+
+    def region_sums(start, stop):
+        return S[:, stop] - S[:, start]
+
+    zeros = np.zeros_like(idx_lt)
+    full = np.full_like(idx_lt, N)
+
+    # slopes are fit as in linear_fit(obs, T, alpha=2)
+    slope = []
+    intercept = []
+    for start, stop in [(zeros, idx_le), (idx_lt, full)]:
+        n, ST, _, Sy, Syy, STy = region_sums(start, stop)
+        denom = n * Syy - Sy**2
+        denom_safe = np.where(denom > 0, denom, 1)
+        slope.append(np.where(denom > 0, (n * STy - ST * Sy) / denom_safe, 0))
+        intercept.append(Sy / np.where(n > 0, n, 1))
+
+    hdd_beta = np.minimum(slope[0], 0)
+    cdd_beta = np.maximum(slope[1], 0)
+
+    is_hdd = -hdd_beta >= cdd_beta
+    c_hdd_beta = np.where(is_hdd, hdd_beta, cdd_beta)
+    c = np.where(is_hdd, intercept[1], intercept[0])
+
+    # model region is T < bp for heating and T > bp for cooling
+    _, _, _, Sy, Syy, _ = S[:, -1]
+    SSE = Syy - 2 * c * Sy + N * c**2
+
+    start = np.where(is_hdd, zeros, idx_le)
+    stop = np.where(is_hdd, idx_lt, full)
+    n, ST, STT, Sy, _, STy = region_sums(start, stop)
+    bp = c_hdd_bp - T_offset
+
+    Suu = STT - 2 * bp * ST + n * bp**2
+    Sur = STy - c * ST - bp * Sy + n * bp * c
+
+    SSE += c_hdd_beta**2 * Suu - 2 * c_hdd_beta * Sur
+
+    return np.maximum(SSE, 0)
+
+
 def _c_hdd_tidd(
     c_hdd_bp, c_hdd_beta, intercept, T_fit_bnds=np.array([]), T=np.array([])
 ):
@@ -20,7 +20,11 @@
 import numba
 import numpy as np
 
-from eemeter.common.adaptive_loss import adaptive_weights
+from eemeter.common.adaptive_loss import (
+    adaptive_weights,
+    adaptive_weights_fixed_alpha,
+    adaptive_weights_solve_alpha,
+)
 from eemeter.common.utils import LN_MAX_POS_SYSTEM_VALUE, LN_MIN_POS_SYSTEM_VALUE
 
 
@@ -103,6 +107,108 @@ def full_model(
     return E_tot
 
 
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def full_model_jacobian(
+    hdd_bp,
+    hdd_beta,
+    hdd_k,
+    cdd_bp,
+    cdd_beta,
+    cdd_k,
+    intercept,
+    T_fit_bnds=np.array([]),
+    T=np.array([]),
+):
+    """
+    This function calculates the partial derivatives of full_model with respect to its coefficients.
+
+    The regions are assigned as in full_model. Derivatives of sloped regions are calculated for all
+    slopes, including zero slopes where full_model returns the intercept. Derivatives with respect to
+    slopes and smoothing parameters at zero are taken from the positive side.
+
+    Parameters:
+    hdd_bp (float): The base point for the heating model.
+    hdd_beta (float): The beta value for the heating model.
+    hdd_k (float): The k value for the heating model.
+    cdd_bp (float): The base point for the cooling model.
+    cdd_beta (float): The beta value for the cooling model.
+    cdd_k (float): The k value for the cooling model.
+    intercept (float): The intercept value for the model.
+    T_fit_bnds (numpy array): The temperature bounds for the model fitting. Default is an empty numpy array.
+    T (numpy array): The temperature values. Default is an empty numpy array.
+
+    Returns:
+    numpy array: The jacobian with shape (len(T), 7) in the order of the full_model coefficients.
+    """
+
+    [T_min, T_max] = T_fit_bnds
+
+    swap = cdd_bp < hdd_bp
+    if swap:
+        hdd_bp, cdd_bp = cdd_bp, hdd_bp
+        hdd_beta, cdd_beta = cdd_beta, hdd_beta
+        hdd_k, cdd_k = cdd_k, hdd_k
+
+    jac = np.zeros((len(T), 7))
+    for n, Ti in enumerate(T):
+        jac[n, 6] = 1.0
+
+        if (Ti < hdd_bp) or ((hdd_bp == cdd_bp) and (cdd_bp >= T_max)):
+            # heating model, v = hdd_bp - T
+            i = 0
+            beta = hdd_beta
+            k = hdd_k
+            v = hdd_bp - Ti
+            dv_dbp = 1.0
+
+        elif (Ti > cdd_bp) or ((hdd_bp == cdd_bp) and (hdd_bp <= T_min)):
+            # cooling model, v = T - cdd_bp
+            i = 3
+            beta = cdd_beta
+            k = cdd_k
+            v = Ti - cdd_bp
+            dv_dbp = -1.0
+
+        else:  # Temperature independent
+            continue
+
+        # model = |beta*k|*(exp(-v/k) - 1) + beta*v + intercept
+        if k == 0:
+            dE_dbeta = v
+            dE_dk = -abs(beta)
+            dE_dv = beta
+
+        else:
+            sign_beta = 1.0 if beta >= 0 else -1.0
+            sign_k = 1.0 if k >= 0 else -1.0
+            A = abs(beta * k)
+
+            exp_interior = -v / k
+            is_clipped = (exp_interior < LN_MIN_POS_SYSTEM_VALUE) or (
+                exp_interior > LN_MAX_POS_SYSTEM_VALUE
+            )
+            exp_interior = min(
+                max(exp_interior, LN_MIN_POS_SYSTEM_VALUE), LN_MAX_POS_SYSTEM_VALUE
+            )
+            exp_term = np.exp(exp_interior)
+
+            dE_dbeta = sign_beta * abs(k) * (exp_term - 1) + v
+            dE_dk = abs(beta) * sign_k * (exp_term - 1)
+            dE_dv = beta
+            if not is_clipped:
+                dE_dk += A * exp_term * v / k**2
+                dE_dv -= A * exp_term / k
+
+        jac[n, i] = dE_dv * dv_dbp
+        jac[n, i + 1] = dE_dbeta
+        jac[n, i + 2] = dE_dk
+
+    if swap:
+        jac = jac[:, np.array([3, 4, 5, 0, 1, 2, 6])]
+
+    return jac
+
+
 @numba.jit(nopython=True, error_model="numpy", cache=True)
 def get_full_model_x(model_key, x, T_min, T_max, T_min_seg, T_max_seg):
     """
@@ -303,3 +409,160 @@ def full_model_weight(
     a_out = np.hstack(a)
 
     return weight_out, C_out, a_out
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _full_model_weight_bnds(hdd_bp, hdd_beta, cdd_bp, cdd_beta, T):
+    """
+    Returns the residual segments used by full_model_weight as [start_0, stop_0, start_1, stop_1, ...]
+    """
+
+    N = len(T)
+
+    if hdd_bp > cdd_bp:
+        hdd_bp, cdd_bp = cdd_bp, hdd_bp
+
+    if (hdd_beta == 0) and (cdd_beta == 0):  # intercept only
+        bnds = np.array([0, N])
+
+    elif (cdd_bp >= T[-1]) or (hdd_bp <= T[0]):  # hdd or cdd only
+        bnds = np.array([0, N])
+
+    elif hdd_beta == 0:
+        idx_cdd_bp = np.argmin(np.abs(T - cdd_bp))
+
+        bnds = np.array([0, idx_cdd_bp, idx_cdd_bp, N])
+
+    elif cdd_beta == 0:
+        idx_hdd_bp = np.argmin(np.abs(T - hdd_bp))
+
+        bnds = np.array([0, idx_hdd_bp, idx_hdd_bp, N])
+
+    else:
+        idx_hdd_bp = np.argmin(np.abs(T - hdd_bp))
+        idx_cdd_bp = np.argmin(np.abs(T - cdd_bp))
+
+        if hdd_bp == cdd_bp:
+            bnds = np.array([0, idx_hdd_bp, idx_cdd_bp, N])
+
+        else:
+            bnds = np.array([0, idx_hdd_bp, idx_hdd_bp, idx_cdd_bp, idx_cdd_bp, N])
+
+    return bnds
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def full_model_weight_fixed_alpha(
+    hdd_bp,
+    hdd_beta,
+    cdd_bp,
+    cdd_beta,
+    T,
+    residual,
+    sigma=3.0,
+    quantile=0.25,
+    alpha=2.0,
+    min_weight=0.0,
+):
+    """
+    Compiled equivalent of the weights returned by full_model_weight for a fixed (numeric) alpha.
+
+    Parameters:
+    hdd_bp (float): The base point for heating degree days.
+    hdd_beta (float): The beta value for heating degree days.
+    cdd_bp (float): The base point for cooling degree days.
+    cdd_beta (float): The beta value for cooling degree days.
+    T (array-like): The sorted temperature array.
+    residual (array-like): The residual array, sorted by temperature.
+    sigma (float, optional): The standard deviation. Default is 3.0.
+    quantile (float, optional): The quantile to be used. Default is 0.25.
+    alpha (float, optional): The alpha value. Default is 2.0.
+    min_weight (float, optional): The minimum weight. Default is 0.0.
+
+    Returns:
+    numpy array: The weights for the full model.
+    """
+
+    bnds = _full_model_weight_bnds(hdd_bp, hdd_beta, cdd_bp, cdd_beta, T)
+
+    N = len(residual)
+    weight = np.empty(N)
+    n = 0
+    for i in range(0, len(bnds), 2):
+        resid = residual[bnds[i] : bnds[i + 1]]
+        n_resid = len(resid)
+
+        if n_resid == 0:
+            continue
+
+        elif n_resid < 3:
+            weight[n : n + n_resid] = 1.0
+
+        else:
+            weight[n : n + n_resid] = adaptive_weights_fixed_alpha(
+                resid, alpha, sigma, quantile, min_weight
+            )[0]
+
+        n += n_resid
+
+    return weight[:n]
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def full_model_weight_adaptive_alpha(
+    hdd_bp,
+    hdd_beta,
+    cdd_bp,
+    cdd_beta,
+    T,
+    residual,
+    alpha_state,
+    sigma=3.0,
+    quantile=0.25,
+    min_weight=0.0,
+):
+    """
+    Compiled equivalent of the weights returned by full_model_weight for alpha="adaptive".
+
+    Parameters:
+    hdd_bp (float): The base point for heating degree days.
+    hdd_beta (float): The beta value for heating degree days.
+    cdd_bp (float): The base point for cooling degree days.
+    cdd_beta (float): The beta value for cooling degree days.
+    T (array-like): The sorted temperature array.
+    residual (array-like): The residual array, sorted by temperature.
+    alpha_state (array-like): The scaled alpha of up to 3 segments from the previous call. Finite values
+        are used to warm start the alpha solver and the array is updated in place. Use nan for no warm start.
+    sigma (float, optional): The standard deviation. Default is 3.0.
+    quantile (float, optional): The quantile to be used. Default is 0.25.
+    min_weight (float, optional): The minimum weight. Default is 0.0.
+
+    Returns:
+    numpy array: The weights for the full model.
+    """
+
+    bnds = _full_model_weight_bnds(hdd_bp, hdd_beta, cdd_bp, cdd_beta, T)
+
+    N = len(residual)
+    weight = np.empty(N)
+    n = 0
+    for i in range(0, len(bnds), 2):
+        resid = residual[bnds[i] : bnds[i + 1]]
+        n_resid = len(resid)
+
+        if n_resid == 0:
+            continue
+
+        elif n_resid < 3:
+            weight[n : n + n_resid] = 1.0
+
+        else:
+            j = i // 2
+            _weight, _, _, alpha_state[j] = adaptive_weights_solve_alpha(
+                resid, alpha_state[j], sigma, quantile, min_weight
+            )
+            weight[n : n + n_resid] = _weight
+
+        n += n_resid
+
+    return weight[:n]
@@ -32,11 +32,15 @@ from eemeter.eemeter.models.daily.objective_function import obj_fcn_decorator
 from eemeter.eemeter.models.daily.optimize import Optimizer, nlopt_algorithms
 from eemeter.eemeter.models.daily.parameters import ModelCoefficients, ModelType
 from eemeter.eemeter.models.daily.utilities.base_model import (
+    cumulative_sums,
     fix_identical_bnds,
     get_intercept,
     get_slope,
     get_smooth_coeffs,
+    grid_search_candidates,
+    refine_grid_candidates,
 )
+from eemeter.eemeter.models.daily.utilities.config import InitialGuessAlgorithmChoice
 
 
 def fit_hdd_tidd_cdd(
@@ -116,8 +120,18 @@ def fit_hdd_tidd_cdd(
         model_fcn = _hdd_tidd_cdd
         weight_fcn = _hdd_tidd_cdd_weight
         TSS_fcn = _hdd_tidd_cdd_total_sum_of_squares
+    model_key = "hdd_tidd_cdd_smooth" if smooth else "hdd_tidd_cdd"
     obj_fcn = obj_fcn_decorator(
-        model_fcn, weight_fcn, TSS_fcn, T, obs, settings, alpha, coef_id, initial_fit
+        model_fcn,
+        weight_fcn,
+        TSS_fcn,
+        T,
+        obs,
+        settings,
+        alpha,
+        coef_id,
+        initial_fit,
+        model_key,
     )
 
     res = Optimizer(
@@ -247,7 +261,6 @@ def _hdd_tidd_cdd_smooth_x0(T, obs, alpha, settings, smooth, min_weight=0.0):
 
         return bp_obj_fcn
 
-    algorithm = nlopt_algorithms[settings.initial_guess_algorithm_choice]
     obj_fcn = bp_obj_fcn_dec(T, obs, min_T_idx)
 
     T_bnds = [T[min_T_idx - 1], T[-min_T_idx]]
@@ -267,17 +280,36 @@ def _hdd_tidd_cdd_smooth_x0(T, obs, alpha, settings, smooth, min_weight=0.0):
     x0 = np.array([T_range * 0.10, T_range * 0.90]) + T_min
     bnds = np.array([T_bnds, T_bnds]).T
 
-    opt = nlopt.opt(algorithm, int(len(x0)))
-    opt.set_min_objective(obj_fcn)
+    if (
+        settings.initial_guess_algorithm_choice
+        == InitialGuessAlgorithmChoice.GRID_SEARCH
+    ):
+        bp = grid_search_candidates(T, T_min, T_max)
+        idx_hdd_bp, idx_cdd_bp = np.triu_indices(len(bp))
+        candidates = np.stack([bp[idx_hdd_bp], bp[idx_cdd_bp]], axis=1)
+
+        scores = _hdd_tidd_cdd_grid_scores(
+            T, obs, candidates[:, 0], candidates[:, 1], lasso_a
+        )
+
+        x_opt = refine_grid_candidates(
+            obj_fcn, candidates, scores, bnds, initial_step=T_range * 0.05
+        )
+
+    else:
+        algorithm = nlopt_algorithms[settings.initial_guess_algorithm_choice]
 
-    opt.set_initial_step([T_range * 0.10, -T_range * 0.10])
-    opt.set_maxeval(200)
-    opt.set_xtol_rel(1e-3)
-    opt.set_xtol_abs(0.5)
-    opt.set_lower_bounds(bnds[0])
-    opt.set_upper_bounds(bnds[1])
+        opt = nlopt.opt(algorithm, int(len(x0)))
+        opt.set_min_objective(obj_fcn)
 
-    x_opt = opt.optimize(x0)  # optimize!
+        opt.set_initial_step([T_range * 0.10, -T_range * 0.10])
+        opt.set_maxeval(200)
+        opt.set_xtol_rel(1e-3)
+        opt.set_xtol_abs(0.5)
+        opt.set_lower_bounds(bnds[0])
+        opt.set_upper_bounds(bnds[1])
+
+        x_opt = opt.optimize(x0)  # optimize!
 
     x0 = obj_fcn(x_opt, optimize_flag=False)
 
@@ -301,6 +333,91 @@ def _hdd_tidd_cdd_smooth_x0(T, obs, alpha, settings, smooth, min_weight=0.0):
     )
 
 
+def _hdd_tidd_cdd_grid_scores(T, obs, hdd_bp, cdd_bp, lasso_a):
+    """
+    Approximates the initial guess objective function for arrays of breakpoint pairs in one pass.
+
+    Each pair is scored as with alpha = 2: the intercept is the mean of the temperature independent
+    region and the slopes are least squares fits through the breakpoints, all of which are calculated
+    from cumulative sums over the sorted temperatures. Pairs without temperature independent data
+    are not scored and return inf.
+
+    Parameters:
+    T (array-like): The sorted temperature array.
+    obs (array-like): The observation array sorted by temperature.
+    hdd_bp (array-like): The heating breakpoints.
+    cdd_bp (array-like): The cooling breakpoints, hdd_bp <= cdd_bp.
+    lasso_a (float): The lasso penalty of the breakpoints.
+
+    Returns:
+    numpy array: The approximate objective function value of each pair.
+    """
+
+    N = len(T)
+
+    # center data to limit cancellation in the sums
+    T_offset = np.mean(T)
+    obs_offset = np.mean(obs)
+    S = cumulative_sums(T - T_offset, obs - obs_offset)
+
+    idx_hdd = np.searchsorted(T, hdd_bp, side="left")  # T < hdd_bp
+    idx_cdd = np.searchsorted(T, cdd_bp, side="right")  # cdd_bp < T
+
+    def region_sums(start, stop):
+        return S[:, stop] - S[:, start]
+
+    # intercept from temperature independent region
+    n_tidd, _, _, Sy_tidd, Syy_tidd, _ = region_sums(idx_hdd, idx_cdd)
+    has_tidd = n_tidd > 0
+    n_tidd = np.where(has_tidd, n_tidd, 1)
+    intercept = Sy_tidd / n_tidd
+
+    SSE = Syy_tidd - Sy_tidd * intercept
+    resid_sum = np.zeros_like(intercept)
+
+    for (start, stop), bp, sign in [
+        ((np.zeros_like(idx_hdd), idx_hdd), hdd_bp, -1),
+        ((idx_cdd, np.full_like(idx_cdd, N)), cdd_bp, 1),
+    ]:
+        n, ST, STT, Sy, Syy, STy = region_sums(start, stop)
+        bp = bp - T_offset
+
+        # sums of u = T - bp and r = obs - intercept
+        Su = ST - n * bp
+        Suu = STT - 2 * bp * ST + n * bp**2
+        Sr = Sy - n * intercept
+        Srr = Syy - 2 * intercept * Sy + n * intercept**2
+        Sur = STy - intercept * ST - bp * Sy + n * bp * intercept
+
+        # least squares slope through (bp, intercept), heating slopes <= 0 and cooling slopes >= 0
+        Suu_safe = np.where(Suu > 0, Suu, 1)
+        slope = np.where(Suu > 0, Sur / Suu_safe, 0)
+        slope = np.maximum(sign * slope, 0) * sign
+
+        # residual = model - obs = slope*u - r
+        SSE += slope**2 * Suu - 2 * slope * Sur + Srr
+        resid_sum += slope * Su - Sr
+
+    # residuals are centered before calculating the loss
+    loss = np.maximum(SSE - resid_sum**2 / N, 0)
+
+    # lasso penalty of breakpoints
+    T_fit_bnds = np.array([T[0], T[-1]])
+    T_range = T_fit_bnds[1] - T_fit_bnds[0]
+    if T_range == 0:
+        T_range = 1
+
+    bp_shift = (cdd_bp - hdd_bp) / 2
+    X_lasso = [
+        np.min(np.abs(bp[:, None] - T_fit_bnds), axis=1) + bp_shift
+        for bp in [hdd_bp, cdd_bp]
+    ]
+    wRMSE = np.sqrt(loss / N)
+    loss += lasso_a * (np.abs(X_lasso[0]) + np.abs(X_lasso[1])) * wRMSE / T_range
+
+    return np.where(has_tidd, loss, np.inf)
+
+
 def estimate_betas_and_intercept(T, obs, hdd_bp, cdd_bp, min_T_idx, alpha):
     idx_hdd = np.argwhere(T < hdd_bp).flatten()
     idx_tidd = np.argwhere((hdd_bp <= T) & (T <= cdd_bp)).flatten()
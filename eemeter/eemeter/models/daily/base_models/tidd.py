@@ -62,7 +62,16 @@ def fit_tidd(
     weight_fcn = _tidd_weight
     TSS_fcn = _tidd_total_sum_of_squares
     obj_fcn = obj_fcn_decorator(
-        model_fcn, weight_fcn, TSS_fcn, T, obs, settings, alpha, coef_id, initial_fit
+        model_fcn,
+        weight_fcn,
+        TSS_fcn,
+        T,
+        obs,
+        settings,
+        alpha,
+        coef_id,
+        initial_fit,
+        "tidd",
     )
 
     res = Optimizer(
@@ -24,6 +24,8 @@ import pandas as pd
 
 import eemeter.common.const as _const
 from eemeter.eemeter.common.data_processor_utilities import (
+    _grouped_sufficiency_criteria_baseline,
+    _instantaneous_last_bin,
     as_freq,
     clean_billing_daily_data,
     compute_minimum_granularity,
@@ -31,15 +33,30 @@ from eemeter.eemeter.common.data_processor_utilities import (
     sufficiency_criteria_baseline,
 )
 from eemeter.eemeter.common.features import compute_temperature_features
+from eemeter.eemeter.common.temperature_cache import WeatherStation
 from eemeter.eemeter.common.warnings import EEMeterWarning
 
 
+def _daily_temperature_coverage(temperature, temperature_coverage):
+    """Daily temperature means with the days of 50% coverage or less set to NaN,
+    the coverage of the non null days, and the days of 50% coverage or less."""
+    temperature_coverage = np.where(
+        ~np.isnan(temperature), temperature_coverage, np.nan
+    )
+    invalid_temperature_rows = temperature_coverage <= 0.5
+    temperature = np.where(invalid_temperature_rows, np.nan, temperature)
+    return temperature, temperature_coverage, invalid_temperature_rows
+
+
 class _DailyData:
     """Private base class for daily baseline and reporting data.
 
     Will raise exception during data sufficiency check if instantiated
     """
 
+    # weather station of the temperature data, set by from_series
+    _temperature_station = None
+
     def __init__(self, df: pd.DataFrame, is_electricity_data: bool):
         self._df = None
         self.warnings = []
@@ -50,11 +67,22 @@ class _DailyData:
         # TODO re-examine dq/warning pattern. keep consistent between
         # either implicitly setting as side effects, or returning and assigning outside
         self._df, temp_coverage = self._set_data(df)
+        self._finalize_data(temp_coverage)
 
-        sufficiency_df = self._df.merge(
-            temp_coverage, left_index=True, right_index=True, how="left"
-        )
-        disqualification, warnings = self._check_data_sufficiency(sufficiency_df)
+    def _finalize_data(self, temp_coverage: pd.DataFrame, sufficiency=None):
+        """Run the sufficiency checks on the processed data and log the results.
+
+        The disqualifications and warnings of the checks can be given as
+        sufficiency instead, as computed for many meters at once by
+        _check_grouped_data_sufficiency.
+        """
+        if sufficiency is None:
+            sufficiency_df = self._df.merge(
+                temp_coverage, left_index=True, right_index=True, how="left"
+            )
+            disqualification, warnings = self._check_data_sufficiency(sufficiency_df)
+        else:
+            disqualification, warnings = sufficiency
 
         self.disqualification += disqualification
         self.warnings += warnings
@@ -78,7 +106,7 @@ class _DailyData:
     def from_series(
         cls,
         meter_data: Union[pd.Series, pd.DataFrame],
-        temperature_data: Union[pd.Series, pd.DataFrame],
+        temperature_data: Union[pd.Series, pd.DataFrame, WeatherStation],
         is_electricity_data,
     ):
         """
@@ -88,7 +116,7 @@ class _DailyData:
         ----------
 
         - meter_data (pd.Series or pd.DataFrame): The meter data.
-        - temperature_data (pd.Series or pd.DataFrame): The temperature data.
+        - temperature_data (pd.Series or pd.DataFrame or WeatherStation): The temperature data, or the handle of the weather station it comes from. The features of whole local days are then taken from the station's cache where the temperature rows match the station's, see WeatherStation.
         - is_electricity_data: A flag indicating whether the data represents electricity data. This is required as electricity data with 0 values are converted to NaNs.
 
         Returns
@@ -96,6 +124,10 @@ class _DailyData:
 
         - Data: An instance of the Data class with the dataframe populated with the corrected data, alongwith warnings and disqualifications based on the input.
         """
+        station = None
+        if isinstance(temperature_data, WeatherStation):
+            station = temperature_data
+            temperature_data = station.temperature_data
         if isinstance(meter_data, pd.Series):
             meter_data = meter_data.to_frame()
         if isinstance(temperature_data, pd.Series):
@@ -205,7 +237,84 @@ class _DailyData:
             meter_data.iloc[-1] = np.nan
 
         df = pd.concat([meter_data, temperature_data], axis=1)
-        return cls(df, is_electricity_data)
+        data = cls.__new__(cls)
+        data._temperature_station = station
+        data.__init__(df, is_electricity_data)
+        return data
+
+    @classmethod
+    def from_arrays(
+        cls,
+        index: pd.DatetimeIndex,
+        observed: Optional[np.ndarray],
+        temperature: Union[np.ndarray, WeatherStation],
+        is_electricity_data: bool,
+        temperature_coverage: Optional[np.ndarray] = None,
+    ):
+        """
+        Create an instance of the Data class from already aligned daily arrays.
+
+        This is a trusted fast path for pipelines that already deliver clean daily
+        data. The trimming, alignment, frequency inference, duplicate removal and
+        resampling done by from_series and the constructor are skipped; the
+        caller guarantees that the input satisfies them. Zero electricity usage
+        is still converted to NaN, and the sufficiency checks, warnings and
+        disqualifications are the same as for the equivalent dataframe input.
+
+        Parameters
+        ----------
+
+        - index (pd.DatetimeIndex): Timezone aware index with one entry per local day, without gaps or duplicates.
+        - observed (np.ndarray or None): Daily meter usage aligned with index. None is treated as missing meter data, e.g. for temperature-only reporting data.
+        - temperature (np.ndarray or WeatherStation): Daily mean temperature aligned with index, in Fahrenheit, or the handle of the weather station it comes from. The station's daily means and coverage, resampled with as_freq() from local midnights, are then used for the days of index.
+        - is_electricity_data: A flag indicating whether the data represents electricity data. This is required as electricity data with 0 values are converted to NaNs.
+        - temperature_coverage (np.ndarray, optional): Fraction of the hourly temperature readings present for each day, as used to compute the daily means. Days with coverage of 50% or less are set to NaN, as for hourly temperature input. If not given, the temperatures are treated as pre-aggregated daily values whose coverage cannot be confirmed.
+
+        Returns
+        -------
+
+        - Data: An instance of the Data class with the dataframe populated with the daily data, alongwith warnings and disqualifications based on the input.
+        """
+        if isinstance(temperature, WeatherStation):
+            if temperature_coverage is not None:
+                raise ValueError(
+                    "temperature_coverage cannot be given with a weather station"
+                )
+            station_days = temperature.resampled_temperature(index.tz).reindex(index)
+            temperature = station_days["value"].to_numpy()
+            # the station has no readings on days outside of its series
+            temperature_coverage = station_days["coverage"].fillna(0).to_numpy()
+
+        return cls._from_arrays(
+            index, observed, temperature, is_electricity_data, temperature_coverage
+        )
+
+    @classmethod
+    def _from_arrays(
+        cls,
+        index,
+        observed,
+        temperature,
+        is_electricity_data,
+        temperature_coverage=None,
+        meter_warnings=(),
+        sufficiency=None,
+    ):
+        # meter_warnings are those raised while the caller resampled the meter
+        # data to daily, recorded where the constructor would have raised them,
+        # and sufficiency the results of _check_grouped_data_sufficiency
+        data = cls.__new__(cls)
+        data._df = None
+        data.warnings = []
+        data.disqualification = []
+        data.is_electricity_data = is_electricity_data
+        data.tz = None
+
+        data._df, temp_coverage = data._set_arrays(
+            index, observed, temperature, temperature_coverage, meter_warnings
+        )
+        data._finalize_data(temp_coverage, sufficiency)
+        return data
 
     def log_warnings(self):
         """
@@ -258,6 +367,7 @@ class _DailyData:
             end=end_date,
             freq="D",
             tz=df.index.tz,
+            name=df.index.name,
         )
         all_days_df = pd.DataFrame(index=all_days_index)
         # the following drops common days to handle DST issues with pytz.
@@ -316,9 +426,7 @@ class _DailyData:
                 )
             if temp_series.index.freq != "D":
                 # Downsample / Upsample the temperature data to daily
-                temperature_features = as_freq(
-                    temp_series, "D", series_type="instantaneous", include_coverage=True
-                )
+                temperature_features = self._resampled_temperature(temp_series)
                 # If high frequency data check for 50% data coverage in rollup
                 if len(temperature_features[temperature_features.coverage <= 0.5]) > 0:
                     self.warnings.append(
@@ -363,16 +471,9 @@ class _DailyData:
             temperature_features["n_days_kept"] = 0  # unused
             temperature_features["n_days_dropped"] = 0  # unused
         else:
-            # TODO hacky method of avoiding the last index nan convention
-            if not meter_index.empty:
-                buffer_idx = meter_index.max() + pd.Timedelta(days=1)
-                meter_index = meter_index.union([buffer_idx])
-            temperature_features = compute_temperature_features(
-                meter_index,
-                temp_series,
-                data_quality=True,
+            temperature_features = self._hourly_temperature_features(
+                meter_index, temp_series
             )
-            temperature_features = temperature_features[:-1]
 
             # Only check for high frequency temperature data if it exists
             if (
@@ -409,6 +510,105 @@ class _DailyData:
         features = temperature_features.drop(columns=["temperature_mean"])
         return temp, features
 
+    def _resampled_temperature(self, temp_series: pd.Series):
+        """
+        Downsample / upsample the temperature data to daily with as_freq(), with the coverage of each day.
+        With a weather station, the days before the last one are taken from the station's cache, as long
+        as the temperature data starts at a local midnight and holds the same rows as the station data
+        on those days.
+
+        Parameters
+        ----------
+
+            temp_series (pd.Series): The temperature data.
+
+        Returns
+        -------
+
+            pd.DataFrame: The daily 'value' and 'coverage' of the temperature data.
+        """
+        station = self._temperature_station
+        if station is not None and not temp_series.empty:
+            index = temp_series.index
+            station_days = station.resampled_temperature(index.tz)
+            labels = station_days.index
+            # the days of the temperature data, by their position in the station's days
+            first = labels.searchsorted(index[0])
+            last = labels.searchsorted(index[-1], side="right") - 1
+            if (
+                0 <= first < last < len(labels)
+                and labels[first] == index[0]
+                and labels[last].date() == index[-1].date()
+                and station._matches_rows(index, labels[first], labels[last])
+            ):
+                # the last day ends wherever the temperature data was trimmed
+                resampled = pd.concat(
+                    [
+                        station_days.iloc[first:last],
+                        _instantaneous_last_bin(temp_series, labels[last]),
+                    ]
+                )
+                resampled.index.name = index.name
+                return resampled
+
+        return as_freq(
+            temp_series, "D", series_type="instantaneous", include_coverage=True
+        )
+
+    def _hourly_temperature_features(
+        self, meter_index: pd.DatetimeIndex, temp_series: pd.Series
+    ):
+        """
+        Compute the temperature features of hourly temperature data for each period of the meter index.
+        With a weather station, the features of whole local days are taken from the station's cache,
+        as long as the temperature data holds the same rows as the station data on those days.
+
+        Parameters
+        ----------
+
+            meter_index (pd.DatetimeIndex): The meter index.
+            temp_series (pd.Series): The hourly temperature data.
+
+        Returns
+        -------
+
+            pd.DataFrame: The computed temperature features.
+        """
+        # TODO hacky method of avoiding the last index nan convention
+        if not meter_index.empty:
+            buffer_idx = meter_index.max() + pd.Timedelta(days=1)
+            meter_index = meter_index.union([buffer_idx])
+
+        days = meter_index[:-2]
+        if (
+            self._temperature_station is not None
+            and len(days) > 0
+            and (days == days.normalize()).all()
+        ):
+            station = self._temperature_station
+            station_features = station.temperature_features(
+                meter_index.tz, "D"
+            ).reindex(days.rename(None))
+            in_station = station_features["temperature_not_null"].notna().all()
+            if in_station and station._matches_rows(
+                temp_series.index, days[0], meter_index[-2]
+            ):
+                # the last period ends wherever the temperature data was trimmed
+                last_features = compute_temperature_features(
+                    meter_index[-2:],
+                    temp_series[meter_index[-2] :],
+                    data_quality=True,
+                )
+                temperature_features = pd.concat([station_features, last_features])
+                return temperature_features[:-1]
+
+        temperature_features = compute_temperature_features(
+            meter_index,
+            temp_series,
+            data_quality=True,
+        )
+        return temperature_features[:-1]
+
     def _merge_meter_temp(self, meter, temp):
         """
         Merge the meter and temperature dataframes and reorder the columns to have the order -
@@ -448,6 +648,21 @@ class _DailyData:
             "Can't instantiate class _DailyData, use DailyBaselineData or DailyReportingData."
         )
 
+    @classmethod
+    def _check_grouped_data_sufficiency(
+        cls,
+        starts,
+        index,
+        observed,
+        temperature,
+        temperature_not_null,
+        temperature_null,
+        is_electricity_data,
+    ):
+        raise NotImplementedError(
+            "Can't instantiate class _DailyData, use DailyBaselineData or DailyReportingData."
+        )
+
     def _set_data(self, data: pd.DataFrame):
         """Process data input for the Daily Model Baseline Class
         Datetime has to be either index or a separate column in the dataframe.
@@ -519,6 +734,129 @@ class _DailyData:
         final_df = self._merge_meter_temp(meter, temp)
         return final_df, temp_coverage
 
+    def _set_arrays(
+        self,
+        index: pd.DatetimeIndex,
+        observed: Optional[np.ndarray],
+        temperature: np.ndarray,
+        temperature_coverage: Optional[np.ndarray],
+        meter_warnings=(),
+    ):
+        """Array counterpart of _set_data for already aligned daily input.
+
+        Returns
+        -------
+        processed_data : pd.DataFrame
+            Dataframe appended with the correct season and day of week.
+        temp_coverage : pd.DataFrame
+            Temperature coverage columns used by the sufficiency checks.
+        """
+        if not isinstance(index, pd.DatetimeIndex):
+            raise ValueError("Index is not datetime")
+        if index.tz is None:
+            raise ValueError("Datatime is missing timezone information")
+
+        n_days = len(index)
+        if observed is None:
+            observed = np.full(n_days, np.nan)
+        else:
+            observed = np.array(observed, dtype=float)
+        temperature = np.array(temperature, dtype=float)
+        if temperature_coverage is not None:
+            temperature_coverage = np.asarray(temperature_coverage, dtype=float)
+
+        for name, values in [
+            ("observed", observed),
+            ("temperature", temperature),
+            ("temperature_coverage", temperature_coverage),
+        ]:
+            if values is not None and values.shape != (n_days,):
+                raise ValueError(
+                    "{} must be one-dimensional with the same length as index".format(
+                        name
+                    )
+                )
+
+        if str(index.tz) == "UTC":
+            self.warnings.append(
+                EEMeterWarning(
+                    qualified_name="eemeter.data_quality.utc_index",
+                    description=(
+                        "Datetime index is in UTC. Use tz_localize() with the local timezone to ensure correct aggregations"
+                    ),
+                    data={},
+                )
+            )
+        self.tz = index.tz
+        self.warnings.extend(meter_warnings)
+
+        # Convert electricity data having 0 meter values to NaNs
+        if self.is_electricity_data:
+            observed[observed == 0] = np.nan
+
+        temperature_not_null = ~np.isnan(temperature)
+        if temperature_coverage is None:
+            # same handling as pre-aggregated daily temperature data
+            self.warnings.append(
+                EEMeterWarning(
+                    qualified_name="eemeter.sufficiency_criteria.unable_to_confirm_daily_temperature_sufficiency",
+                    description=(
+                        "Cannot confirm that pre-aggregated temperature data had sufficient hours kept"
+                    ),
+                    data={},
+                )
+            )
+            temp_coverage = pd.DataFrame(
+                {
+                    "temperature_null": (~temperature_not_null).astype(int),
+                    "temperature_not_null": temperature_not_null.astype(int),
+                    "n_days_kept": 0,  # unused
+                    "n_days_dropped": 0,  # unused
+                },
+                index=index,
+            )
+        else:
+            # same handling as hourly temperature data, with the coverage standing
+            # in for the fraction of non null hours in each day
+            (
+                temperature,
+                temperature_coverage,
+                invalid_temperature_rows,
+            ) = _daily_temperature_coverage(temperature, temperature_coverage)
+            if invalid_temperature_rows.any():
+                self.warnings.append(
+                    EEMeterWarning(
+                        qualified_name="eemeter.sufficiency_criteria.missing_high_frequency_temperature_data",
+                        description=(
+                            "More than 50% of the high frequency temperature data is missing."
+                        ),
+                        data=[timestamp.isoformat() for timestamp in index],
+                    )
+                )
+            temp_coverage = pd.DataFrame(
+                {
+                    "temperature_not_null": temperature_coverage,
+                    "temperature_null": 1 - temperature_coverage,
+                },
+                index=index,
+            )
+
+        df = pd.DataFrame(
+            {
+                "season": index.month_name().map(_const.default_season_def),
+                "weekday_weekend": index.day_name().map(
+                    _const.default_weekday_weekend_def
+                ),
+                "temperature": temperature,
+                "observed": observed,
+            },
+            index=index,
+        )
+        if np.isnan(observed).all():
+            df = df.drop(columns=["observed"])
+
+        return df, temp_coverage
+
 
 class DailyBaselineData(_DailyData):
     """
@@ -553,7 +891,10 @@ class DailyBaselineData(_DailyData):
     1. from_series: Public method that can can handle two separate series (meter and temperature) and join them to create a single dataframe.
                     The temperature column should have values in Fahrenheit.
 
-    2. log_warnings: View the disqualifications and warnings associated with the current data input provided.
+    2. from_arrays: Public method that builds the data from already aligned daily arrays (index, meter usage, temperature mean and
+                    temperature coverage), skipping the alignment and resampling steps while running the same sufficiency checks.
+
+    3. log_warnings: View the disqualifications and warnings associated with the current data input provided.
     """
 
     def _check_data_sufficiency(self, sufficiency_df):
@@ -579,6 +920,35 @@ class DailyBaselineData(_DailyData):
         )
         return disqualification, warnings
 
+    @classmethod
+    def _check_grouped_data_sufficiency(
+        cls,
+        starts,
+        index,
+        observed,
+        temperature,
+        temperature_not_null,
+        temperature_null,
+        is_electricity_data,
+    ):
+        """
+        Private method which runs the checks of _check_data_sufficiency for the daily data of many meters at once, see _grouped_sufficiency_criteria_baseline.
+
+        Returns:
+            list: The disqualifications and warnings of each meter, or None for a meter that _check_data_sufficiency cannot check.
+        """
+        return _grouped_sufficiency_criteria_baseline(
+            starts,
+            index,
+            observed,
+            temperature,
+            temperature_not_null,
+            temperature_null,
+            min_fraction_hourly_temperature_coverage_per_period=0.5,
+            is_reporting_data=False,
+            is_electricity_data=is_electricity_data,
+        )
+
 
 class DailyReportingData(_DailyData):
     """
@@ -614,7 +984,10 @@ class DailyReportingData(_DailyData):
     1. from_series: Public method that can can handle two separate series (meter and temperature) and join them to create a single dataframe.
                     The temperature column should have values in Fahrenheit.
 
-    2. log_warnings: View the disqualifications and warnings associated with the current data input provided.
+    2. from_arrays: Public method that builds the data from already aligned daily arrays (index, meter usage, temperature mean and
+                    temperature coverage), skipping the alignment and resampling steps while running the same sufficiency checks.
+
+    3. log_warnings: View the disqualifications and warnings associated with the current data input provided.
     """
 
     def __init__(self, df: pd.DataFrame, is_electricity_data: bool):
@@ -624,6 +997,9 @@ class DailyReportingData(_DailyData):
 
         super().__init__(df, is_electricity_data)
 
+    def _finalize_data(self, temp_coverage: pd.DataFrame, sufficiency=None):
+        super()._finalize_data(temp_coverage, sufficiency)
+
         # Caltrack 3.5.1.1
         if "observed" in self._df.columns and not self._df.observed.dropna().empty:
             self._df.loc[self._df["temperature"].isna(), "observed"] = np.nan
@@ -632,7 +1008,7 @@ class DailyReportingData(_DailyData):
     def from_series(
         cls,
         meter_data: Optional[Union[pd.Series, pd.DataFrame]],
-        temperature_data: Union[pd.Series, pd.DataFrame],
+        temperature_data: Union[pd.Series, pd.DataFrame, WeatherStation],
         is_electricity_data: Optional[bool] = None,
         tzinfo=None,
     ):
@@ -644,8 +1020,8 @@ class DailyReportingData(_DailyData):
 
         - meter_data: pd.Series or pd.DataFrame (Optional attribute)
             The meter data to be used for the DailyReportingData instance.
-        - temperature_data: pd.Series or pd.DataFrame (Required)
-            The temperature data to be used for the DailyReportingData instance.
+        - temperature_data: pd.Series or pd.DataFrame or WeatherStation (Required)
+            The temperature data to be used for the DailyReportingData instance, or the handle of its weather station.
         - is_electricity_data: bool (Optional)
             Flag indicating whether the meter data represents electricity data.
         - tzinfo: tz (optional)
@@ -666,9 +1042,11 @@ class DailyReportingData(_DailyData):
                 "Must specify is_electricity_data when passing meter data."
             )
         if meter_data is None:
-            meter_data = pd.DataFrame(
-                {"observed": np.nan}, index=temperature_data.index
-            )
+            if isinstance(temperature_data, WeatherStation):
+                temperature_index = temperature_data.temperature_data.index
+            else:
+                temperature_index = temperature_data.index
+            meter_data = pd.DataFrame({"observed": np.nan}, index=temperature_index)
             if tzinfo:
                 meter_data = meter_data.tz_convert(tzinfo)
         if meter_data.empty:
@@ -701,3 +1079,32 @@ class DailyReportingData(_DailyData):
             is_electricity_data=self.is_electricity_data,
         )
         return disqualification, warnings
+
+    @classmethod
+    def _check_grouped_data_sufficiency(
+        cls,
+        starts,
+        index,
+        observed,
+        temperature,
+        temperature_not_null,
+        temperature_null,
+        is_electricity_data,
+    ):
+        """
+        Private method which runs the checks of _check_data_sufficiency for the daily data of many meters at once, see _grouped_sufficiency_criteria_baseline.
+
+        Returns:
+            list: The disqualifications and warnings of each meter, or None for a meter that _check_data_sufficiency cannot check.
+        """
+        return _grouped_sufficiency_criteria_baseline(
+            starts,
+            index,
+            observed,
+            temperature,
+            temperature_not_null,
+            temperature_null,
+            min_fraction_hourly_temperature_coverage_per_period=0.5,
+            is_reporting_data=True,
+            is_electricity_data=is_electricity_data,
+        )
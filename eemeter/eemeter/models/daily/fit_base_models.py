@@ -21,10 +21,15 @@ import numpy as np
 
 from eemeter.common.utils import OoM
 from eemeter.eemeter.models.daily.base_models.c_hdd_tidd import fit_c_hdd_tidd
+from eemeter.eemeter.models.daily.base_models.full_model import get_full_model_x
 from eemeter.eemeter.models.daily.base_models.hdd_tidd_cdd import fit_hdd_tidd_cdd
 from eemeter.eemeter.models.daily.base_models.tidd import fit_tidd
 from eemeter.eemeter.models.daily.optimize_results import OptimizedResult
-from eemeter.eemeter.models.daily.parameters import ModelCoefficients
+from eemeter.eemeter.models.daily.parameters import (
+    DailySubmodelParameters,
+    ModelCoefficients,
+    ModelType,
+)
 from eemeter.eemeter.models.daily.utilities.config import FullModelSelection
 
 
@@ -56,27 +61,139 @@ def _get_opt_options(settings):
     return opt_options
 
 
-def fit_initial_models_from_full_model(df_meter, settings, print_res=False):
+def _prior_x0(prior_submodel: DailySubmodelParameters, T, settings):
+    """
+    Converts a previously fitted submodel into initial coefficients for the full model
+    fit of a new meter segment.
+
+    Parameters:
+        prior_submodel (DailySubmodelParameters): The previously fitted submodel.
+        T (numpy.ndarray): The temperatures of the new meter segment.
+        settings (Settings): The settings object containing the model selection and fitting options.
+
+    Returns:
+        ModelCoefficients | None: The initial coefficients, or None if the prior cannot seed the full model.
+    """
+
+    coeffs = prior_submodel.coefficients
+    if settings.full_model == FullModelSelection.TIDD or coeffs.model_key == "tidd":
+        return None
+
+    x = coeffs.to_np_array()
+    if not np.all(np.isfinite(x)):
+        return None
+
+    T_con = prior_submodel.temperature_constraints
+    x = get_full_model_x(
+        coeffs.model_key,
+        x,
+        T_con["T_min"],
+        T_con["T_max"],
+        T_con["T_min_seg"],
+        T_con["T_max_seg"],
+    )
+    [hdd_bp, hdd_beta, hdd_k, cdd_bp, cdd_beta, cdd_k, intercept] = x
+
+    # c_hdd_tidd smoothing is absolute while hdd_tidd_cdd smoothing is a percentage
+    if coeffs.model_key != "hdd_tidd_cdd_smooth":
+        hdd_k = cdd_k = 0
+
+    # breakpoints are kept within the new temperature range
+    T_min, T_max = np.min(T), np.max(T)
+    hdd_bp = np.clip(hdd_bp, T_min, T_max)
+    cdd_bp = np.clip(cdd_bp, T_min, T_max)
+
+    if settings.full_model == FullModelSelection.HDD_TIDD_CDD:
+        if hdd_beta <= 0 and cdd_beta <= 0:
+            return None
+
+        if settings.smoothed_model:
+            model_type = ModelType.HDD_TIDD_CDD_SMOOTH
+            hdd_k, cdd_k = np.clip([hdd_k, cdd_k], 0, 1)
+        else:
+            model_type = ModelType.HDD_TIDD_CDD
+            hdd_k = cdd_k = None
+
+        return ModelCoefficients(
+            model_type=model_type,
+            hdd_bp=hdd_bp,
+            hdd_beta=hdd_beta,
+            hdd_k=hdd_k,
+            cdd_bp=cdd_bp,
+            cdd_beta=cdd_beta,
+            cdd_k=cdd_k,
+            intercept=intercept,
+        )
+
+    # c_hdd_tidd can only be seeded from a prior with a single slope
+    if (hdd_beta > 0) == (cdd_beta > 0):
+        return None
+
+    if hdd_beta > 0:
+        model_type = ModelType.HDD_TIDD
+        c_hdd_bp, c_hdd_beta, c_hdd_k = hdd_bp, -hdd_beta, hdd_k
+    else:
+        model_type = ModelType.TIDD_CDD
+        c_hdd_bp, c_hdd_beta, c_hdd_k = cdd_bp, cdd_beta, cdd_k
+
+    if settings.smoothed_model:
+        model_type = ModelType(f"{model_type.value}_smooth")
+        if coeffs.model_key != "c_hdd_tidd_smooth":
+            c_hdd_k = 0
+    else:
+        c_hdd_k = None
+
+    if model_type in [ModelType.HDD_TIDD, ModelType.HDD_TIDD_SMOOTH]:
+        return ModelCoefficients(
+            model_type=model_type,
+            hdd_bp=c_hdd_bp,
+            hdd_beta=c_hdd_beta,
+            hdd_k=c_hdd_k,
+            intercept=intercept,
+        )
+
+    return ModelCoefficients(
+        model_type=model_type,
+        cdd_bp=c_hdd_bp,
+        cdd_beta=c_hdd_beta,
+        cdd_k=c_hdd_k,
+        intercept=intercept,
+    )
+
+
+def fit_initial_models_from_full_model(
+    df_meter, settings, print_res=False, prior_submodel=None
+):
     """
     Fits initial models from the full model based on the given settings.
 
     Parameters:
-        df_meter (pandas.DataFrame): The meter data to fit the models to. Columns : date, observed, temperature
+        df_meter (pandas.DataFrame or dict): The meter data to fit the models to. Columns : date, observed, temperature.
+            A dict of 'observed' and 'temperature' arrays is also accepted.
         settings (Settings): The settings object containing the model selection and fitting options.
         print_res (bool, optional): Whether to print the results of the model fitting. Defaults to False.
+        prior_submodel (DailySubmodelParameters, optional): A previously fitted submodel used to warm start the fit. Defaults to None.
 
     Returns:
         ModelResult: The result of the model fitting.
     """
 
-    T = df_meter["temperature"].values
-    obs = df_meter["observed"].values
+    T = np.asarray(df_meter["temperature"])
+    obs = np.asarray(df_meter["observed"])
 
     opt_options = _get_opt_options(settings)
     fit_input = [T, obs, settings, opt_options]
 
+    # warm start from the prior submodel's coefficients if they are usable
+    x0 = None
+    if prior_submodel is not None:
+        x0 = _prior_x0(prior_submodel, T, settings)
+
+    if x0 is not None:
+        model_res = fit_model(x0.model_key, fit_input, x0, None, initial_fit=True)
+
     # initial fitting of the most complicated model allowed
-    if settings.full_model == FullModelSelection.HDD_TIDD_CDD:
+    elif settings.full_model == FullModelSelection.HDD_TIDD_CDD:
         model_res = fit_hdd_tidd_cdd(
             *fit_input, smooth=settings.smoothed_model, initial_fit=True
         )
@@ -97,7 +214,7 @@ def fit_initial_models_from_full_model(df_meter, settings, print_res=False):
     return model_res
 
 
-def fit_model(model_key, fit_input, x0: ModelCoefficients, bnds):
+def fit_model(model_key, fit_input, x0: ModelCoefficients, bnds, initial_fit=False):
     """
     Fits a model based on the given model key and input data.
 
@@ -106,6 +223,7 @@ def fit_model(model_key, fit_input, x0: ModelCoefficients, bnds):
         fit_input (tuple): The input data for the model.
         x0 (ModelCoefficients): The initial coefficients for the model.
         bnds (tuple): The bounds for the model coefficients.
+        initial_fit (bool, optional): Whether this is an initial (model selection) fit. Defaults to False.
 
     Returns:
         The result of the model fitting.
@@ -113,26 +231,26 @@ def fit_model(model_key, fit_input, x0: ModelCoefficients, bnds):
 
     if model_key == "hdd_tidd_cdd_smooth":
         res = fit_hdd_tidd_cdd(
-            *fit_input, smooth=True, x0=x0, bnds=bnds, initial_fit=False
+            *fit_input, smooth=True, x0=x0, bnds=bnds, initial_fit=initial_fit
         )
 
     elif model_key == "hdd_tidd_cdd":
         res = fit_hdd_tidd_cdd(
-            *fit_input, smooth=False, x0=x0, bnds=bnds, initial_fit=False
+            *fit_input, smooth=False, x0=x0, bnds=bnds, initial_fit=initial_fit
         )
 
     elif model_key == "c_hdd_tidd_smooth":
         res = fit_c_hdd_tidd(
-            *fit_input, smooth=True, x0=x0, bnds=bnds, initial_fit=False
+            *fit_input, smooth=True, x0=x0, bnds=bnds, initial_fit=initial_fit
         )
 
     elif model_key == "c_hdd_tidd":
         res = fit_c_hdd_tidd(
-            *fit_input, smooth=False, x0=x0, bnds=bnds, initial_fit=False
+            *fit_input, smooth=False, x0=x0, bnds=bnds, initial_fit=initial_fit
         )
 
     elif model_key == "tidd":
-        res = fit_tidd(*fit_input, x0, bnds, initial_fit=False)
+        res = fit_tidd(*fit_input, x0, bnds, initial_fit=initial_fit)
 
     return res
 
@@ -143,7 +261,7 @@ def fit_final_model(df_meter, HoF: OptimizedResult, settings, print_res=False):
     HoF (Hall of Fame) denotes the optimized results.
 
     Args:
-        df_meter (pandas.DataFrame): DataFrame containing temperature and observed values.
+        df_meter (pandas.DataFrame or dict): DataFrame, or dict of arrays, containing temperature and observed values.
         HoF (OptimizedResult): OptimizedResult object containing the optimized model and coefficients.
         settings (Settings): DailySettings object containing the settings for the model fitting.
         print_res (bool, optional): Whether to print the results. Defaults to False.
@@ -158,8 +276,8 @@ def fit_final_model(df_meter, HoF: OptimizedResult, settings, print_res=False):
 
         return bnds
 
-    T = df_meter["temperature"].values
-    obs = df_meter["observed"].values
+    T = np.asarray(df_meter["temperature"])
+    obs = np.asarray(df_meter["observed"])
 
     opt_options = _get_opt_options(settings)
     fit_input = [T, obs, settings, opt_options]
@@ -20,6 +20,8 @@
 
 import itertools
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Union
 
 import numpy as np
@@ -54,6 +56,9 @@ from eemeter.eemeter.models.daily.utilities.selection_criteria import selection_
 
 
 class DailyModel:
+    # executor shared by the component fits of a fit, see _component_pool
+    _component_executor = None
+
     def __init__(
         self,
         model="current",
@@ -139,7 +144,13 @@ class DailyModel:
             "wd": [n + 1 for n in n_week if self.settings.is_weekday[n + 1]],
             "we": [n + 1 for n in n_week if not self.settings.is_weekday[n + 1]],
         }
+
+        # segment code = 2*season + is_weekend, indexed by season name and day of week
+        self.season_codes = {"summer": 0, "shoulder": 1, "winter": 2}
+        self.weekend_codes = np.zeros(len(n_week) + 1, dtype=np.int64)
+        self.weekend_codes[self.combo_dictionary["we"]] = 1
         self.verbose = verbose
+        self.is_fitted = False
 
         self.error = {
             "wRMSE": np.nan,
@@ -149,16 +160,38 @@ class DailyModel:
             "PNRMSE": np.nan,
         }
 
-    def fit(self, baseline_data: DailyBaselineData, ignore_disqualification=False):
+    def fit(
+        self,
+        baseline_data: DailyBaselineData,
+        ignore_disqualification=False,
+        prior_model=None,
+    ):
+        """
+        Fits the model to the baseline data.
+
+        If a prior model is given, each component is warm started from the prior submodel
+        covering most of its data. Components whose prior submodel does not describe the
+        new data better than its mean are fit from a cold start.
+
+        Parameters:
+            baseline_data (DailyBaselineData): The baseline data to fit the model to.
+            ignore_disqualification (bool, optional): Whether to fit disqualified baseline data. Defaults to False.
+            prior_model (DailyModel | DailyModelParameters | dict | str, optional): A previously fitted model,
+                its parameters, or the output of its to_dict or to_json methods. Defaults to None.
+
+        Returns:
+            DailyModel: The fitted model.
+        """
         if not isinstance(baseline_data, DailyBaselineData):
             raise TypeError("baseline_data must be a DailyBaselineData object")
+        prior_params = self._prior_params(prior_model)
         baseline_data.log_warnings()
         if baseline_data.disqualification and not ignore_disqualification:
             raise DataSufficiencyError("Can't fit model on disqualified baseline data")
         self.baseline_timezone = baseline_data.tz
         self.warnings = baseline_data.warnings
         self.disqualification = baseline_data.disqualification
-        self._fit(baseline_data.df)
+        self._fit(baseline_data.df, prior_params)
         if self.error["CVRMSE"] > self.settings.cvrmse_threshold:
             cvrmse_warning = EEMeterWarning(
                 qualified_name="eemeter.model_fit_metrics.cvrmse",
@@ -171,21 +204,24 @@ class DailyModel:
             self.disqualification.append(cvrmse_warning)
         return self
 
-    def _fit(self, meter_data):
+    def _fit(self, meter_data, prior_params=None):
         # Initialize dataframe
         self.df_meter = self._initialize_data(meter_data)
+        self.segment_codes = self._segment_codes(self.df_meter)
+        self.segment_index = self._segment_index(self.segment_codes)
 
         # Begin fitting
         self.combinations = self._combinations()
         self.components = self._components()
-        self.fit_components = self._fit_components()
+        with self._component_pool():
+            self.fit_components = self._fit_components(prior_params)
 
-        # calculate mean bias error for no splits
-        self.wRMSE_base = self._get_error_metrics("fw-su_sh_wi")[0]
+            # calculate mean bias error for no splits
+            self.wRMSE_base = self._get_error_metrics("fw-su_sh_wi")[0]
 
-        # find best combination
-        self.best_combination = self._best_combination(print_out=False)
-        self.model = self._final_fit(self.best_combination)
+            # find best combination
+            self.best_combination = self._best_combination(print_out=False)
+            self.model = self._final_fit(self.best_combination)
 
         self.id = meter_data.index.unique()[0]
 
@@ -249,11 +285,13 @@ class DailyModel:
         # initialize data to input dataframe
         initial_index = df_eval.index
         df_eval = self._initialize_data(df_eval)
+        segment_index = self._segment_index(self._segment_codes(df_eval))
+        T_eval = df_eval["temperature"].values
 
         df_all_models = []
         for component_key in self.params.submodels.keys():
-            eval_segment = self._meter_segment(component_key, df_eval)
-            T = eval_segment["temperature"].values
+            rows = self._segment_rows(component_key, segment_index)
+            T = T_eval[rows]
 
             # model, unc, hdd_load, cdd_load = self.model[component_key].eval(T)
             model, unc, hdd_load, cdd_load = self._predict_submodel(
@@ -267,7 +305,7 @@ class DailyModel:
                     "heating_load": hdd_load,
                     "cooling_load": cdd_load,
                 },
-                index=eval_segment.index,
+                index=df_eval.index[rows],
             )
             df_model["model_split"] = component_key
             df_model["model_type"] = self.params.submodels[
@@ -578,7 +616,6 @@ class DailyModel:
                 list: Trimmed list of combinations to be tested.
             """
 
-            meter = self.df_meter
             allow_sep_summer = settings.allow_separate_summer
             allow_sep_shoulder = settings.allow_separate_shoulder
             allow_sep_winter = settings.allow_separate_winter
@@ -601,15 +638,17 @@ class DailyModel:
                 if allow_sep_weekday_weekend and not allow_split["weekday_weekend"]:
                     allow_sep_weekday_weekend = False
 
-            we_days = self.combo_dictionary["we"]
+            def season_count(season, day_codes=(0, 1)):
+                code = 2 * self.season_codes[season]
+                return sum(len(self.segment_index[code + d]) for d in day_codes)
 
-            if (meter["season"].values == "summer").sum() < split_min_days:
+            if season_count("summer") < split_min_days:
                 allow_sep_summer = False
 
-            if (meter["season"].values == "shoulder").sum() < split_min_days:
+            if season_count("shoulder") < split_min_days:
                 allow_sep_shoulder = False
 
-            if (meter["season"].values == "winter").sum() < split_min_days:
+            if season_count("winter") < split_min_days:
                 allow_sep_winter = False
 
             combo_list_trimmed = []
@@ -637,10 +676,9 @@ class DailyModel:
 
                     we_count = 0
                     for season in seasons:
-                        we_count += (
-                            (meter["season"].values == self.combo_dictionary[season])
-                            & meter["day_of_week"].isin(we_days).values
-                        ).sum()
+                        we_count += season_count(
+                            self.combo_dictionary[season], day_codes=(1,)
+                        )
 
                     if we_count < split_min_days / 3.75:
                         valid_combo = False
@@ -679,32 +717,101 @@ class DailyModel:
 
         return combo_list
 
-    def _meter_segment(self, component, meter=None):
+    def _segment_codes(self, meter):
         """
-        Returns a meter segment based on the given component and meter data.
+        Returns the integer season/day type code of each row of the meter data.
 
         Parameters:
-            component (str): A string representing the component to filter the meter data by.
-            meter (pandas.DataFrame, optional): A pandas DataFrame containing the meter data. Defaults to None.
+            meter (pandas.DataFrame): A pandas DataFrame containing the meter data.
 
         Returns:
-            pandas.DataFrame: A pandas DataFrame containing the meter data filtered by the given component.
+            numpy.ndarray: 2*season + is_weekend for each row, or -1 if the season is unknown.
         """
 
-        if meter is None:
-            meter = self.df_meter
+        season = pd.Categorical(
+            meter["season"], categories=list(self.season_codes)
+        ).codes.astype(np.int64)
+        weekend = self.weekend_codes[meter["day_of_week"].values]
 
-        season_list = component[3:].split("_")
-        day_list = component[:2]
+        return np.where(season < 0, -1, 2 * season + weekend)
 
-        seasons = [self.combo_dictionary[key] for key in season_list]
-        days = self.combo_dictionary[day_list]
+    def _component_codes(self, component):
+        """
+        Returns the season/day type codes contained in a component.
 
-        meter_segment = meter[
-            meter["season"].isin(seasons) & meter["day_of_week"].isin(days)
+        Parameters:
+            component (str): A string representing the component, e.g. 'wd-su_sh'.
+
+        Returns:
+            list: The segment codes of the component.
+        """
+
+        seasons = [self.combo_dictionary[key] for key in component[3:].split("_")]
+        days = self.combo_dictionary[component[:2]]
+        weekend = np.unique(self.weekend_codes[days])
+
+        return [
+            2 * self.season_codes[season] + w for season in seasons for w in weekend
         ]
 
-        return meter_segment
+    def _segment_index(self, codes):
+        """
+        Returns the row positions of the meter data for each season/day type code.
+
+        Parameters:
+            codes (numpy.ndarray): The segment code of each row of the meter data from _segment_codes.
+
+        Returns:
+            dict: A dictionary mapping each segment code to a sorted array of row positions.
+        """
+
+        idx_sorted = np.argsort(codes, kind="stable")
+
+        n_codes = 2 * len(self.season_codes)
+        bounds = np.searchsorted(codes[idx_sorted], np.arange(n_codes + 1))
+
+        return {
+            code: idx_sorted[bounds[code] : bounds[code + 1]] for code in range(n_codes)
+        }
+
+    def _segment_rows(self, component, segment_index=None):
+        """
+        Returns the row positions of the meter data in the given component.
+
+        Parameters:
+            component (str): A string representing the component to filter the meter data by.
+            segment_index (dict, optional): The segment index of the meter data from _segment_index. Defaults to
+                the segment index of the fitted meter data.
+
+        Returns:
+            numpy.ndarray: The sorted row positions of the meter data in the component.
+        """
+
+        if segment_index is None:
+            segment_index = self.segment_index
+
+        rows = [segment_index[code] for code in self._component_codes(component)]
+
+        return np.sort(np.concatenate(rows))
+
+    def _meter_segment(self, rows):
+        """
+        Returns the temperature and observed arrays of the fitted meter data at the given row positions.
+
+        Only these arrays are used by the fitting functions, so the other columns of the meter data are
+        not copied for each component.
+
+        Parameters:
+            rows (numpy.ndarray): Row positions from _segment_rows.
+
+        Returns:
+            dict: The 'temperature' and 'observed' arrays of the rows.
+        """
+
+        return {
+            "temperature": self.df_meter["temperature"].values[rows],
+            "observed": self.df_meter["observed"].values[rows],
+        }
 
     def _components(self):
         """
@@ -718,12 +825,93 @@ class DailyModel:
 
         return components
 
-    def _fit_components(self):
+    def _prior_params(self, prior_model):
+        """
+        Returns the parameters of a prior model used to warm start fitting.
+
+        Parameters:
+            prior_model (DailyModel | DailyModelParameters | dict | str | None): The prior model.
+
+        Returns:
+            DailyModelParameters | None: The parameters of the prior model.
+        """
+
+        if prior_model is None or isinstance(prior_model, DailyModelParameters):
+            return prior_model
+
+        if isinstance(prior_model, DailyModel):
+            if not prior_model.is_fitted:
+                raise ValueError("prior_model must be fit before it can be used")
+            return prior_model.params
+
+        if isinstance(prior_model, str):
+            prior_model = json.loads(prior_model)
+
+        if isinstance(prior_model, dict):
+            return DailyModelParameters(
+                submodels=prior_model.get("submodels"),
+                info=prior_model.get("info"),
+                settings=prior_model.get("settings"),
+            )
+
+        raise TypeError(
+            "prior_model must be a DailyModel, DailyModelParameters, dict or JSON string"
+        )
+
+    def _prior_submodel(self, prior_params, rows, meter_segment):
+        """
+        Returns the prior submodel used to warm start the fit of a meter segment.
+
+        The prior submodel covering the most days of the segment is selected. It is rejected
+        if its predictions have a larger RMSE on the segment than the segment's standard deviation.
+
+        Parameters:
+            prior_params (DailyModelParameters | None): The parameters of the prior model.
+            rows (numpy.ndarray): The row positions of the meter segment from _segment_rows.
+            meter_segment (dict): The arrays of the meter segment to be fit from _meter_segment.
+
+        Returns:
+            DailySubmodelParameters | None: The prior submodel, or None to fit from a cold start.
+        """
+
+        if prior_params is None or len(rows) == 0:
+            return None
+
+        codes = self.segment_codes[rows]
+
+        def segment_count(component):
+            try:
+                return np.isin(codes, self._component_codes(component)).sum()
+            except KeyError:
+                return 0
+
+        component = max(prior_params.submodels, key=segment_count, default=None)
+        if component is None or segment_count(component) == 0:
+            return None
+
+        submodel = prior_params.submodels[component]
+
+        T = meter_segment["temperature"]
+        obs = meter_segment["observed"]
+        model = self._predict_submodel(submodel, T)[0]
+
+        if not np.all(np.isfinite(model)):
+            return None
+
+        if np.sqrt(np.mean((obs - model) ** 2)) > np.std(obs):
+            return None
+
+        return submodel
+
+    def _fit_components(self, prior_params=None):
         """
         Fits initial models for each component using the meter segment data and component settings.
 
         If the alpha_final_type is "last", the settings are updated to disable the final bounds scalar and set alpha_final_type to None.
 
+        Parameters:
+            prior_params (DailyModelParameters, optional): The parameters of a prior model used to warm start the component fits. Defaults to None.
+
         Returns:
             dict: A dictionary containing the fitted components.
         """
@@ -741,17 +929,72 @@ class DailyModel:
         else:
             self.component_settings = self.settings
 
-        fit_components = {item: None for item in self.components}
-        for component in fit_components.keys():
-            meter_segment = self._meter_segment(component)
-
-            # Fit new models
-            fit_components[component] = fit_initial_models_from_full_model(
-                meter_segment, self.component_settings, print_res=False
+        fit_args = []
+        for component in self.components:
+            rows = self._segment_rows(component)
+            meter_segment = self._meter_segment(rows)
+            prior_submodel = self._prior_submodel(prior_params, rows, meter_segment)
+            fit_args.append(
+                (meter_segment, self.component_settings, False, prior_submodel)
             )
 
+        # Fit new models
+        fit_res = self._map_components(fit_initial_models_from_full_model, fit_args)
+        fit_components = dict(zip(self.components, fit_res))
+
         return fit_components
 
+    @contextmanager
+    def _component_pool(self):
+        """
+        Opens the executor which fits the components during a fit.
+
+        A thread or process pool is opened if 'component_executor' is set in the settings,
+        and shared by all calls to _map_components until the context exits, so that the
+        workers are started once per fit.
+        """
+
+        executor_type = self.settings.component_executor
+        if executor_type is None:
+            yield
+            return
+
+        if executor_type == "thread":
+            executor_cls = ThreadPoolExecutor
+        else:
+            executor_cls = ProcessPoolExecutor
+
+        with executor_cls(max_workers=self.settings.component_max_workers) as executor:
+            self._component_executor = executor
+            try:
+                yield
+            finally:
+                self._component_executor = None
+
+    def _map_components(self, fcn, args_list):
+        """
+        Applies a fitting function to each set of component arguments.
+
+        Components are fit serially unless 'component_executor' is set in the settings,
+        in which case they are submitted to the pool opened by _component_pool. Results are
+        always returned in the same order as args_list.
+
+        Parameters:
+            fcn (callable): The fitting function.
+            args_list (list): A list of argument tuples, one per component.
+
+        Returns:
+            list: The fitting function output for each set of arguments.
+        """
+
+        executor = self._component_executor
+        if executor is None or len(args_list) < 2:
+            return [fcn(*args) for args in args_list]
+
+        futures = [executor.submit(fcn, *args) for args in args_list]
+
+        return [future.result() for future in futures]
+
     def _combination_selection_criteria(self, combination):
         """
         Calculates the selection criteria for a given combination of components.
@@ -827,6 +1070,8 @@ class DailyModel:
         """
 
         model = {}
+        final_components = []
+        fit_args = []
         for component in combination.split("__"):
             settings = self.settings
             prior_model = self.fit_components[component]
@@ -842,16 +1087,18 @@ class DailyModel:
             settings = update_daily_settings(self.settings, settings_update)
 
             # separate meter appropriately
-            meter_segment = self._meter_segment(component)
+            meter_segment = self._meter_segment(self._segment_rows(component))
 
-            # Fit new models
             if self.verbose:
                 print(f"{component}__{prior_model.model_name}")
 
-            model[component] = fit_final_model(
-                meter_segment, prior_model, settings, print_res=self.verbose
-            )
+            final_components.append(component)
+            fit_args.append((meter_segment, prior_model, settings, self.verbose))
 
+        # Fit new models
+        fit_res = self._map_components(fit_final_model, fit_args)
+        for component, component_model in zip(final_components, fit_res):
+            model[component] = component_model
             model[component].settings = self.settings  # overwrite to input settings
 
         return model
@@ -18,10 +18,28 @@
 
 """
 
+import numba
 import numpy as np
+from scipy.optimize import approx_fprime
 
-from eemeter.common.utils import OoM
 from eemeter.common.utils import fast_std as stdev
+from eemeter.common.utils import fast_std_numba, pairwise_sum
+from eemeter.eemeter.models.daily.base_models.full_model import (
+    full_model,
+    full_model_jacobian,
+    full_model_weight_adaptive_alpha,
+    full_model_weight_fixed_alpha,
+)
+from eemeter.eemeter.models.daily.utilities.base_model import get_smooth_coeffs_numba
+
+# base models with a compiled objective function
+compiled_model_id = {
+    "hdd_tidd_cdd_smooth": 0,
+    "hdd_tidd_cdd": 1,
+    "c_hdd_tidd_smooth": 2,
+    "c_hdd_tidd": 3,
+    "tidd": 4,
+}
 
 
 def get_idx(A, B):
@@ -107,11 +125,17 @@ def obj_fcn_decorator(
     alpha=2.0,
     coef_id=[],
     initial_fit=True,
+    model_key=None,
 ):
     """
     A decorator function that calculates the elastic net penalty for a given set of inputs and the objective function
     for input to optimization algorithms.
 
+    If settings.compiled_objective is True and model_key is one of compiled_model_id, loss evaluations during
+    optimization use the compiled objective function, which gives identical results. If alpha is "adaptive" and
+    settings.adaptive_alpha_warm_start is True, the alpha of each evaluation is warm started from the previous
+    evaluation, so results match only to the tolerance of the alpha solver.
+
     Parameters:
     model_fcn_full (function): The full model function.
     weight_fcn (function): The weight function.
@@ -122,6 +146,7 @@ def obj_fcn_decorator(
     alpha (float): The alpha value for the elastic net penalty. Default is 2.0.
     coef_id (list): The list of coefficient IDs. Default is an empty list.
     initial_fit (bool): Whether or not this is the initial fit. Default is True.
+    model_key (str): The base model key used to select the compiled objective function. Default is None.
 
     Returns:
     obj_fcn (function): an objective function having the required inputs for optimization via SciPy and NLopt.
@@ -142,29 +167,111 @@ def obj_fcn_decorator(
     ridge_a = (
         1 - settings.regularization_percent_lasso
     ) * settings.regularization_alpha
+    regularize = settings.regularization_alpha != 0
 
-    idx_k = get_idx(["dd_k"], coef_id)
-    idx_beta = get_idx(["dd_beta"], coef_id)
-    idx_bp = get_idx(["dd_bp"], coef_id)
+    idx_k = np.array(get_idx(["dd_k"], coef_id), dtype=int)
+    idx_beta = np.array(get_idx(["dd_beta"], coef_id), dtype=int)
+    idx_bp = np.array(get_idx(["dd_bp"], coef_id), dtype=int)
     # idx_reg = get_idx(["dd_beta", "dd_k"], coef_id) # drop bps and intercept from regularization
-    idx_reg = get_idx(
-        ["dd_beta", "dd_k", "dd_bp"], coef_id
+    idx_reg = np.array(
+        get_idx(["dd_beta", "dd_k", "dd_bp"], coef_id), dtype=int
     )  # drop intercept from regularization
 
-    def elastic_net_penalty(X, T_sorted, obs_sorted, weight_sorted, wRMSE):
+    # T and obs are fixed during optimization, sort once rather than every evaluation
+    idx_sorted = np.argsort(T).flatten()
+    idx_initial = np.argsort(idx_sorted).flatten()
+    T_sorted = T[idx_sorted]
+    obs_sorted = obs[idx_sorted]
+
+    analytic_grad = (model_key in compiled_model_id) and (alpha == 2)
+
+    use_compiled_obj_fcn = (
+        model_key in compiled_model_id
+    ) and settings.compiled_objective
+    if use_compiled_obj_fcn:
+        adaptive_alpha = alpha == "adaptive"
+        alpha_warm_start = adaptive_alpha and settings.adaptive_alpha_warm_start
+
+        # scaled alpha of each weight segment, kept between evaluations if warm starting
+        alpha_state = np.full(3, np.nan)
+
+        compiled_args = (
+            T,
+            obs,
+            T_fit_bnds,
+            idx_sorted,
+            idx_initial,
+            T_sorted,
+            obs_sorted,
+            idx_k,
+            idx_beta,
+            idx_bp,
+            idx_reg,
+            N_min,
+            2.0 if adaptive_alpha else float(alpha),
+            adaptive_alpha,
+            sigma,
+            quantile,
+            min_weight,
+            lasso_a,
+            ridge_a,
+            regularize,
+        )
+
+    def region_slices(X, X_enet):
+        """
+        Returns the (start, stop) bounds of the hdd, tidd and cdd regions within T_sorted.
+        Because T_sorted is monotonic, every region is a contiguous block found with searchsorted.
+        """
+
+        if len(idx_bp) == 2:
+            [hdd_bp, cdd_bp] = X[idx_bp]
+
+            hdd_stop = np.searchsorted(T_sorted, hdd_bp, side="left")
+            cdd_start = np.searchsorted(T_sorted, cdd_bp, side="right")
+
+            hdd = (0, hdd_stop)
+            tidd = (hdd_stop, max(hdd_stop, cdd_start))
+            cdd = (cdd_start, N)
+
+        elif len(idx_bp) == 1:
+            bp = X[idx_bp][0]
+            if X_enet[idx_beta] < 0:  # HDD_TIDD
+                bp_idx = np.searchsorted(T_sorted, bp, side="right")
+
+                hdd = (0, bp_idx)
+                tidd = (bp_idx, N)
+                cdd = (N, N)
+
+            else:  # CDD_TIDD
+                bp_idx = np.searchsorted(T_sorted, bp, side="left")
+
+                hdd = (0, 0)
+                tidd = (0, bp_idx)
+                cdd = (bp_idx, N)
+
+        else:
+            hdd = (0, 0)
+            tidd = (0, N)
+            cdd = (N, N)
+
+        return hdd, tidd, cdd
+
+    def elastic_net_penalty(X, weight_sorted, wRMSE, calc_grad=False):
         """
         Calculates the elastic net penalty for a given set of inputs. The elastic net is a regularized
         regression method that linearly combines the L1 and L2 penalties of the lasso and ridge methods.
 
         Parameters:
         X (array-like): The input array.
-        T_sorted (array-like): The sorted temperature array.
-        obs_sorted (array-like): The sorted observation array.
         weight_sorted (array-like): The sorted weight array.
         wRMSE (float): The weighted root mean squared error.
+        calc_grad (bool): Whether to also return the gradient. Default is False.
 
         Returns:
         penalty (float): The elastic net penalty.
+        penalty_grad (array-like): If calc_grad, the gradient of the penalty with respect to X.
+        penalty_grad_wRMSE (float): If calc_grad, the derivative of the penalty with respect to wRMSE.
         """
 
         # Elastic net
@@ -181,73 +288,56 @@ def obj_fcn_decorator(
 
             X_enet[idx_bp] *= wRMSE / T_range
 
-        # Find idx for regions
-        if len(idx_bp) == 2:
-            [hdd_bp, cdd_bp] = X[idx_bp]
-
-            idx_hdd = np.argwhere(T_sorted < hdd_bp).flatten()
-            idx_tidd = np.argwhere(
-                (hdd_bp <= T_sorted) & (T_sorted <= cdd_bp)
-            ).flatten()
-            idx_cdd = np.argwhere(cdd_bp < T_sorted).flatten()
-
-        elif len(idx_bp) == 1:
-            bp = X[idx_bp]
-            if X_enet[idx_beta] < 0:  # HDD_TIDD
-                idx_hdd = np.argwhere(T_sorted <= bp).flatten()
-                idx_tidd = np.argwhere(bp < T_sorted).flatten()
-                idx_cdd = np.array([])
+        # Find bounds of regions
+        hdd, tidd, cdd = region_slices(X, X_enet)
 
-            else:
-                idx_hdd = np.array([])  # CDD_TIDD
-                idx_tidd = np.argwhere(T_sorted < bp).flatten()
-                idx_cdd = np.argwhere(bp <= T_sorted).flatten()
-
-        else:
-            idx_hdd = np.array([])
-            idx_tidd = np.arange(0, len(T_sorted))
-            idx_cdd = np.array([])
-
-        len_hdd = len(idx_hdd)
-        len_tidd = len(idx_tidd)
-        len_cdd = len(idx_cdd)
+        len_hdd = hdd[1] - hdd[0]
+        len_tidd = tidd[1] - tidd[0]
+        len_cdd = cdd[1] - cdd[0]
 
         # combine tidd with hdd/cdd if cdd/hdd are large enough to get stdev
-        if (len_hdd < N_min) and (len_cdd >= N_min):
-            idx_hdd = np.hstack([idx_hdd, idx_tidd])
-        elif (len_hdd >= N_min) and (len_cdd < N_min):
-            idx_cdd = np.hstack([idx_tidd, idx_cdd])
-
-        # change to idx_hdd and idx_cdd to int arrays
-        idx_hdd = idx_hdd.astype(int)
-        idx_cdd = idx_cdd.astype(int)
-
+        if len_tidd > 0:
+            if (len_hdd < N_min) and (len_cdd >= N_min):
+                hdd = (hdd[0], tidd[1])
+            elif (len_hdd >= N_min) and (len_cdd < N_min):
+                cdd = (tidd[0], cdd[1])
+
+        idx_hdd = slice(*hdd)
+        idx_cdd = slice(*cdd)
+        N_hdd = hdd[1] - hdd[0]
+        N_cdd = cdd[1] - cdd[0]
+
+        # weighted_std normalizes weights in place, each call gets its own copy
         ## Normalize slopes ##
         # calculate stdevs
-        if (len(idx_bp) == 2) and (len(idx_hdd) >= N_min) and (len(idx_cdd) >= N_min):
+        if (len(idx_bp) == 2) and (N_hdd >= N_min) and (N_cdd >= N_min):
             N_beta = np.array([len_hdd, len_cdd])
             T_stdev = np.array(
                 [
-                    stdev(T_sorted[idx_hdd], weights=weight_sorted[idx_hdd]),
-                    stdev(T_sorted[idx_cdd], weights=weight_sorted[idx_cdd]),
+                    stdev(T_sorted[idx_hdd], weights=weight_sorted[idx_hdd].copy()),
+                    stdev(T_sorted[idx_cdd], weights=weight_sorted[idx_cdd].copy()),
                 ]
             )
             obs_stdev = np.array(
                 [
-                    stdev(obs_sorted[idx_hdd], weights=weight_sorted[idx_hdd]),
-                    stdev(obs_sorted[idx_cdd], weights=weight_sorted[idx_cdd]),
+                    stdev(obs_sorted[idx_hdd], weights=weight_sorted[idx_hdd].copy()),
+                    stdev(obs_sorted[idx_cdd], weights=weight_sorted[idx_cdd].copy()),
                 ]
             )
 
-        elif (len(idx_bp) == 1) and (len(idx_hdd) >= N_min):
+        elif (len(idx_bp) == 1) and (N_hdd >= N_min):
             N_beta = np.array([len_hdd])
-            T_stdev = stdev(T_sorted[idx_hdd], weights=weight_sorted[idx_hdd])
-            obs_stdev = stdev(obs_sorted[idx_hdd], weights=weight_sorted[idx_hdd])
+            T_stdev = stdev(T_sorted[idx_hdd], weights=weight_sorted[idx_hdd].copy())
+            obs_stdev = stdev(
+                obs_sorted[idx_hdd], weights=weight_sorted[idx_hdd].copy()
+            )
 
-        elif (len(idx_bp) == 1) and (len(idx_cdd) >= N_min):
+        elif (len(idx_bp) == 1) and (N_cdd >= N_min):
             N_beta = np.array([len_cdd])
-            T_stdev = stdev(T_sorted[idx_cdd], weights=weight_sorted[idx_cdd])
-            obs_stdev = stdev(obs_sorted[idx_cdd], weights=weight_sorted[idx_cdd])
+            T_stdev = stdev(T_sorted[idx_cdd], weights=weight_sorted[idx_cdd].copy())
+            obs_stdev = stdev(
+                obs_sorted[idx_cdd], weights=weight_sorted[idx_cdd].copy()
+            )
 
         else:
             N_beta = np.array([len_tidd])
@@ -272,6 +362,12 @@ def obj_fcn_decorator(
                 X_enet[idx_beta] / 2
             )  # uncertain what to divide by, this seems to work well
 
+        if calc_grad:
+            beta_scale = np.ones(len(idx_beta)) * T_stdev / obs_stdev
+            beta_scale = np.where(N_beta < N_min, beta_scale * 1e30, beta_scale)
+
+            X_enet_jac, X_enet_jac_wRMSE = elastic_net_jacobian(X, wRMSE, beta_scale)
+
         X_enet = X_enet[idx_reg]
 
         if ridge_a == 0:
@@ -281,13 +377,84 @@ def obj_fcn_decorator(
                 X_enet, 2
             )
 
-        return penalty
+        if not calc_grad:
+            return penalty
+
+        # region bounds and stdevs are piecewise constant and do not contribute
+        penalty_grad_enet = lasso_a * np.sign(X_enet)
+        X_enet_norm = np.linalg.norm(X_enet, 2)
+        if (ridge_a != 0) and (X_enet_norm > 0):
+            penalty_grad_enet += ridge_a * X_enet / X_enet_norm
+
+        penalty_grad = penalty_grad_enet @ X_enet_jac[idx_reg]
+        penalty_grad_wRMSE = penalty_grad_enet @ X_enet_jac_wRMSE[idx_reg]
+
+        return penalty, penalty_grad, penalty_grad_wRMSE
+
+    def elastic_net_jacobian(X, wRMSE, beta_scale):
+        """
+        Returns the jacobian of the scaled coefficients in elastic_net_penalty with respect to X
+        and their derivative with respect to wRMSE.
+        """
+
+        X_enet = np.array(X, dtype=float).copy()
+        jac = np.eye(len(X))
+        jac_wRMSE = np.zeros(len(X))
+
+        if len(idx_bp) > 0:
+            for idx in idx_bp:
+                idx_closest = np.argmin(np.abs(X[idx] - T_fit_bnds))
+                X_enet[idx] = np.abs(X[idx] - T_fit_bnds[idx_closest])
+                jac[idx, idx] = np.sign(X[idx] - T_fit_bnds[idx_closest])
+
+            if len(idx_bp) == 2:
+                X_enet[idx_bp] += (X[idx_bp][1] - X[idx_bp][0]) / 2
+                jac[idx_bp, idx_bp[0]] -= 0.5
+                jac[idx_bp, idx_bp[1]] += 0.5
+
+            jac_wRMSE[idx_bp] = X_enet[idx_bp] / T_range
+            jac[idx_bp] *= wRMSE / T_range
+
+        jac[idx_beta] *= beta_scale[:, None]
+        X_enet[idx_beta] *= beta_scale
+
+        if len(idx_k) > 0:
+            k = X[idx_k]
+            jac_k = np.eye(len(idx_k))
+            if (len(idx_k) == 2) and (np.sum(k) > 1):
+                jac_k = (jac_k - np.outer(k, np.ones(2)) / np.sum(k)) / np.sum(k)
+                k = k / np.sum(k)
+
+            # X_enet[idx_k] = k*X_enet[idx_beta]/2
+            jac[idx_k] = 0
+            jac[np.ix_(idx_k, idx_k)] = jac_k * X_enet[idx_beta][:, None] / 2
+            jac[idx_k] += (k / 2)[:, None] * jac[idx_beta]
+
+        return jac, jac_wRMSE
+
+    def model_jacobian(X):
+        """
+        Returns the jacobian of the model with respect to X with shape (N, len(X)).
+        """
+
+        model_id = compiled_model_id[model_key]
+        X = np.asarray(X, dtype=np.float64)
+
+        model_x, _ = _full_model_coeffs(model_id, X)
+        jac = full_model_jacobian(*model_x, T_fit_bnds, T)
+
+        return jac @ _full_model_coeffs_jacobian(model_id, X)
 
     def obj_fcn(X, grad=[], optimize_flag=True):
         """
         Creates an objective function having the required inputs for optimization via SciPy and NLopt. If the optimize_flag is true,
         only return the loss. If the optimize_flag is false, return the loss and the model output parameters.
 
+        If grad is a non-empty array, it is filled in place with the gradient of the loss as in NLopt. The gradient is
+        analytic if model_key is one of compiled_model_id and alpha = 2, otherwise it is approximated by finite
+        differences. The analytic gradient holds the weights constant, which is only exact for alpha = 2 where the
+        weights do not depend on the residuals.
+
         Parameters:
         - X: array-like
             Array of coefficients.
@@ -301,15 +468,27 @@ def obj_fcn_decorator(
             Objective function value.
         """
         X = np.array(X)
+        calc_grad = optimize_flag and isinstance(grad, np.ndarray) and (grad.size > 0)
+
+        if calc_grad and not analytic_grad:
+            grad[:] = approx_fprime(X, obj_fcn, np.sqrt(np.finfo(float).eps))
+
+            return obj_fcn(X)
+
+        if optimize_flag and use_compiled_obj_fcn and not calc_grad:
+            if not alpha_warm_start:
+                alpha_state[:] = np.nan
+
+            return _compiled_obj_fcn(
+                compiled_model_id[model_key],
+                X.astype(np.float64),
+                alpha_state,
+                *compiled_args,
+            )
 
         model = model_fcn(X)
-        idx_sorted = np.argsort(T).flatten()
-        idx_initial = np.argsort(idx_sorted).flatten()
         resid = model - obs
 
-        T_sorted = T[idx_sorted]
-        # model_sorted = model[idx_sorted]
-        obs_sorted = obs[idx_sorted]
         resid_sorted = resid[idx_sorted]
         weight_sorted, c, a = weight_fcn(
             *X, T_sorted, resid_sorted, sigma, quantile, alpha, min_weight
@@ -319,10 +498,25 @@ def obj_fcn_decorator(
         wSSE = np.sum(weight * resid**2)
         loss = wSSE / N
 
-        if settings.regularization_alpha != 0:
-            loss += elastic_net_penalty(
-                X, T_sorted, obs_sorted, weight_sorted, np.sqrt(loss)
-            )
+        if calc_grad:
+            loss_grad = 2 / N * (weight * resid) @ model_jacobian(X)
+
+            if regularize:
+                wRMSE = np.sqrt(loss)
+                penalty, penalty_grad, penalty_grad_wRMSE = elastic_net_penalty(
+                    X, weight_sorted, wRMSE, calc_grad=True
+                )
+                loss += penalty
+
+                if wRMSE > 0:
+                    penalty_grad += penalty_grad_wRMSE * loss_grad / (2 * wRMSE)
+
+                loss_grad += penalty_grad
+
+            grad[:] = loss_grad
+
+        elif regularize:
+            loss += elastic_net_penalty(X, weight_sorted, np.sqrt(loss))
 
         if optimize_flag:
             return loss
@@ -333,41 +527,386 @@ def obj_fcn_decorator(
             else:
                 TSS = wSSE
 
-            if initial_fit:
+            if initial_fit or (model_key not in compiled_model_id):
                 jac = None
             else:
-                eps = 10 ** (OoM(X, method="floor") - 2)
-                X_lower = X - eps
-                X_upper = X + eps
-
-                # select correct finite difference scheme based on variable type and value
-                # NOTE: finite differencing was not returning great results. Looking into switching to JAX autodiff
-                fd_type = ["central"] * len(X)
-                for i in range(len(X)):
-                    if i in idx_k:
-                        if X_lower[i] < 0:
-                            fd_type[i] = "forward"
-                        elif X_upper[i] > 1:
-                            fd_type[i] = "backward"
-                    elif i in idx_beta:
-                        if (X[i] > 0) and (X_lower[i] < 0):
-                            fd_type[i] = "forward"
-                        elif (X[i] < 0) and (X_upper[i] > 0):
-                            fd_type[i] = "backward"
-                    elif i in idx_bp:
-                        if X_lower[i] < T_sorted[0]:
-                            fd_type[i] = "forward"
-                        elif X_lower[i] > T_sorted[-1]:
-                            fd_type[i] = "backward"
-
-                # https://stackoverflow.com/questions/70572362/compute-efficiently-hessian-matrices-in-jax
-                # hess = jit(jacfwd(jacrev(no_weights_obj_fcn), has_aux=True), has_aux=True)(X, [model_fcn, obs, idx_bp])
-                # print(hess)
-                # obj_grad_fcn = lambda X: no_weights_obj_fcn(X, [model_fcn, obs, idx_bp])
-
-                # jac = numerical_jacobian(obj_grad_fcn, X, dx=eps, fd_type=fd_type)
-                jac = None
+                jac = model_jacobian(X)
 
             return X, loss, TSS, T, model, weight, resid, jac, np.mean(a), c
 
     return obj_fcn
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _full_model_coeffs(model_id, X):
+    """
+    Converts base model coefficients to full model coefficients
+    [hdd_bp, hdd_beta, hdd_k, cdd_bp, cdd_beta, cdd_k, intercept].
+
+    Returns the coefficients used to evaluate the model and those passed to the weight function.
+    These differ for hdd_tidd_cdd_smooth where the model is evaluated with smoothed breakpoints.
+    """
+
+    if model_id == 0:  # hdd_tidd_cdd_smooth
+        [hdd_bp, hdd_k, cdd_bp, cdd_k] = get_smooth_coeffs_numba(X[0], X[2], X[3], X[5])
+        model_x = np.array([hdd_bp, X[1], hdd_k, cdd_bp, X[4], cdd_k, X[6]])
+
+        return model_x, X.copy()
+
+    elif model_id == 1:  # hdd_tidd_cdd
+        model_x = np.array([X[0], X[1], 0.0, X[2], X[3], 0.0, X[4]])
+
+    elif (model_id == 2) or (model_id == 3):  # c_hdd_tidd_smooth, c_hdd_tidd
+        c_hdd_bp = X[0]
+        c_hdd_beta = X[1]
+        if model_id == 2:
+            c_hdd_k = X[2]
+        else:
+            c_hdd_k = 0.0
+        intercept = X[-1]
+
+        if c_hdd_beta < 0:
+            model_x = np.array(
+                [c_hdd_bp, -c_hdd_beta, c_hdd_k, c_hdd_bp, 0.0, 0.0, intercept]
+            )
+        else:
+            model_x = np.array(
+                [c_hdd_bp, 0.0, 0.0, c_hdd_bp, c_hdd_beta, c_hdd_k, intercept]
+            )
+
+    else:  # tidd
+        model_x = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, X[0]])
+
+    return model_x, model_x
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _full_model_coeffs_jacobian(model_id, X, min_pct_k=0.01):
+    """
+    Returns the jacobian of the full model coefficients used to evaluate the model in _full_model_coeffs
+    with respect to the base model coefficients, with shape (7, len(X)).
+    """
+
+    jac = np.zeros((7, len(X)))
+
+    if model_id == 0:  # hdd_tidd_cdd_smooth
+        [hdd_bp, pct_hdd_k, cdd_bp, pct_cdd_k] = [X[0], X[2], X[3], X[5]]
+
+        jac[1, 1] = jac[4, 4] = jac[6, 6] = 1.0
+        if (pct_hdd_k < min_pct_k) and (pct_cdd_k < min_pct_k):
+            jac[0, 0] = jac[3, 3] = 1.0
+
+            return jac
+
+        # normalized pct_k and their derivatives with respect to [pct_hdd_k, pct_cdd_k]
+        pct_k = np.array([pct_hdd_k, pct_cdd_k])
+        dpct_k = np.eye(2)
+        pct_k_sum = pct_hdd_k + pct_cdd_k
+        if pct_k_sum > 1:
+            dpct_k = (dpct_k - np.outer(pct_k, np.ones(2)) / pct_k_sum) / pct_k_sum
+            pct_k = pct_k / pct_k_sum
+
+        bp_range = cdd_bp - hdd_bp
+
+        # hdd_k = pct_hdd_k*bp_range, cdd_k = pct_cdd_k*bp_range
+        for i, (row_k, sign) in enumerate([(2, 1.0), (5, -1.0)]):
+            jac[row_k, 0] = -pct_k[i]
+            jac[row_k, 3] = pct_k[i]
+            jac[row_k, 2] = bp_range * dpct_k[i, 0]
+            jac[row_k, 5] = bp_range * dpct_k[i, 1]
+
+            # smoothed hdd_bp = hdd_bp + hdd_k, cdd_bp = cdd_bp - cdd_k
+            row_bp = row_k - 2
+            jac[row_bp, :] = sign * jac[row_k, :]
+            jac[row_bp, row_bp] += 1.0
+
+        return jac
+
+    elif model_id == 1:  # hdd_tidd_cdd
+        for row, col in [(0, 0), (1, 1), (3, 2), (4, 3), (6, 4)]:
+            jac[row, col] = 1.0
+
+    elif (model_id == 2) or (model_id == 3):  # c_hdd_tidd_smooth, c_hdd_tidd
+        jac[0, 0] = jac[3, 0] = 1.0
+        jac[6, len(X) - 1] = 1.0
+
+        if X[1] < 0:
+            jac[1, 1] = -1.0
+            if model_id == 2:
+                jac[2, 2] = 1.0
+        else:
+            jac[4, 1] = 1.0
+            if model_id == 2:
+                jac[5, 2] = 1.0
+
+    else:  # tidd
+        jac[6, 0] = 1.0
+
+    return jac
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _compiled_elastic_net_penalty(
+    X,
+    T_sorted,
+    obs_sorted,
+    weight_sorted,
+    wRMSE,
+    T_fit_bnds,
+    idx_k,
+    idx_beta,
+    idx_bp,
+    idx_reg,
+    N_min,
+    lasso_a,
+    ridge_a,
+):
+    """
+    Compiled equivalent of elastic_net_penalty in obj_fcn_decorator.
+
+    The L2 norm is summed sequentially, numpy uses BLAS, so if ridge_a != 0 the penalty may differ
+    in the last bits.
+    """
+
+    N = len(T_sorted)
+    T_range = T_fit_bnds[1] - T_fit_bnds[0]
+
+    # Elastic net
+    X_enet = X.copy()
+
+    ## Scale break points ##
+    n_bp = len(idx_bp)
+    if n_bp > 0:
+        bp_dist = np.empty(n_bp)
+        for i in range(n_bp):
+            bp_dist[i] = np.min(np.abs(X_enet[idx_bp[i]] - T_fit_bnds))
+
+        for i in range(n_bp):
+            X_enet[idx_bp[i]] = bp_dist[i]
+
+        if n_bp == 2:
+            bp_shift = (X[idx_bp[1]] - X[idx_bp[0]]) / 2
+            for i in range(n_bp):
+                X_enet[idx_bp[i]] += bp_shift
+
+        bp_scalar = wRMSE / T_range
+        for i in range(n_bp):
+            X_enet[idx_bp[i]] *= bp_scalar
+
+    # Find bounds of regions
+    if n_bp == 2:
+        hdd_stop = np.searchsorted(T_sorted, X[idx_bp[0]], side="left")
+        cdd_start = np.searchsorted(T_sorted, X[idx_bp[1]], side="right")
+
+        hdd = (0, hdd_stop)
+        tidd = (hdd_stop, max(hdd_stop, cdd_start))
+        cdd = (cdd_start, N)
+
+    elif n_bp == 1:
+        bp = X[idx_bp[0]]
+        if X_enet[idx_beta[0]] < 0:  # HDD_TIDD
+            bp_idx = np.searchsorted(T_sorted, bp, side="right")
+
+            hdd = (0, bp_idx)
+            tidd = (bp_idx, N)
+            cdd = (N, N)
+
+        else:  # CDD_TIDD
+            bp_idx = np.searchsorted(T_sorted, bp, side="left")
+
+            hdd = (0, 0)
+            tidd = (0, bp_idx)
+            cdd = (bp_idx, N)
+
+    else:
+        hdd = (0, 0)
+        tidd = (0, N)
+        cdd = (N, N)
+
+    len_hdd = hdd[1] - hdd[0]
+    len_tidd = tidd[1] - tidd[0]
+    len_cdd = cdd[1] - cdd[0]
+
+    # combine tidd with hdd/cdd if cdd/hdd are large enough to get stdev
+    if len_tidd > 0:
+        if (len_hdd < N_min) and (len_cdd >= N_min):
+            hdd = (hdd[0], tidd[1])
+        elif (len_hdd >= N_min) and (len_cdd < N_min):
+            cdd = (tidd[0], cdd[1])
+
+    (h0, h1) = hdd
+    (c0, c1) = cdd
+
+    ## Normalize slopes ##
+    # calculate stdevs, weights are copied for regions as fast_std_numba normalizes them in place
+    if (n_bp == 2) and (h1 - h0 >= N_min) and (c1 - c0 >= N_min):
+        N_beta = np.array([len_hdd, len_cdd])
+        T_stdev = np.array(
+            [
+                fast_std_numba(T_sorted[h0:h1], weight_sorted[h0:h1].copy()),
+                fast_std_numba(T_sorted[c0:c1], weight_sorted[c0:c1].copy()),
+            ]
+        )
+        obs_stdev = np.array(
+            [
+                fast_std_numba(obs_sorted[h0:h1], weight_sorted[h0:h1].copy()),
+                fast_std_numba(obs_sorted[c0:c1], weight_sorted[c0:c1].copy()),
+            ]
+        )
+
+    elif (n_bp == 1) and (h1 - h0 >= N_min):
+        N_beta = np.array([len_hdd])
+        T_stdev = np.array(
+            [fast_std_numba(T_sorted[h0:h1], weight_sorted[h0:h1].copy())]
+        )
+        obs_stdev = np.array(
+            [fast_std_numba(obs_sorted[h0:h1], weight_sorted[h0:h1].copy())]
+        )
+
+    elif (n_bp == 1) and (c1 - c0 >= N_min):
+        N_beta = np.array([len_cdd])
+        T_stdev = np.array(
+            [fast_std_numba(T_sorted[c0:c1], weight_sorted[c0:c1].copy())]
+        )
+        obs_stdev = np.array(
+            [fast_std_numba(obs_sorted[c0:c1], weight_sorted[c0:c1].copy())]
+        )
+
+    else:
+        N_beta = np.array([len_tidd])
+        T_stdev = np.array([fast_std_numba(T_sorted, weight_sorted)])
+        obs_stdev = np.array([fast_std_numba(obs_sorted, weight_sorted)])
+
+    for i in range(len(idx_beta)):
+        j = min(i, len(N_beta) - 1)
+        X_enet[idx_beta[i]] *= T_stdev[j] / obs_stdev[j]
+
+        # add penalty to slope for not having enough datapoints
+        if N_beta[j] < N_min:
+            X_enet[idx_beta[i]] *= 1e30
+
+    ## Scale smoothing parameter ##
+    n_k = len(idx_k)
+    if n_k > 0:  # reducing X_enet size allows for more smoothing
+        for i in range(n_k):
+            X_enet[idx_k[i]] = X[idx_k[i]]
+
+        if n_k == 2:
+            k_sum = pairwise_sum(X_enet[idx_k])
+            if k_sum > 1:
+                for i in range(n_k):
+                    X_enet[idx_k[i]] /= k_sum
+
+        k_scalar = (
+            X_enet[idx_beta] / 2
+        )  # uncertain what to divide by, this seems to work well
+        for i in range(n_k):
+            X_enet[idx_k[i]] *= k_scalar[i]
+
+    X_enet = X_enet[idx_reg]
+
+    penalty = lasso_a * pairwise_sum(np.abs(X_enet))
+    if ridge_a != 0:
+        penalty += ridge_a * np.sqrt(np.sum(X_enet * X_enet))
+
+    return penalty
+
+
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def _compiled_obj_fcn(
+    model_id,
+    X,
+    alpha_state,
+    T,
+    obs,
+    T_fit_bnds,
+    idx_sorted,
+    idx_initial,
+    T_sorted,
+    obs_sorted,
+    idx_k,
+    idx_beta,
+    idx_bp,
+    idx_reg,
+    N_min,
+    alpha,
+    adaptive_alpha,
+    sigma,
+    quantile,
+    min_weight,
+    lasso_a,
+    ridge_a,
+    regularize,
+):
+    """
+    Compiled equivalent of obj_fcn in obj_fcn_decorator with optimize_flag=True.
+
+    If adaptive_alpha is True, alpha is solved for each weight segment, warm started from finite values
+    in alpha_state, which is updated in place. Otherwise the fixed alpha is used.
+    """
+
+    model_x, weight_x = _full_model_coeffs(model_id, X)
+
+    model = full_model(
+        model_x[0],
+        model_x[1],
+        model_x[2],
+        model_x[3],
+        model_x[4],
+        model_x[5],
+        model_x[6],
+        T_fit_bnds,
+        T,
+    )
+    resid = model - obs
+
+    resid_sorted = resid[idx_sorted]
+    if adaptive_alpha:
+        weight_sorted = full_model_weight_adaptive_alpha(
+            weight_x[0],
+            weight_x[1],
+            weight_x[3],
+            weight_x[4],
+            T_sorted,
+            resid_sorted,
+            alpha_state,
+            sigma,
+            quantile,
+            min_weight,
+        )
+    else:
+        weight_sorted = full_model_weight_fixed_alpha(
+            weight_x[0],
+            weight_x[1],
+            weight_x[3],
+            weight_x[4],
+            T_sorted,
+            resid_sorted,
+            sigma,
+            quantile,
+            alpha,
+            min_weight,
+        )
+
+    weight = weight_sorted[idx_initial]
+    wSSE = pairwise_sum(weight * (resid * resid))
+    loss = wSSE / len(obs)
+
+    if regularize:
+        loss += _compiled_elastic_net_penalty(
+            X,
+            T_sorted,
+            obs_sorted,
+            weight_sorted,
+            np.sqrt(loss),
+            T_fit_bnds,
+            idx_k,
+            idx_beta,
+            idx_bp,
+            idx_reg,
+            N_min,
+            lasso_a,
+            ridge_a,
+        )
+
+    return loss
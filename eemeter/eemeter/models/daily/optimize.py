@@ -64,6 +64,9 @@ nlopt_algorithms = {
 
 nlopt_algorithms = {k.lower(): v for k, v in nlopt_algorithms.items()}
 
+# scipy methods which use the gradient of the objective function
+scipy_gradient_methods = ["cg", "bfgs", "l-bfgs-b", "tnc", "slsqp", "trust-constr"]
+
 pos_msg = [
     "Optimization terminated successfully.",
     "Optimization terminated: Stop Value was reached.",
@@ -98,11 +101,19 @@ def obj_fcn_dec(obj_fcn, x0, bnds):
     idx_opt = [n for n in range(np.shape(bnds)[0]) if (bnds[n, 0] < bnds[n, 1])]
 
     def obj_fcn_eval(
-        x, *args, **kwargs
+        x, grad=[], **kwargs
     ):  # only modify x0 where it has bounds which are not the same
         x0[idx_opt] = x
 
-        return obj_fcn(x0, *args, **kwargs)
+        if np.size(grad) == 0:
+            return obj_fcn(x0, **kwargs)
+
+        # gradient is requested for all coefficients, return only those being optimized
+        grad_full = np.empty(len(x0))
+        obj = obj_fcn(x0, grad_full, **kwargs)
+        grad[:] = grad_full[idx_opt]
+
+        return obj
 
     return obj_fcn_eval, idx_opt
 
@@ -225,10 +236,22 @@ class Optimizer:
             x0_opt = x0[self.idx_opt]
             bnds_opt = bnds[self.idx_opt, :]
 
-            scipy_obj_fcn = lambda x: self.obj_fcn(x)
+            if algorithm.lower() in scipy_gradient_methods:
+
+                def scipy_obj_fcn(x):
+                    grad = np.empty(len(x))
+                    obj = self.obj_fcn(x, grad)
+
+                    return obj, grad
+
+                jac = True
+
+            else:
+                scipy_obj_fcn = lambda x: self.obj_fcn(x)
+                jac = None
 
             res = scipy_minimize(
-                scipy_obj_fcn, x0_opt, method=algorithm, bounds=bnds_opt
+                scipy_obj_fcn, x0_opt, method=algorithm, jac=jac, bounds=bnds_opt
             )
 
         x = res.x
@@ -259,7 +259,7 @@ class OptimizedResult:
             model (numpy.ndarray): Array of model values.
             weight (numpy.ndarray): Array of weights.
             resid (numpy.ndarray): Array of residuals.
-            jac (numpy.ndarray): Array of jacobian values.
+            jac (numpy.ndarray): Jacobian of the model with respect to x, or None.
             mean_loss (float): Mean loss value.
             TSS (float): Total sum of squares.
             success (bool): Whether the optimization was successful.
@@ -303,30 +303,28 @@ class OptimizedResult:
 
         self._prediction_uncertainty()
 
-        if jac is not None:  # for future uncertainty calculations
+        if jac is not None:  # jac is the model jacobian, (N, num_coeffs)
             self.jac = jac
-            self.hess = jac.T * jac
+            self.hess = jac.T @ (weight[:, None] * jac)  # Gauss-Newton approximation
 
             try:
                 self.hess_inv = np.linalg.inv(self.hess)
             except:  # if unable to calculate inverse use Moore-Penrose pseudo-inverse
                 self.hess_inv = np.linalg.pinv(self.hess)
 
-            MSE = np.mean(resid**2)
+            MSE = self.wSSE / self.DoF
             self.cov = MSE * self.hess_inv
 
+            # negative variances come from an ill-conditioned hessian and have no
+            # meaningful uncertainty
+            var = np.diag(self.cov)
+            var = np.where(var < 0, np.nan, var)
+
             unc_alpha = self.settings.uncertainty_alpha
-            self.x_unc = np.sqrt(np.diag(self.cov)) * unc_factor(
+            self.x_unc = np.sqrt(var) * unc_factor(
                 self.DoF + 1, interval="PI", alpha=unc_alpha
             )
 
-            print()
-            print(self.jac)
-            print(", ".join([f"{val:.3e}" for val in self.x]))
-            print(", ".join([f"{val:.3e}" for val in self.x_unc]))
-            print(f"full fcn: {self.f_unc:.2f}")
-            print()
-
         self.success = success
         self.message = message
         self.nfev = nfev
@@ -17,6 +17,7 @@
    limitations under the License.
 
 """
+import nlopt
 import numba
 import numpy as np
 from scipy.optimize import minimize_scalar
@@ -118,6 +119,31 @@ def get_smooth_coeffs(hdd_bp, pct_hdd_k, cdd_bp, pct_cdd_k, min_pct_k=0.01):
     return np.array([hdd_bp, hdd_k, cdd_bp, cdd_k])
 
 
+@numba.jit(nopython=True, error_model="numpy", cache=True)
+def get_smooth_coeffs_numba(hdd_bp, pct_hdd_k, cdd_bp, pct_cdd_k, min_pct_k=0.01):
+    """Compiled equivalent of get_smooth_coeffs (breakpoints are matched, pct_match = 1)"""
+
+    if (pct_hdd_k < min_pct_k) and (pct_cdd_k < min_pct_k):
+        return np.array([hdd_bp, 0.0, cdd_bp, 0.0])
+
+    hdd_w = cdd_w = 0.0
+
+    pct_k_sum = pct_hdd_k + pct_cdd_k
+    if pct_k_sum > 1:
+        pct_hdd_k /= pct_k_sum
+        pct_cdd_k /= pct_k_sum
+
+    # calculate the smoothing parameter as a percentage of the maximum allowed k
+    hdd_k = pct_hdd_k * (cdd_bp - hdd_bp) / (1 - hdd_w)
+    cdd_k = pct_cdd_k * (cdd_bp - hdd_bp) / (1 + cdd_w)
+
+    # move breakpoints based on k
+    hdd_bp = hdd_bp + hdd_k * (1 - hdd_w)
+    cdd_bp = cdd_bp - cdd_k * (1 + cdd_w)
+
+    return np.array([hdd_bp, hdd_k, cdd_bp, cdd_k])
+
+
 @numba.jit(nopython=True, error_model="numpy", cache=True)
 def fix_identical_bnds(bnds):
     for i in np.argwhere(bnds[:, 0] == bnds[:, 1]):
@@ -137,3 +163,105 @@ def get_T_bnds(T, settings):
     T_max_seg = np.partition(T, -n_min_seg)[-n_min_seg]
 
     return [T_min, T_max], [T_min_seg, T_max_seg]
+
+
+def cumulative_sums(T, obs):
+    """
+    Returns the cumulative sums of [1, T, T**2, obs, obs**2, T*obs] with a leading zero.
+    The sums over T[i:j] are S[:, j] - S[:, i].
+
+    Parameters:
+    T (array-like): The sorted temperature array.
+    obs (array-like): The observation array sorted by temperature.
+
+    Returns:
+    numpy array: The cumulative sums with shape (6, len(T) + 1).
+    """
+
+    terms = np.vstack([np.ones_like(T), T, T**2, obs, obs**2, T * obs])
+
+    S = np.zeros((6, len(T) + 1))
+    S[:, 1:] = np.cumsum(terms, axis=1)
+
+    return S
+
+
+def grid_search_candidates(T, T_min, T_max, max_candidates=100):
+    """
+    Returns candidate breakpoints for a grid search from the unique temperatures within [T_min, T_max].
+    If there are more than max_candidates, evenly spaced temperatures are selected.
+    """
+
+    T_cand = np.unique(T[(T >= T_min) & (T <= T_max)])
+    if len(T_cand) == 0:
+        T_cand = np.array([0.5 * (T_min + T_max)])
+
+    if len(T_cand) > max_candidates:
+        idx = np.round(np.linspace(0, len(T_cand) - 1, max_candidates)).astype(int)
+        T_cand = T_cand[idx]
+
+    return T_cand
+
+
+def refine_grid_candidates(
+    obj_fcn, candidates, scores, bnds, initial_step, n_refine=3, maxeval=20
+):
+    """
+    Refines the best scoring grid search candidates with a short local optimization of the objective function.
+    Candidates closer than initial_step to a better candidate are skipped so that distinct minima are refined.
+
+    Parameters:
+    obj_fcn (function): The nlopt objective function.
+    candidates (array-like): The candidates with shape (n_candidates, n_dim).
+    scores (array-like): The approximate objective function value of each candidate.
+    bnds (array-like): The lower and upper bounds with shape (2, n_dim).
+    initial_step (float): The initial step size of the local optimization.
+    n_refine (int, optional): The number of candidates to refine. Default is 3.
+    maxeval (int, optional): The maximum number of objective function evaluations per candidate. Default is 20.
+
+    Returns:
+    numpy array: The best refined candidate.
+    """
+
+    n_dim = candidates.shape[1]
+
+    selected = []
+    for i in np.argsort(scores, kind="stable"):
+        if not np.isfinite(scores[i]):
+            break
+
+        x = np.clip(candidates[i], bnds[0], bnds[1])
+        if any(np.max(np.abs(x - x_sel)) < initial_step for x_sel in selected):
+            continue
+
+        selected.append(x)
+        if len(selected) >= n_refine:
+            break
+
+    if len(selected) == 0:
+        selected.append(np.clip(np.mean(bnds, axis=0), bnds[0], bnds[1]))
+
+    if initial_step <= 0:  # bounds collapsed to a point, nothing to refine
+        return selected[0]
+
+    x_best = None
+    obj_best = np.inf
+    for x0 in selected:
+        opt = nlopt.opt(nlopt.LN_SBPLX, n_dim)
+        opt.set_min_objective(obj_fcn)
+
+        opt.set_initial_step(np.ones(n_dim) * initial_step)
+        opt.set_maxeval(maxeval)
+        opt.set_xtol_rel(1e-3)
+        opt.set_xtol_abs(0.5)
+        opt.set_lower_bounds(bnds[0])
+        opt.set_upper_bounds(bnds[1])
+
+        x_opt = opt.optimize(x0)
+        obj_opt = opt.last_optimum_value()
+
+        if (x_best is None) or (obj_opt < obj_best):
+            x_best = x_opt
+            obj_best = obj_opt
+
+    return x_best
@@ -85,6 +85,14 @@ class AlgorithmChoice:
     NLOPT_VAR2 = "nlopt_VAR2"
 
 
+class InitialGuessAlgorithmChoice:
+    """
+    choice of initial guess algorithms in addition to the nlopt algorithms of AlgorithmChoice
+    """
+
+    GRID_SEARCH = "grid_search"
+
+
 class AlphaFinalType:
     ALL = "all"
     LAST = "last"
@@ -115,6 +123,12 @@ class FullModelSelection:
     TIDD = "tidd"
 
 
+class ComponentExecutor:
+    THREAD = "thread"
+    PROCESS = "process"
+    NONE = None
+
+
 # endregion
 
 
@@ -226,6 +240,17 @@ def algorithm_choice_validator(instance: DailySettings, attribute: str, value: s
         raise ValueError(f"invalid selection for {attribute.name}")
 
 
+def initial_guess_algorithm_choice_validator(
+    instance: DailySettings, attribute: str, value: str
+):
+    valid_choices = [
+        *_get_pub_class_attrib_dict(AlgorithmChoice).values(),
+        *_get_pub_class_attrib_dict(InitialGuessAlgorithmChoice).values(),
+    ]
+    if value not in [s.lower() for s in valid_choices]:
+        raise ValueError(f"invalid selection for {attribute.name}")
+
+
 def full_model_validator(instance: DailySettings, attribute: str, value: str):
     if value not in [
         s.lower() for s in _get_pub_class_attrib_dict(FullModelSelection).values()
@@ -302,6 +327,23 @@ def initial_step_percentage_validator(
             )
 
 
+def component_executor_validator(
+    instance: DailySettings, attribute: str, value: str | None
+):
+    if value not in get_pub_class_attrib_values(ComponentExecutor):
+        raise ValueError(
+            f"{attribute.name} must be None, 'thread', or 'process' (Input value: {value})"
+        )
+
+
+def component_max_workers_validator(
+    instance: DailySettings, attribute: str, value: int | None
+):
+    if value is not None:
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f"{attribute.name} must be None or 1 <= int")
+
+
 def season_choice_validator(
     instance: DailySettings, attribute: str, season_dict: Dict[int, str]
 ):
@@ -375,7 +417,7 @@ class DailySettings:
 
     initial_guess_algorithm_choice: str = attrs.field(
         converter=lambda x: x.lower() if isinstance(x, str) else x,
-        validator=developer_mode_validation(algorithm_choice_validator),
+        validator=developer_mode_validation(initial_guess_algorithm_choice_validator),
         metadata={_KEY_DESCR: "initial guess optimization algorithm choice"},
         on_setattr=attrs.setters.frozen,
         default=AlgorithmChoice.NLOPT_DIRECT.lower(),  # AlgorithmChoice.NLOPT_STOGO
@@ -696,6 +738,51 @@ class DailySettings:
         default=1.0,
     )
 
+    component_executor: str | None = attrs.field(
+        converter=lambda x: x.lower().strip() if isinstance(x, str) else x,
+        validator=component_executor_validator,
+        metadata={
+            _KEY_DESCR: "executor used to fit model components concurrently: None (serial), 'thread', or 'process'"
+        },
+        on_setattr=attrs.setters.frozen,
+        default=None,
+    )
+
+    component_max_workers: int | None = attrs.field(
+        validator=component_max_workers_validator,
+        metadata={
+            _KEY_DESCR: "maximum number of workers for 'component_executor', None uses the executor default"
+        },
+        on_setattr=attrs.setters.frozen,
+        default=None,
+    )
+
+    compiled_objective: bool = attrs.field(
+        validator=simple_validation(
+            lambda x: isinstance(x, bool),
+            "'compiled_objective' must be bool",
+            dev_setting=False,
+        ),
+        metadata={
+            _KEY_DESCR: "evaluate the objective function during optimization with compiled code"
+        },
+        on_setattr=attrs.setters.frozen,
+        default=False,
+    )
+
+    adaptive_alpha_warm_start: bool = attrs.field(
+        validator=simple_validation(
+            lambda x: isinstance(x, bool),
+            "'adaptive_alpha_warm_start' must be bool",
+            dev_setting=False,
+        ),
+        metadata={
+            _KEY_DESCR: "warm start the adaptive alpha solver from the previous objective function evaluation, requires 'compiled_objective'"
+        },
+        on_setattr=attrs.setters.frozen,
+        default=False,
+    )
+
     def to_dict(self):
         keys = []
         config = {}
@@ -791,7 +878,16 @@ def caltrack_legacy_settings(**kwargs) -> DailySettings:
     default_settings = DailySettings()
 
     dev_mode = "developer_mode" in kwargs and kwargs["developer_mode"]
-    non_dev_settings = ["developer_mode", "season", "is_weekday", "uncertainty_alpha"]
+    non_dev_settings = [
+        "developer_mode",
+        "season",
+        "is_weekday",
+        "uncertainty_alpha",
+        "component_executor",
+        "component_max_workers",
+        "compiled_objective",
+        "adaptive_alpha_warm_start",
+    ]
     for key, val in kwargs.items():
         if key in settings:
             default = settings[key]
@@ -0,0 +1,647 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2024 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+import os
+import time
+import traceback
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from eemeter.eemeter.common.data_processor_utilities import (
+    _equal_length_segments,
+    _interval_overlaps,
+    _missing_high_frequency_meter_data_warning,
+)
+from eemeter.eemeter.common.features import _epoch_nanoseconds
+from eemeter.eemeter.models.billing.data import (
+    BillingBaselineData,
+    BillingReportingData,
+)
+from eemeter.eemeter.models.billing.model import BillingModel
+from eemeter.eemeter.models.daily.data import (
+    DailyBaselineData,
+    DailyReportingData,
+    _daily_temperature_coverage,
+)
+from eemeter.eemeter.models.daily.model import DailyModel
+
+__all__ = ("fit_fleet", "iter_fleet_data")
+
+
+_fleet_models = {
+    "daily": (DailyModel, DailyBaselineData),
+    "billing": (BillingModel, BillingBaselineData),
+}
+
+_fleet_reporting_data = {
+    "daily": DailyReportingData,
+    "billing": BillingReportingData,
+}
+
+_HOUR_NS = pd.Timedelta(hours=1).value
+_DAY_NS = pd.Timedelta(days=1).value
+
+
+def _fit_meter(
+    meter_id,
+    df_meter,
+    model_type,
+    is_electricity_data,
+    settings,
+    ignore_disqualification,
+):
+    """Fit a single meter and return a JSON-friendly result dictionary.
+
+    Exceptions are captured in the result rather than raised so that one bad
+    meter cannot abort the rest of the fleet.
+    """
+    model_cls, data_cls = _fleet_models[model_type]
+
+    res = {
+        "id": meter_id,
+        "success": False,
+        "params": None,
+        "error": None,
+        "warnings": [],
+        "disqualification": [],
+        "timings": {"data": None, "fit": None, "total": None},
+        "exception": None,
+        "traceback": None,
+    }
+
+    t0 = time.perf_counter()
+    try:
+        baseline_data = data_cls(df_meter, is_electricity_data=is_electricity_data)
+        t1 = time.perf_counter()
+        res["timings"]["data"] = t1 - t0
+        res["warnings"] = [w.json() for w in baseline_data.warnings]
+        res["disqualification"] = [dq.json() for dq in baseline_data.disqualification]
+
+        model = model_cls(settings=settings)
+        model.fit(baseline_data, ignore_disqualification=ignore_disqualification)
+        res["timings"]["fit"] = time.perf_counter() - t1
+
+        res["params"] = model.to_dict()
+        res["error"] = dict(model.error)
+        res["warnings"] = [w.json() for w in model.warnings]
+        res["disqualification"] = [dq.json() for dq in model.disqualification]
+        res["success"] = True
+
+    except Exception as e:
+        res["exception"] = f"{type(e).__name__}: {e}"
+        res["traceback"] = traceback.format_exc()
+
+    res["timings"]["total"] = time.perf_counter() - t0
+
+    return res
+
+
+def _fit_chunk(
+    chunk, model_type, is_electricity_data, settings, ignore_disqualification
+):
+    return [
+        _fit_meter(
+            meter_id,
+            df_meter,
+            model_type,
+            is_electricity_data,
+            settings,
+            ignore_disqualification,
+        )
+        for meter_id, df_meter in chunk
+    ]
+
+
+def _check_fleet_data(df):
+    if not isinstance(df.index, pd.MultiIndex) or df.index.nlevels != 2:
+        raise ValueError("Fleet data must have an (id, datetime) MultiIndex.")
+
+    missing_cols = {"temperature", "observed"} - set(df.columns)
+    if missing_cols:
+        raise ValueError(f"Fleet data is missing columns: {sorted(missing_cols)}")
+
+
+def _iter_meters(df):
+    _check_fleet_data(df)
+
+    id_level = df.index.names[0]
+    for meter_id, df_meter in df.groupby(level=0, sort=False):
+        df_meter = df_meter.droplevel(id_level)[["temperature", "observed"]]
+        yield meter_id, df_meter
+
+
+def _chunk_meters(meters, chunksize):
+    chunk = []
+    for meter in meters:
+        chunk.append(meter)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _meter_bounds(codes, n_meters):
+    starts = np.searchsorted(codes, np.arange(n_meters))
+    return starts, np.diff(np.append(starts, codes.size))
+
+
+def _ranges(starts, lengths):
+    # concatenation of the ranges start, ..., start + length - 1
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def _all_steps(codes, step_flags, n_meters):
+    # whether step_flags holds for every step between rows of the same meter
+    same_meter = codes[1:] == codes[:-1]
+    return np.bincount(codes[1:][same_meter & ~step_flags], minlength=n_meters) == 0
+
+
+def _reading_granularity(codes, times_ns, wall_ns, n_meters):
+    """Whether the readings of each meter are daily or hourly, as
+    `compute_minimum_granularity` infers it.
+
+    A meter is daily if pandas infers a daily frequency for its readings, or
+    none with a median interval of one day, and hourly if it infers an hourly
+    frequency, or none with a median interval under a day. Meters with too few
+    readings to infer a frequency, or with the intervals of a business day or
+    business hour frequency, are neither.
+    """
+    n_readings = np.bincount(codes, minlength=n_meters)
+    same_meter = codes[1:] == codes[:-1]
+    step_codes = codes[1:][same_meter]
+    utc_steps = np.diff(times_ns)[same_meter]
+    wall_steps = np.diff(wall_ns)[same_meter]
+
+    def _any_step(step_flags):
+        return np.bincount(step_codes[step_flags], minlength=n_meters) > 0
+
+    n_steps = np.bincount(step_codes, minlength=n_meters)
+    step_starts = np.cumsum(n_steps) - n_steps
+    stepped = np.flatnonzero(n_steps > 0)
+
+    # median of day_counts, which skips the NaN after the last reading
+    step_days = pd.TimedeltaIndex(utc_steps).total_seconds().to_numpy() / (60 * 60 * 24)
+    median_days = np.full(n_meters, np.nan)
+    for segments, rows in _equal_length_segments(
+        step_starts[stepped], n_steps[stepped]
+    ):
+        median_days[stepped[segments]] = np.median(step_days[rows], axis=1)
+
+    # pandas infers frequencies from the unique intervals, in local time for
+    # days and business hours and in UTC for hours
+    utc_unique = ~_any_step(utc_steps != utc_steps[step_starts[step_codes]])
+    business_hours = np.array([1, 17, 65]) * _HOUR_NS
+    business_daily = (
+        ~_any_step((wall_steps != _DAY_NS) & (wall_steps != 3 * _DAY_NS))
+        & _any_step(wall_steps == _DAY_NS)
+        & _any_step(wall_steps == 3 * _DAY_NS)
+    )
+    business_hourly = (
+        ~_any_step(~np.isin(wall_steps, business_hours))
+        & _any_step(wall_steps == _HOUR_NS)
+        & _any_step(np.isin(wall_steps, business_hours[1:]))
+    )
+
+    daily = (n_readings >= 3) & (
+        ~_any_step(wall_steps != _DAY_NS) | (~business_daily & (median_days == 1))
+    )
+    hourly = (n_readings >= 3) & (
+        (utc_unique & ~_any_step(utc_steps != _HOUR_NS))
+        | (
+            ~utc_unique
+            & _any_step(wall_steps < _DAY_NS)
+            & ~business_hourly
+            & (median_days < 1)
+        )
+    )
+    return daily, hourly
+
+
+def _daily_fleet_days(codes, times, observed, temperature, is_electricity_data):
+    """Daily data of the fleet meters which can skip the data class constructor.
+
+    Two layouts are handled for all meters at once: rows at consecutive local
+    midnights with daily meter readings, which are used as they are, and hourly
+    rows from a local midnight with hourly meter readings, which are aggregated
+    to days as the constructor does it. The meter readings are resampled with
+    the interval overlaps of `as_freq`, and the temperatures are averaged over
+    the same periods as `compute_temperature_features` uses. Meters with any
+    other layout are left to the constructor.
+
+    Parameters
+    ----------
+    codes : numpy.ndarray
+        Sorted meter codes of the rows, from 0 to the number of meters - 1.
+    times : pandas.DatetimeIndex
+        Timezone aware row timestamps.
+    observed, temperature : numpy.ndarray
+        Row meter readings and temperatures.
+    is_electricity_data : bool
+        Whether zero meter readings are converted to NaN.
+
+    Returns
+    -------
+    batched : numpy.ndarray
+        Whether each meter is handled.
+    n_days : numpy.ndarray
+        Number of days of each meter, 0 for the meters not handled.
+    day_rows : numpy.ndarray
+        The row of each day of the handled meters, at its local midnight.
+    daily_observed, daily_temperature, temperature_coverage : numpy.ndarray
+        The observed, temperature and temperature_coverage arguments of
+        ``_DailyData._from_arrays`` for each day, with NaN coverage for the
+        meters with daily rows.
+    meter_warnings : dict
+        The warnings raised while resampling the readings of each meter.
+    """
+    n_meters = codes[-1] + 1
+    starts, n_rows = _meter_bounds(codes, n_meters)
+    ends = starts + n_rows
+    times_ns = _epoch_nanoseconds(times)
+    wall_ns = _epoch_nanoseconds(times.tz_localize(None))
+    day_ordinals = wall_ns // _DAY_NS
+    midnight = wall_ns % _DAY_NS == 0
+
+    # a local day without a single midnight, e.g. at a DST change at midnight,
+    # is labeled differently by the constructor
+    midnight_rows = np.flatnonzero(midnight)
+    midnight_codes = codes[midnight_rows]
+    n_midnights = np.bincount(midnight_codes, minlength=n_meters)
+    first_day = day_ordinals[starts]
+    last_day = day_ordinals[ends - 1]
+    consecutive_midnights = _all_steps(
+        midnight_codes, np.diff(day_ordinals[midnight_rows]) == 1, n_meters
+    )
+    daily = (n_rows >= 3) & (n_midnights == n_rows) & consecutive_midnights
+    hourly = (
+        (n_rows >= 3)
+        & midnight[starts]
+        & (n_midnights == last_day - first_day + 1)
+        & consecutive_midnights
+        & _all_steps(codes, np.diff(times_ns) == _HOUR_NS, n_meters)
+    )
+
+    if is_electricity_data:
+        observed = np.where(observed == 0, np.nan, observed)
+    readings = np.flatnonzero(~np.isnan(observed))
+    reading_codes = codes[readings]
+    n_readings = np.bincount(reading_codes, minlength=n_meters)
+    has_readings = n_readings > 0
+    daily_readings, hourly_readings = _reading_granularity(
+        reading_codes, times_ns[readings], wall_ns[readings], n_meters
+    )
+    # days are resampled from the first reading, which must be a midnight
+    first_reading_midnight = np.zeros(n_meters, dtype=bool)
+    first_reading_midnight[has_readings] = midnight[
+        readings[(np.cumsum(n_readings) - n_readings)[has_readings]]
+    ]
+    daily &= ~has_readings | daily_readings
+    hourly &= ~has_readings | (hourly_readings & first_reading_midnight)
+
+    n_days = np.where(daily | hourly, last_day - first_day + 1, 0)
+    day_starts = np.cumsum(n_days) - n_days
+    day_rows = midnight_rows[(daily | hourly)[midnight_codes]]
+    day_codes = codes[day_rows]
+    daily_observed = np.full(day_rows.size, np.nan)
+    daily_temperature = np.full(day_rows.size, np.nan)
+    temperature_coverage = np.full(day_rows.size, np.nan)
+
+    daily_days = np.flatnonzero(daily[day_codes])
+    daily_observed[daily_days] = observed[day_rows[daily_days]]
+    daily_temperature[daily_days] = temperature[day_rows[daily_days]]
+
+    def _row_days(rows):
+        # index of the day of each row
+        row_codes = codes[rows]
+        return day_starts[row_codes] + day_ordinals[rows] - first_day[row_codes]
+
+    meter_warnings = {}
+    hourly_readings = readings[hourly[reading_codes]]
+    if hourly_readings.size:
+        # the days of each meter from its first to its last reading, as labeled by
+        # as_freq, with the number of atomic intervals _coverage_totals counts
+        step = pd.Timedelta(minutes=1)
+        hourly_reading_codes = codes[hourly_readings]
+        reading_days = _row_days(hourly_readings)
+        new_meter = np.r_[True, hourly_reading_codes[1:] != hourly_reading_codes[:-1]]
+        last_reading = np.r_[new_meter[1:], True]
+        n_labels = reading_days[last_reading] - reading_days[new_meter] + 1
+        label_days = _ranges(reading_days[new_meter], n_labels)
+        label_codes = np.repeat(hourly_reading_codes[new_meter], n_labels)
+        label_ns = times_ns[day_rows[label_days]]
+        last_label = np.r_[label_codes[1:] != label_codes[:-1], True]
+        n_total = np.ones(label_days.size, dtype=np.int64)
+        n_total[~last_label] = (np.diff(label_ns) // step.value)[~last_label[:-1]]
+
+        totals, n_coverage = _interval_overlaps(
+            hourly_reading_codes,
+            times_ns[hourly_readings],
+            observed[hourly_readings],
+            label_codes,
+            label_ns,
+            step,
+            "cumulative",
+        )
+        coverage = n_coverage / n_total
+        coverage[last_label & (coverage > 1)] = 1
+
+        # same cleaning as downsample_and_clean_daily_data
+        with np.errstate(divide="ignore", invalid="ignore"):
+            daily_observed[label_days] = np.where(
+                coverage > 0.5,
+                np.where(n_coverage > 0, totals, np.nan) / coverage,
+                np.nan,
+            )
+        low_coverage = coverage <= 0.5
+        low_coverage_codes, first_low_coverage = np.unique(
+            label_codes[low_coverage], return_index=True
+        )
+        for code, days in zip(
+            low_coverage_codes,
+            np.split(label_days[low_coverage], first_low_coverage[1:]),
+        ):
+            meter_warnings[code] = [
+                _missing_high_frequency_meter_data_warning(times[day_rows[days]])
+            ]
+
+        if is_electricity_data:
+            # the constructor keeps days that sum to zero, which the daily data
+            # classes would convert to NaN
+            hourly &= (
+                np.bincount(day_codes[daily_observed == 0], minlength=n_meters) == 0
+            )
+
+    # hourly temperature means and coverage over periods which end at the next
+    # midnight, the last one a day after its start
+    hourly_rows = np.flatnonzero(hourly[codes])
+    if hourly_rows.size:
+        row_days = _row_days(hourly_rows)
+        last_period = day_ordinals[hourly_rows] == last_day[codes[hourly_rows]]
+        matched = ~(
+            last_period
+            & (times_ns[hourly_rows] >= times_ns[day_rows[row_days]] + _DAY_NS)
+        )
+        row_days = row_days[matched]
+        temps = temperature[hourly_rows[matched]]
+        period_starts = np.flatnonzero(np.r_[True, row_days[1:] != row_days[:-1]])
+        period_days = row_days[period_starts]
+        not_null = ~np.isnan(temps)
+        n_not_null = np.add.reduceat(not_null.astype(np.int64), period_starts)
+        n_temperatures = np.diff(np.append(period_starts, temps.size))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            daily_temperature[period_days] = (
+                np.add.reduceat(np.where(not_null, temps, 0.0), period_starts)
+                / n_not_null
+            )
+            temperature_coverage[period_days] = n_not_null / n_temperatures
+
+    batched = daily | hourly
+    kept_days = batched[day_codes]
+    return (
+        batched,
+        np.where(batched, n_days, 0),
+        day_rows[kept_days],
+        daily_observed[kept_days],
+        daily_temperature[kept_days],
+        temperature_coverage[kept_days],
+        {code: w for code, w in meter_warnings.items() if batched[code]},
+    )
+
+
+def fit_fleet(
+    df: pd.DataFrame,
+    is_electricity_data: bool,
+    model: str = "daily",
+    settings: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+    ignore_disqualification: bool = False,
+) -> Iterator[dict]:
+    """
+    Fit a daily or billing model to every meter in a long-form dataframe.
+
+    Meters are grouped into chunks and fit on a process pool. Results are
+    yielded as each chunk finishes, so the output order is not guaranteed to
+    match the input order.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-form dataframe indexed by (id, datetime) with 'temperature' and
+        'observed' columns, as returned by
+        `eemeter.common.test_data._load_time_series_data`.
+    is_electricity_data : bool
+        Whether the meter data represents electricity data.
+    model : str, optional
+        Either 'daily' or 'billing'. Default is 'daily'.
+    settings : dict, optional
+        Settings passed to each model. Default is None.
+    max_workers : int, optional
+        Number of worker processes. None uses the number of CPUs. A value of 1
+        fits every meter serially in the calling process.
+    chunksize : int, optional
+        Number of meters sent to a worker per task. Default is 1.
+    ignore_disqualification : bool, optional
+        Whether to fit meters with disqualified baseline data. Default is False.
+
+    Yields
+    ------
+    dict
+        Per-meter result with keys 'id', 'success', 'params', 'error',
+        'warnings', 'disqualification', 'timings', 'exception' and
+        'traceback'. Failed meters have 'success' set to False and the
+        exception captured rather than raised.
+    """
+    model = model.lower()
+    if model not in _fleet_models:
+        raise ValueError(f"model must be one of {list(_fleet_models.keys())}")
+
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+
+    fit_args = (model, is_electricity_data, settings, ignore_disqualification)
+    chunks = _chunk_meters(_iter_meters(df), chunksize)
+
+    if max_workers == 1:
+        for chunk in chunks:
+            yield from _fit_chunk(chunk, *fit_args)
+
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # keep a bounded number of chunks in flight, so that the fleet is neither
+        # copied into the task queue at once nor held back from streaming
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_fit_chunk, chunk, *fit_args))
+            if len(pending) < max_pending:
+                continue
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def iter_fleet_data(
+    df: pd.DataFrame,
+    is_electricity_data: bool,
+    model: str = "daily",
+    reporting: bool = False,
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Build the daily or billing data object of every meter in a long-form dataframe.
+
+    For the daily model, meters with complete daily rows at local midnights or
+    complete hourly rows starting at a local midnight are resampled to days,
+    given their temperature features and checked for sufficiency once over the
+    whole long-form frame grouped by meter, with the same interval overlap and
+    sufficiency cores the data class constructors use. Each data object is
+    then built from its slice of the daily arrays, with the same warnings and
+    disqualifications as its constructor. Meters with any other layout, or
+    whose reading frequency pandas would infer differently, are built with the
+    data class constructor, as are all meters for the billing model, whose
+    periods are cleaned one after another with off-cycle reads handled per
+    meter.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Long-form dataframe indexed by (id, datetime) with 'temperature' and
+        'observed' columns, as returned by
+        `eemeter.common.test_data._load_time_series_data`.
+    is_electricity_data : bool
+        Whether the meter data represents electricity data.
+    model : str, optional
+        Either 'daily' or 'billing'. Default is 'daily'.
+    reporting : bool, optional
+        Whether to build reporting data rather than baseline data. Default is
+        False.
+
+    Yields
+    ------
+    tuple
+        The meter id and its data object, in the order the meters first appear
+        in `df`. Exceptions raised by a data class constructor are not caught.
+    """
+    model = model.lower()
+    if model not in _fleet_models:
+        raise ValueError(f"model must be one of {list(_fleet_models.keys())}")
+
+    if reporting:
+        data_cls = _fleet_reporting_data[model]
+    else:
+        data_cls = _fleet_models[model][1]
+
+    _check_fleet_data(df)
+    codes, meter_ids = pd.factorize(df.index.get_level_values(0))
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    codes = codes[order]
+    starts, n_rows = _meter_bounds(codes, len(meter_ids))
+    times = df.index.get_level_values(1)[order]
+
+    batched = np.zeros(len(meter_ids), dtype=bool)
+    if (
+        model == "daily"
+        and codes.size
+        and isinstance(times, pd.DatetimeIndex)
+        and times.tz is not None
+    ):
+        (
+            batched,
+            n_days,
+            day_rows,
+            observed,
+            temperature,
+            temperature_coverage,
+            meter_warnings,
+        ) = _daily_fleet_days(
+            codes,
+            times,
+            df["observed"].to_numpy(dtype=float)[order],
+            df["temperature"].to_numpy(dtype=float)[order],
+            is_electricity_data,
+        )
+        day_starts = np.cumsum(n_days) - n_days
+        index = times[day_rows]
+        hourly_days = ~np.isnan(temperature_coverage)
+
+        # the columns of the sufficiency checks as _set_arrays gives them, with
+        # the electricity zero readings already NaN
+        checked_temperature, checked_coverage, _ = _daily_temperature_coverage(
+            temperature, temperature_coverage
+        )
+        temperature_not_null = np.where(
+            hourly_days, checked_coverage, ~np.isnan(temperature)
+        )
+        temperature_null = np.where(
+            hourly_days, 1 - checked_coverage, np.isnan(temperature)
+        )
+        sufficiency = dict(
+            zip(
+                np.flatnonzero(batched),
+                data_cls._check_grouped_data_sufficiency(
+                    day_starts[batched],
+                    index,
+                    observed,
+                    checked_temperature,
+                    temperature_not_null,
+                    temperature_null,
+                    is_electricity_data,
+                ),
+            )
+        )
+
+    for code, meter_id in enumerate(meter_ids):
+        if not batched[code]:
+            # other layouts and billing periods go through the constructor
+            rows = order[starts[code] : starts[code] + n_rows[code]]
+            df_meter = df.iloc[rows].droplevel(0)[["temperature", "observed"]]
+            yield meter_id, data_cls(df_meter, is_electricity_data=is_electricity_data)
+            continue
+
+        days = slice(day_starts[code], day_starts[code] + n_days[code])
+        has_coverage = hourly_days[days.start]
+        yield meter_id, data_cls._from_arrays(
+            index[days],
+            observed[days],
+            temperature[days],
+            is_electricity_data,
+            temperature_coverage[days] if has_coverage else None,
+            meter_warnings=meter_warnings.get(code, []),
+            sufficiency=sufficiency[code],
+        )
@@ -24,9 +24,15 @@ import pandas as pd
 
 from eemeter.eemeter.common.data_processor_utilities import compute_minimum_granularity
 from eemeter.eemeter.common.features import compute_temperature_features, merge_features
+from eemeter.eemeter.common.temperature_cache import WeatherStation
 from eemeter.eemeter.models.hourly.usage_per_day import caltrack_sufficiency_criteria
 
 
+def _station_temperature(station, tz):
+    # hourly means of the station temperature, shared through the station cache
+    return station.temperature_features(tz, "H")["temperature_mean"]
+
+
 class HourlyReportingData:
     def __init__(self, df: pd.DataFrame, is_electricity_data: bool):
         if "observed" not in df.columns:
@@ -65,10 +71,17 @@ class HourlyReportingData:
     def from_series(
         cls,
         meter_data: Optional[pd.Series],
-        temperature_data: pd.Series,
+        temperature_data: Union[pd.Series, WeatherStation],
         is_electricity_data: bool,
     ):
         # TODO verify
+        if isinstance(temperature_data, WeatherStation):
+            tz = (
+                temperature_data.temperature_data.index.tz
+                if meter_data is None
+                else meter_data.index.tz
+            )
+            temperature_data = _station_temperature(temperature_data, tz)
         if meter_data is None:
             meter_data = temperature_data.copy().rename("observed") * np.nan
         df = merge_features([meter_data, temperature_data], keep_partial_nan_rows=True)
@@ -112,9 +125,13 @@ class HourlyBaselineData(HourlyReportingData):
     def from_series(
         cls,
         meter_data: Union[pd.Series, pd.DataFrame],
-        temperature_data: Union[pd.Series, pd.DataFrame],
+        temperature_data: Union[pd.Series, pd.DataFrame, WeatherStation],
         is_electricity_data: bool,
     ):
+        if isinstance(temperature_data, WeatherStation):
+            temperature_data = _station_temperature(
+                temperature_data, meter_data.index.tz
+            )
         if isinstance(meter_data, pd.Series):
             meter_data = meter_data.to_frame()
         if isinstance(temperature_data, pd.Series):
@@ -154,6 +154,7 @@ def create_caltrack_hourly_segmented_design_matrices(
     occupancy_lookup,
     occupied_temperature_bins,
     unoccupied_temperature_bins,
+    segment_views=False,
 ):
     """A helper function which calls basic feature creation methods to create a
     design matrix suitable for use with segmented CalTRACK hourly models.
@@ -173,6 +174,10 @@ def create_caltrack_hourly_segmented_design_matrices(
         form returned by :any:`eemeter.fit_temperature_bins`.
     unoccupied_temperature_bins : :any:``
         Ditto, for unoccupied.
+    segment_views : :any:`bool`, default False
+        If True, build each design matrix from a :any:`eemeter.SegmentView` of the
+        `preliminary_design_matrix` rather than a weighted copy of it. The design
+        matrices then only include rows with non-zero weight.
     Returns
     -------
     design_matrix : :any:`dict` of :any:`pandas.DataFrame`
@@ -190,5 +195,6 @@ def create_caltrack_hourly_segmented_design_matrices(
                 "occupied_temperature_bins": occupied_temperature_bins,
                 "unoccupied_temperature_bins": unoccupied_temperature_bins,
             },
+            segment_views=segment_views,
         )
     }
@@ -17,8 +17,11 @@
    limitations under the License.
 
 """
+from collections import namedtuple
+
+import numpy as np
 import pandas as pd
-import statsmodels.formula.api as smf
+from scipy.sparse import csr_matrix
 
 from eemeter.eemeter.common.features import (
     compute_occupancy_feature,
@@ -31,6 +34,7 @@ from eemeter.eemeter.models.hourly.metrics import ModelMetrics
 from eemeter.eemeter.models.hourly.segmentation import (
     CalTRACKSegmentModel,
     SegmentedModel,
+    SegmentView,
     fit_model_segments,
 )
 
@@ -39,11 +43,18 @@ __all__ = (
     "CalTRACKHourlyModel",
     "caltrack_hourly_fit_feature_processor",
     "caltrack_hourly_prediction_feature_processor",
+    "HourlyWLSResults",
+    "fit_hourly_wls",
     "fit_caltrack_hourly_model_segment",
     "fit_caltrack_hourly_model",
+    "fit_caltrack_hourly_model_from_monthly_stats",
+    "fit_model_segments_from_monthly_stats",
 )
 
 
+HourlyWLSResults = namedtuple("HourlyWLSResults", ["params", "fittedvalues", "rank"])
+
+
 class CalTRACKHourlyModelResults(object):
     """Contains information about the chosen model.
 
@@ -193,6 +204,22 @@ class CalTRACKHourlyModelResults(object):
         """
         return self.model.predict(prediction_index, temperature_data, **kwargs)
 
+    def predict_in_sample(self, prediction_index):
+        """Predict over the index the model was fit on from the in-sample fitted
+        values of the segment models, without recomputing features.
+
+        Parameters
+        ----------
+        prediction_index : :any:`pandas.DatetimeIndex`
+            Time period over which the model was fit.
+
+        Returns
+        -------
+        prediction : :any:`pandas.DataFrame`
+            The predicted usage values.
+        """
+        return self.model.predict_in_sample(prediction_index)
+
 
 class _PredictionSegmentInfo:
     """
@@ -271,6 +298,7 @@ class CalTRACKHourlyModel(SegmentedModel):
                 "occupied_temperature_bins": self.occupied_temperature_bins,
                 "unoccupied_temperature_bins": self.unoccupied_temperature_bins,
             },
+            prediction_segment_views=True,
         )
 
     def json(self):
@@ -335,8 +363,9 @@ def caltrack_hourly_fit_feature_processor(
     ----------
     segment_name : :any:`str`
         The name of the segment.
-    segmented_data : :any:`pandas.DataFrame`
-        Hourly temperature data for the segment.
+    segmented_data : :any:`pandas.DataFrame` or :any:`eemeter.SegmentView`
+        Hourly temperature data for the segment. A segment view only includes the
+        rows with non-zero weight.
     occupancy_lookup : :any:`pandas.DataFrame`
         A dataframe with occupancy flags for each hour of the week and each segment.
         Segment names are columns, occupancy flags are 0 or 1.
@@ -356,6 +385,11 @@ def caltrack_hourly_fit_feature_processor(
         - 'bin_<0-6>_unoccupied': temp bin feature or 0 in occupied
         - 'weight': 0.0 or 0.5 or 1.0
     """
+    if isinstance(segmented_data, SegmentView):
+        segmented_data = segmented_data.to_frame(
+            ["meter_value", "hour_of_week", "temperature_mean"]
+        )
+
     # get occupied feature
     hour_of_week = segmented_data.hour_of_week
     occupancy = occupancy_lookup[segment_name]
@@ -422,8 +456,9 @@ def caltrack_hourly_prediction_feature_processor(
     ----------
     segment_name : :any:`str`
         The name of the segment.
-    segmented_data : :any:`pandas.DataFrame`
-        Hourly temperature data for the segment.
+    segmented_data : :any:`pandas.DataFrame` or :any:`eemeter.SegmentView`
+        Hourly temperature data for the segment. A segment view only includes the
+        rows with non-zero weight.
     occupancy_lookup : :any:`pandas.DataFrame`
         A dataframe with occupancy flags for each hour of the week and each segment.
         Segment names are columns, occupancy flags are 0 or 1.
@@ -442,10 +477,23 @@ def caltrack_hourly_prediction_feature_processor(
         - 'bin_<0-6>_unoccupied': temp bin feature or 0 in occupied
         - 'weight': 1
     """
-    # hour of week feature
-    hour_of_week_feature = compute_time_features(
-        segmented_data.index, hour_of_week=True, day_of_week=False, hour_of_day=False
-    )
+    if isinstance(segmented_data, SegmentView):
+        # time features need the hourly frequency of the full index
+        hour_of_week_feature = compute_time_features(
+            segmented_data.data.index,
+            hour_of_week=True,
+            day_of_week=False,
+            hour_of_day=False,
+        ).iloc[segmented_data.rows]
+        segmented_data = segmented_data.to_frame(["temperature_mean"])
+    else:
+        # hour of week feature
+        hour_of_week_feature = compute_time_features(
+            segmented_data.index,
+            hour_of_week=True,
+            day_of_week=False,
+            hour_of_day=False,
+        )
 
     # occupancy feature
     occupancy = occupancy_lookup[segment_name]
@@ -499,6 +547,108 @@ def caltrack_hourly_prediction_feature_processor(
     )
 
 
+def _min_norm_solve(A, b):
+    """Minimum norm solution of the symmetric positive semi-definite system A x = b.
+
+    This matches the pseudoinverse solution statsmodels uses for rank deficient
+    design matrices.
+    """
+    eigvals, eigvecs = np.linalg.eigh(A)
+    tol = np.max(np.abs(eigvals), initial=0) * A.shape[0] * np.finfo(float).eps
+    nonzero = eigvals > tol
+
+    eigvecs = eigvecs[:, nonzero]
+    x = eigvecs @ ((eigvecs.T @ b) / eigvals[nonzero])
+
+    return x, int(nonzero.sum())
+
+
+def fit_hourly_wls(segment_data):
+    """Fit weighted least squares with a coefficient per hour of week and a slope
+    per temperature bin feature.
+
+    This is equivalent to fitting
+    ``meter_value ~ C(hour_of_week) - 1 + bin_...`` with
+    ``statsmodels.formula.api.wls``, but the normal equations are built directly
+    from the one-hot structure of the hour of week feature rather than from a
+    patsy design matrix. Rows with missing values are dropped.
+
+    Parameters
+    ----------
+    segment_data : :any:`pandas.DataFrame`
+        A design matrix for caltrack hourly, of the form returned by
+        :any:`eemeter.caltrack_hourly_fit_feature_processor`. If
+        ``hour_of_week`` is categorical, there is a coefficient for each
+        category.
+
+    Returns
+    -------
+    results : :any:`HourlyWLSResults`
+        Named tuple of the fitted ``params`` (keyed as statsmodels would name
+        them), the ``fittedvalues`` for every row with complete features, and
+        the ``rank`` of the design matrix.
+    """
+    hour_of_week = pd.Categorical(segment_data["hour_of_week"])
+    hour_codes = hour_of_week.codes.astype(np.int64)
+    n_hours = len(hour_of_week.categories)
+
+    bin_cols = [c for c in segment_data.columns if c.startswith("bin")]
+    bins = segment_data[bin_cols].to_numpy(dtype=float)
+    y = segment_data["meter_value"].to_numpy(dtype=float)
+    w = segment_data["weight"].to_numpy(dtype=float)
+
+    has_features = (hour_codes >= 0) & np.isfinite(bins).all(axis=1)
+    fit_rows = has_features & np.isfinite(y) & np.isfinite(w)
+
+    hour_fit = hour_codes[fit_rows]
+    bins_fit = bins[fit_rows]
+    w_fit = w[fit_rows]
+    wy = w_fit * y[fit_rows]
+    w_bins = bins_fit * w_fit[:, None]
+
+    # normal equations: diagonal hour block, hour x bin cross terms, bin block
+    n_bins = len(bin_cols)
+    A = np.zeros((n_hours + n_bins, n_hours + n_bins))
+    A[np.arange(n_hours), np.arange(n_hours)] = np.bincount(
+        hour_fit, weights=w_fit, minlength=n_hours
+    )
+    for j in range(n_bins):
+        A[:n_hours, n_hours + j] = np.bincount(
+            hour_fit, weights=w_bins[:, j], minlength=n_hours
+        )
+    A[n_hours:, :n_hours] = A[:n_hours, n_hours:].T
+    A[n_hours:, n_hours:] = bins_fit.T @ w_bins
+
+    b = np.concatenate(
+        [np.bincount(hour_fit, weights=wy, minlength=n_hours), w_bins.T @ y[fit_rows]]
+    )
+
+    x, rank = _min_norm_solve(A, b)
+
+    param_names = [
+        "C(hour_of_week)[{!r}]".format(c) for c in hour_of_week.categories
+    ] + bin_cols
+    params = dict(zip(param_names, x.tolist()))
+
+    fitted = np.full(len(segment_data), np.nan)
+    fitted[has_features] = (
+        x[hour_codes[has_features]] + bins[has_features] @ x[n_hours:]
+    )
+    fittedvalues = pd.Series(fitted, index=segment_data.index)
+
+    return HourlyWLSResults(params=params, fittedvalues=fittedvalues, rank=rank)
+
+
+def _segment_hour_of_week(hour_of_week):
+    """Hour of week categorical of a segment, without the categories which only
+    have null or missing entries, so that predictions for them are null."""
+    return pd.Categorical(
+        hour_of_week,
+        categories=hour_of_week.dropna().unique(),
+        ordered=False,
+    )
+
+
 def fit_caltrack_hourly_model_segment(segment_name, segment_data):
     """Fit a model for a single segment.
 
@@ -543,15 +693,20 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
 
         formula = _get_hourly_model_formula(segment_data)
 
-        # remove categories that only have null or missing entries
-        # this ensures that predictions will predict null
-        segment_data["hour_of_week"] = pd.Categorical(
-            segment_data["hour_of_week"],
-            categories=segment_data["hour_of_week"].dropna().unique(),
-            ordered=False,
+        # the categorical column is set on a shallow copy, so that the caller's
+        # data is left as it was whether segments are fit serially, on threads
+        # or in processes
+        segment_data = segment_data.copy(deep=False)
+        segment_data["hour_of_week"] = _segment_hour_of_week(
+            segment_data["hour_of_week"]
+        )
+        model = fit_hourly_wls(segment_data)
+        model_params = model.params
+        # only keep the fitted values of the segment's own rows, which are the
+        # ones used for in-sample predictions
+        model = model._replace(
+            fittedvalues=model.fittedvalues[segment_data.weight == 1]
         )
-        model = smf.wls(formula=formula, data=segment_data, weights=segment_data.weight)
-        model_params = {coeff: value for coeff, value in model.fit().params.items()}
 
     segment_model = CalTRACKSegmentModel(
         segment_name=segment_name,
@@ -561,10 +716,10 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
         warnings=warnings,
     )
     if model:
-        this_segment_data = segment_data[segment_data.weight == 1]
-        predicted_value = pd.Series(model.fit().predict(this_segment_data))
+        is_segment = segment_data.weight == 1
+        this_segment_data = segment_data[is_segment]
         segment_model.totals_metrics = ModelMetrics(
-            this_segment_data.meter_value, predicted_value, len(model_params)
+            this_segment_data.meter_value, model.fittedvalues, len(model_params)
         )
     else:
         segment_model.totals_metrics = None
@@ -578,6 +733,8 @@ def fit_caltrack_hourly_model(
     occupied_temperature_bins,
     unoccupied_temperature_bins,
     segment_type: str,
+    executor=None,
+    max_workers=None,
 ):
     """Fit a CalTRACK hourly model
 
@@ -593,6 +750,13 @@ def fit_caltrack_hourly_model(
         A dataframe of bin endpoint flags for each segment. Segment names are columns.
     unoccupied_temperature_bins : :any:`pandas.DataFrame`
         Ditto for the unoccupied mode.
+    segment_type : :any:`str`
+        The type of segment used to fit the model.
+    executor : :any:`str`, default None
+        Fit segments concurrently on a ``'thread'`` or ``'process'`` pool. None
+        fits segments serially.
+    max_workers : :any:`int`, default None
+        Maximum number of workers for the executor.
 
     Returns
     -------
@@ -601,8 +765,28 @@ def fit_caltrack_hourly_model(
         using this model.
     """
     segment_models = fit_model_segments(
-        segmented_design_matrices, fit_caltrack_hourly_model_segment
+        segmented_design_matrices,
+        fit_caltrack_hourly_model_segment,
+        executor=executor,
+        max_workers=max_workers,
+    )
+
+    return _caltrack_hourly_model_results(
+        segment_models,
+        occupancy_lookup,
+        occupied_temperature_bins,
+        unoccupied_temperature_bins,
+        segment_type,
     )
+
+
+def _caltrack_hourly_model_results(
+    segment_models,
+    occupancy_lookup,
+    occupied_temperature_bins,
+    unoccupied_temperature_bins,
+    segment_type,
+):
     all_warnings = [
         warning
         for segment_model in segment_models
@@ -627,3 +811,360 @@ def fit_caltrack_hourly_model(
         seg_model.segment_name: seg_model.totals_metrics for seg_model in segment_models
     }
     return model_results
+
+
+def _monthly_segment_weights(segmentation):
+    """Return the weight of each calendar month (rows 1-12) for each segment, or
+    None if any segment weight varies within a calendar month."""
+    months = segmentation.groupby(segmentation.index.month)
+    if (months.max() != months.min()).any(axis=None):
+        return None
+
+    return months.first().reindex(range(1, 13), fill_value=0.0)
+
+
+def _temperature_bin_basis(temperatures, bin_endpoints):
+    """NumPy equivalent of :any:`eemeter.compute_temperature_bin_features`."""
+    if len(bin_endpoints) == 0:
+        return temperatures[:, None].copy()
+
+    bin_endpoints = np.asarray(bin_endpoints, dtype=float)
+    left = np.concatenate([[-np.inf], bin_endpoints])
+    right = np.concatenate([bin_endpoints, [np.inf]])
+
+    bins = np.clip(temperatures[:, None], left, right) - left
+    bins[:, 0] = np.minimum(temperatures, bin_endpoints[0])
+
+    return bins
+
+
+def _bin_aggregation(basis_endpoints, bin_endpoints):
+    """Matrix summing temperature bin features on a set of basis endpoints into
+    the features for a subset of those endpoints."""
+    basis_right = np.concatenate([basis_endpoints, [np.inf]])
+    bin_idx = np.searchsorted(np.asarray(bin_endpoints, dtype=float), basis_right)
+
+    aggregation = np.zeros((len(basis_right), len(bin_endpoints) + 1))
+    aggregation[np.arange(len(basis_right)), bin_idx] = 1
+
+    return aggregation
+
+
+def _fit_segment_from_monthly_stats(
+    month_weights, stats, occupancy, occupied_aggregation, unoccupied_aggregation
+):
+    """Solve the normal equations of one segment from per month and hour of week
+    sufficient statistics."""
+    # weighted sums over the months in the segment
+    count, basis_sum, basis_cross, y_sum, basis_y = (
+        np.tensordot(month_weights, stat, axes=(0, 0)) for stat in stats
+    )
+
+    # occupied bins are zero when unoccupied and vice versa (nan is neither)
+    occupied = (occupancy != 0).astype(float)
+    unoccupied = (occupancy != 1).astype(float)
+
+    n_hours = len(count)
+    n_occ = occupied_aggregation.shape[1]
+    n_unocc = unoccupied_aggregation.shape[1]
+    hours = slice(0, n_hours)
+    occ = slice(n_hours, n_hours + n_occ)
+    unocc = slice(n_hours + n_occ, n_hours + n_occ + n_unocc)
+
+    A = np.zeros((n_hours + n_occ + n_unocc,) * 2)
+    A[hours, hours] = np.diag(count)
+    A[hours, occ] = occupied[:, None] * (basis_sum @ occupied_aggregation)
+    A[hours, unocc] = unoccupied[:, None] * (basis_sum @ unoccupied_aggregation)
+    A[occ, occ] = (
+        occupied_aggregation.T
+        @ np.tensordot(occupied, basis_cross, axes=(0, 0))
+        @ occupied_aggregation
+    )
+    A[unocc, unocc] = (
+        unoccupied_aggregation.T
+        @ np.tensordot(unoccupied, basis_cross, axes=(0, 0))
+        @ unoccupied_aggregation
+    )
+    A[occ, unocc] = (
+        occupied_aggregation.T
+        @ np.tensordot(occupied * unoccupied, basis_cross, axes=(0, 0))
+        @ unoccupied_aggregation
+    )
+    A[n_hours:, hours] = A[hours, n_hours:].T
+    A[unocc, occ] = A[occ, unocc].T
+
+    b = np.concatenate(
+        [
+            y_sum,
+            occupied_aggregation.T @ (occupied @ basis_y),
+            unoccupied_aggregation.T @ (unoccupied @ basis_y),
+        ]
+    )
+
+    return _min_norm_solve(A, b)
+
+
+def fit_caltrack_hourly_model_from_monthly_stats(
+    preliminary_design_matrix,
+    segmentation,
+    occupancy_lookup,
+    occupied_temperature_bins,
+    unoccupied_temperature_bins,
+    segment_type: str,
+):
+    """Fit a CalTRACK hourly model from per-calendar-month sufficient statistics.
+
+    This gives the same result as creating segmented design matrices with
+    :any:`eemeter.create_caltrack_hourly_segmented_design_matrices` and fitting
+    them with :any:`eemeter.fit_caltrack_hourly_model`, but the weighted
+    cross-products for each hour of week and calendar month are computed in a
+    single pass over the data. Each segment's normal equations are then
+    assembled from those month totals. This requires segment weights that are
+    constant within each calendar month, which is true of the ``single``,
+    ``one_month``, ``three_month`` and ``three_month_weighted`` segmentations.
+
+    Temperature bin features for every segment are sums of the bin features on
+    the union of all segments' bin endpoints, so statistics are only computed
+    once on that finer basis.
+
+    Parameters
+    ----------
+    preliminary_design_matrix : :any:`pandas.DataFrame`
+        A dataframe of the form returned by
+        :any:`eemeter.create_caltrack_hourly_preliminary_design_matrix`.
+    segmentation : :any:`pandas.DataFrame`
+        Weights for each segment. This is a dataframe of the form returned by
+        :any:`eemeter.segment_time_series` on the `preliminary_design_matrix`.
+    occupancy_lookup : :any:`pandas.DataFrame`
+        A dataframe with occupancy flags for each hour of the week and each segment.
+        Segment names are columns, occupancy flags are 0 or 1.
+    occupied_temperature_bins : :any:`pandas.DataFrame`
+        A dataframe of bin endpoint flags for each segment. Segment names are columns.
+    unoccupied_temperature_bins : :any:`pandas.DataFrame`
+        Ditto for the unoccupied mode.
+    segment_type : :any:`str`
+        The type of segment used to fit the model.
+
+    Returns
+    -------
+    model : :any:`CalTRACKHourlyModelResults`
+        Has a `model.predict` method which take input data and makes a prediction
+        using this model.
+    """
+    segment_models = fit_model_segments_from_monthly_stats(
+        preliminary_design_matrix,
+        segmentation,
+        occupancy_lookup,
+        occupied_temperature_bins,
+        unoccupied_temperature_bins,
+    )
+
+    return _caltrack_hourly_model_results(
+        segment_models,
+        occupancy_lookup,
+        occupied_temperature_bins,
+        unoccupied_temperature_bins,
+        segment_type,
+    )
+
+
+def fit_model_segments_from_monthly_stats(
+    preliminary_design_matrix,
+    segmentation,
+    occupancy_lookup,
+    occupied_temperature_bins,
+    unoccupied_temperature_bins,
+):
+    """Fit a CalTRACK hourly segment model for each segment from per-calendar-month
+    sufficient statistics. See
+    :any:`eemeter.fit_caltrack_hourly_model_from_monthly_stats`.
+
+    Parameters
+    ----------
+    preliminary_design_matrix : :any:`pandas.DataFrame`
+        A dataframe of the form returned by
+        :any:`eemeter.create_caltrack_hourly_preliminary_design_matrix`.
+    segmentation : :any:`pandas.DataFrame`
+        Weights for each segment, constant within each calendar month.
+    occupancy_lookup : :any:`pandas.DataFrame`
+        A dataframe with occupancy flags for each hour of the week and each segment.
+    occupied_temperature_bins : :any:`pandas.DataFrame`
+        A dataframe of bin endpoint flags for each segment.
+    unoccupied_temperature_bins : :any:`pandas.DataFrame`
+        Ditto for the unoccupied mode.
+
+    Returns
+    -------
+    segment_models : :any:`list` of :any:`CalTRACKSegmentModel`
+        One fitted segment model per segmentation column.
+    """
+    month_weights = _monthly_segment_weights(segmentation)
+    if month_weights is None:
+        raise ValueError("Segment weights must be constant within calendar months.")
+
+    data = preliminary_design_matrix
+    y = data["meter_value"].to_numpy(dtype=float)
+    temperatures = data["temperature_mean"].to_numpy(dtype=float)
+    # the design matrices have no features for rows with a missing value
+    complete = np.isfinite(y) & np.isfinite(temperatures)
+    complete &= data["hour_of_week"].notna().to_numpy()
+
+    # hour of week categories of all rows, of which each segment takes its own
+    hour_of_week = _segment_hour_of_week(data["hour_of_week"])
+    hour_codes = hour_of_week.codes.astype(np.int64)
+    n_hours = len(hour_of_week.categories)
+
+    # temperature bin features on the union of all segments' endpoints
+    basis_endpoints = np.unique(
+        [
+            float(endpoint)
+            for bins in [occupied_temperature_bins, unoccupied_temperature_bins]
+            for segment_name in segmentation.columns
+            for endpoint in bins[segment_name].index[bins[segment_name]]
+        ]
+    )
+    y_fit = y[complete]
+    basis = _temperature_bin_basis(temperatures[complete], basis_endpoints)
+    n_basis = basis.shape[1]
+
+    # per month and hour of week sums of 1, X, X'X, y and X'y in a single pass
+    n_fit = len(y_fit)
+    months = data.index.month.to_numpy()
+    group = (months[complete] - 1) * n_hours + hour_codes[complete]
+    group_sum = csr_matrix(
+        (np.ones(n_fit), (group, np.arange(n_fit))), shape=(12 * n_hours, n_fit)
+    )
+    row_stats = np.hstack(
+        [
+            np.ones((n_fit, 1)),
+            basis,
+            (basis[:, :, None] * basis[:, None, :]).reshape(n_fit, -1),
+            y_fit[:, None],
+            basis * y_fit[:, None],
+        ]
+    )
+    month_stats = np.asarray(group_sum @ row_stats).reshape(12, n_hours, -1)
+    split_idx = np.cumsum([1, n_basis, n_basis**2, 1])
+    count, basis_sum, basis_cross, y_sum, basis_y = np.split(
+        month_stats, split_idx, axis=2
+    )
+    stats = (
+        count[:, :, 0],
+        basis_sum,
+        basis_cross.reshape(12, n_hours, n_basis, n_basis),
+        y_sum[:, :, 0],
+        basis_y,
+    )
+
+    segment_models = []
+    for segment_name in segmentation.columns:
+        warnings = []
+        weights = month_weights[segment_name].to_numpy(dtype=float)
+        row_weights = weights[months - 1]
+        in_segment = row_weights > 0
+        occupied_bin_endpoints_list = (
+            occupied_temperature_bins[segment_name]
+            .index[occupied_temperature_bins[segment_name]]
+            .tolist()
+        )
+        unoccupied_bin_endpoints_list = (
+            unoccupied_temperature_bins[segment_name]
+            .index[unoccupied_temperature_bins[segment_name]]
+            .tolist()
+        )
+        bin_cols = [
+            "bin_{}_occupied".format(i)
+            for i in range(len(occupied_bin_endpoints_list) + 1)
+        ] + [
+            "bin_{}_unoccupied".format(i)
+            for i in range(len(unoccupied_bin_endpoints_list) + 1)
+        ]
+
+        if not (complete & in_segment).any():
+            model = None
+            formula = None
+            model_params = None
+            warnings.append(
+                EEMeterWarning(
+                    qualified_name="eemeter.fit_caltrack_hourly_model_segment.no_nonnull_data",
+                    description="The segment contains either an empty dataset or all NaNs.",
+                    data={
+                        "n_rows": int(in_segment.sum()),
+                        "n_rows_after_dropna": 0,
+                    },
+                )
+            )
+        else:
+            formula = "meter_value ~ C(hour_of_week) - 1{}".format(
+                "".join([" + {}".format(c) for c in bin_cols])
+            )
+            segment_hour_of_week = _segment_hour_of_week(
+                data["hour_of_week"][in_segment & complete]
+            )
+            categories = segment_hour_of_week.categories
+            # positions of the segment's categories among all categories
+            hour_idx = hour_of_week.categories.get_indexer(categories)
+            occupancy = (
+                occupancy_lookup[segment_name].reindex(categories).to_numpy(dtype=float)
+            )
+            occupied_aggregation = _bin_aggregation(
+                basis_endpoints, occupied_bin_endpoints_list
+            )
+            unoccupied_aggregation = _bin_aggregation(
+                basis_endpoints, unoccupied_bin_endpoints_list
+            )
+
+            x, rank = _fit_segment_from_monthly_stats(
+                weights,
+                tuple(stat[:, hour_idx] for stat in stats),
+                occupancy,
+                occupied_aggregation,
+                unoccupied_aggregation,
+            )
+
+            param_names = [
+                "C(hour_of_week)[{!r}]".format(c) for c in categories
+            ] + bin_cols
+            model_params = dict(zip(param_names, x.tolist()))
+
+            # fitted values for the segment's own complete rows, which are the
+            # ones used for in-sample predictions
+            n_segment_hours = len(categories)
+            n_occ = occupied_aggregation.shape[1]
+            occupied_coeffs = (
+                occupied_aggregation @ x[n_segment_hours : n_segment_hours + n_occ]
+            )
+            unoccupied_coeffs = unoccupied_aggregation @ x[n_segment_hours + n_occ :]
+            own_rows = complete & (row_weights == 1)
+            segment_codes = segment_hour_of_week.codes[own_rows[in_segment & complete]]
+            row_basis = basis[own_rows[complete]]
+            row_occupancy = occupancy[segment_codes]
+            fitted = (
+                x[segment_codes]
+                + (row_occupancy != 0) * (row_basis @ occupied_coeffs)
+                + (row_occupancy != 1) * (row_basis @ unoccupied_coeffs)
+            )
+            fittedvalues = pd.Series(fitted, index=data.index[own_rows])
+            model = HourlyWLSResults(
+                params=model_params, fittedvalues=fittedvalues, rank=rank
+            )
+
+        segment_model = CalTRACKSegmentModel(
+            segment_name=segment_name,
+            model=model,
+            formula=formula,
+            model_params=model_params,
+            warnings=warnings,
+        )
+        if model:
+            segment_model.totals_metrics = ModelMetrics(
+                data["meter_value"][model.fittedvalues.index],
+                model.fittedvalues,
+                len(model_params),
+            )
+        else:
+            segment_model.totals_metrics = None
+
+        segment_models.append(segment_model)
+
+    return segment_models
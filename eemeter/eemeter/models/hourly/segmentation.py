@@ -17,8 +17,11 @@
    limitations under the License.
 
 """
-from collections import namedtuple
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 from patsy import dmatrix
 
@@ -27,6 +30,7 @@ __all__ = (
     "segment_time_series",
     "CalTRACKSegmentModel",
     "SegmentedModel",
+    "SegmentView",
     "HourlyModelPrediction",
 )
 
@@ -34,6 +38,75 @@ __all__ = (
 HourlyModelPrediction = namedtuple("HourlyModelPrediction", ["result"])
 
 
+class SegmentView(namedtuple("SegmentView", ["data", "rows", "weight"])):
+    """A segment of a dataset which shares the data of the full dataset.
+
+    Attributes
+    ----------
+    data : :any:`pandas.DataFrame`
+        The full, unsegmented dataset.
+    rows : :any:`numpy.ndarray`
+        Positions of the rows of `data` with non-zero segment weight.
+    weight : :any:`numpy.ndarray`
+        Segment weights of those rows.
+    """
+
+    __slots__ = ()
+
+    @property
+    def index(self):
+        return self.data.index[self.rows]
+
+    def to_frame(self, columns=None):
+        """Materialize the rows of the segment, with a weight column.
+
+        Parameters
+        ----------
+        columns : :any:`list` of :any:`str`, default None
+            Columns of `data` to include. If None, all columns are included.
+        """
+        if columns is None:
+            segment_data = self.data.iloc[self.rows]
+        else:
+            segment_data = self.data.iloc[
+                self.rows, self.data.columns.get_indexer(columns)
+            ]
+        return segment_data.assign(weight=self.weight)
+
+
+def _compile_segment_params(formula, model_params):
+    """Split CalTRACK segment model parameters into hour of week and linear term
+    coefficients.
+
+    Returns None for formulas other than ``y ~ C(hour_of_week) + x1 + ... - 1``,
+    which must be predicted from a patsy design matrix.
+    """
+    if formula is None:
+        return None
+
+    rhs = formula.split("~", 1)[1].replace(" ", "")
+    if rhs.count("-1") != 1:
+        return None
+
+    terms = rhs.replace("-1", "").split("+")
+    if terms.count("C(hour_of_week)") != 1:
+        return None
+
+    terms.remove("C(hour_of_week)")
+    if not all(term.isidentifier() for term in terms):
+        return None
+
+    params = model_params or {}
+    hour_of_week_params = {
+        key[len("C(hour_of_week)[") : -1]: value
+        for key, value in params.items()
+        if key.startswith("C(hour_of_week)[") and key.endswith("]")
+    }
+    term_params = {term: params[term] for term in terms if term in params}
+
+    return hour_of_week_params, terms, term_params
+
+
 class CalTRACKSegmentModel(object):
     """An object that captures the model fit for one segment.
 
@@ -61,8 +134,61 @@ class CalTRACKSegmentModel(object):
             warnings = []
         self.warnings = warnings
 
+        self._compiled_params = _compile_segment_params(formula, model_params)
+
     def predict(self, data):
         """A function which takes input data and predicts for this segment model."""
+        if self.formula is None:
+            return pd.Series(np.nan, index=data.index, name="predicted_usage")
+
+        if self._compiled_params is not None:
+            terms = self._compiled_params[1]
+            if all(
+                pd.api.types.is_numeric_dtype(data[term])
+                and not pd.api.types.is_bool_dtype(data[term])
+                for term in terms
+            ):
+                return self._predict_compiled(data)
+
+        return self._predict_design_matrix(data)
+
+    def _predict_compiled(self, data):
+        """Predict by looking up the coefficient of each row's hour of week and
+        adding the linear terms. Equivalent to predicting from the patsy design
+        matrix of the formula."""
+        hour_of_week_params, terms, term_params = self._compiled_params
+
+        hour_of_week = pd.Categorical(data["hour_of_week"])
+        levels = [repr(level) for level in hour_of_week.categories.tolist()]
+        level_params = np.array(
+            [hour_of_week_params.get(level, np.nan) for level in levels], dtype=float
+        )
+
+        # rows with a missing hour of week or one without a coefficient are nan
+        codes = hour_of_week.codes
+        prediction = np.where(codes >= 0, level_params[codes], np.nan)
+
+        # any nan coefficient in the design matrix makes every prediction nan
+        nan_params = any(
+            np.isnan(hour_of_week_params[level])
+            for level in levels
+            if level in hour_of_week_params
+        ) or any(np.isnan(value) for value in term_params.values())
+
+        for term in terms:
+            values = data[term].to_numpy(dtype=float)
+            if term in term_params:
+                prediction = prediction + term_params[term] * values
+            else:
+                # unused terms still drop rows where they are missing
+                prediction = np.where(np.isnan(values), np.nan, prediction)
+
+        if nan_params:
+            prediction = np.full(len(data), np.nan)
+
+        return pd.Series(prediction, index=data.index, name="predicted_usage")
+
+    def _predict_design_matrix(self, data):
         if self.formula is None:
             var_str = ""
         else:
@@ -154,6 +280,10 @@ class SegmentedModel(object):
     prediction_feature_processor_kwargs : :any:`dict`
         A dict of keyword arguments to be passed as `**kwargs` to the
         `prediction_feature_processor` function.
+    prediction_segment_views : :any:`bool`, default False
+        If True, the `prediction_feature_processor` is passed a
+        :any:`eemeter.SegmentView` of each segment rather than a copy of the
+        temperature data with a weight column.
     """
 
     def __init__(
@@ -163,6 +293,7 @@ class SegmentedModel(object):
         prediction_segment_name_mapping=None,
         prediction_feature_processor=None,
         prediction_feature_processor_kwargs=None,
+        prediction_segment_views=False,
     ):
         self.segment_models = segment_models
 
@@ -181,6 +312,7 @@ class SegmentedModel(object):
         self.prediction_segment_name_mapping = prediction_segment_name_mapping
         self.prediction_feature_processor = prediction_feature_processor
         self.prediction_feature_processor_kwargs = prediction_feature_processor_kwargs
+        self.prediction_segment_views = prediction_segment_views
 
     def predict(
         self, prediction_index, temperature, **kwargs
@@ -208,6 +340,7 @@ class SegmentedModel(object):
             feature_processor=self.prediction_feature_processor,
             feature_processor_kwargs=self.prediction_feature_processor_kwargs,
             feature_processor_segment_name_mapping=self.prediction_segment_name_mapping,
+            segment_views=self.prediction_segment_views,
         )
 
         predictions = {}
@@ -224,6 +357,41 @@ class SegmentedModel(object):
         result = pd.DataFrame({"predicted_usage": predictions.sum(axis=1, min_count=1)})
         return HourlyModelPrediction(result=result)
 
+    def predict_in_sample(self, prediction_index):
+        """Combine the in-sample fitted values of the segment models over the
+        index they were fit on, with the same segment weights as :any:`predict`.
+
+        Parameters
+        ----------
+        prediction_index : :any:`pandas.DatetimeIndex`
+            The index over which to predict, typically the index the segment
+            models were fit on. Rows without a fitted value are NaN, as are all
+            rows of segment models which do not keep their fitted values, such as
+            models loaded from JSON.
+        """
+        prediction_segmentation = segment_time_series(
+            prediction_index,
+            self.prediction_segment_type,
+            drop_zero_weight_segments=True,
+        )
+
+        predictions = {}
+        for segment_name, weights in prediction_segmentation.items():
+            segment_model = self.model_lookup.get(segment_name)
+            if segment_model is None:
+                continue
+            fittedvalues = getattr(segment_model.model, "fittedvalues", None)
+            if fittedvalues is None:
+                fittedvalues = pd.Series(np.nan, index=prediction_index)
+            prediction = fittedvalues.reindex(prediction_index) * weights
+            # NaN the zero weights and reindex
+            prediction = prediction[weights > 0].reindex(prediction_index)
+            predictions[segment_name] = prediction
+
+        predictions = pd.DataFrame(predictions, index=prediction_index)
+        result = pd.DataFrame({"predicted_usage": predictions.sum(axis=1, min_count=1)})
+        return HourlyModelPrediction(result=result)
+
     def json(self):
         """Return a JSON-serializable representation of this result.
 
@@ -257,6 +425,7 @@ def iterate_segmented_dataset(
     feature_processor=None,
     feature_processor_kwargs=None,
     feature_processor_segment_name_mapping=None,
+    segment_views=False,
 ):
     """A utility for iterating over segments which allows providing a function for
     processing outputs into features.
@@ -279,8 +448,13 @@ def iterate_segmented_dataset(
     feature_processor_segment_name_mapping : :any:`dict`, default None
         A mapping from the default segmentation segment names to alternate names. This
         is useful when prediction uses a different segment type than fitting.
+    segment_views : :any:`bool`, default False
+        If True, each segment is passed to the feature processor (or yielded, if
+        there is no feature processor) as a :any:`eemeter.SegmentView` of the rows
+        of `data` with non-zero weight, rather than as a copy of `data` with a
+        weight column. This avoids copying `data` for each segment.
     """
-    if feature_processor is None:
+    if feature_processor is None and not segment_views:
         feature_processor = filter_zero_weights_feature_processor
 
     if feature_processor_kwargs is None:
@@ -303,7 +477,19 @@ def iterate_segmented_dataset(
     def _add_weights(data, weights):
         return pd.merge(data, weights, left_index=True, right_index=True)
 
-    if segmentation is None:
+    if segment_views:
+        if segmentation is None:
+            segmentation = pd.DataFrame({None: 1.0}, index=data.index)
+        elif not segmentation.index.equals(data.index):
+            segmentation = segmentation.reindex(data.index)
+
+        for segment_name, segment_weights in segmentation.items():
+            weights = segment_weights.to_numpy(dtype=float)
+            rows = np.flatnonzero(weights > 0)
+            segment_data = SegmentView(data, rows, weights[rows])
+            segment_data = _apply_feature_processor(segment_name, segment_data)
+            yield segment_name, segment_data
+    elif segmentation is None:
         # spoof segment name and weights column
         segment_name = None
         weights = pd.DataFrame({"weight": 1}, index=data.index)
@@ -327,122 +513,112 @@ def _get_hourly_coverage_warning(index, min_fraction_daily_coverage=0.9):
     pass
 
 
-def _segment_weights_single(index):
-    return pd.DataFrame({"all": 1.0}, index=index)
-
-
-def _segment_weights_one_month(index):
-    return pd.DataFrame(
-        {
-            month_name: (index.month == month_number).astype(float)
-            for month_name, month_number in [
-                ("jan", 1),
-                ("feb", 2),
-                ("mar", 3),
-                ("apr", 4),
-                ("may", 5),
-                ("jun", 6),
-                ("jul", 7),
-                ("aug", 8),
-                ("sep", 9),
-                ("oct", 10),
-                ("nov", 11),
-                ("dec", 12),
-            ]
-        },
-        index=index,
-        columns=[
-            "jan",
-            "feb",
-            "mar",
-            "apr",
-            "may",
-            "jun",
-            "jul",
-            "aug",
-            "sep",
-            "oct",
-            "nov",
-            "dec",
-        ],  # guarantee order
-    )
-
+_MONTH_NAMES = [
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+]
+
+
+def _month_weight_matrix(month_weights):
+    """Stack per-segment month weights into a 13 x n_segments matrix with a row
+    per calendar month and a row of zeros for missing months."""
+    matrix = np.zeros((13, len(month_weights)))
+    for j, weights in enumerate(month_weights):
+        for month_number, weight in weights.items():
+            matrix[month_number - 1, j] = weight
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _three_month_names(i, suffix=""):
+    return "-".join(_MONTH_NAMES[(i + k) % 12] for k in (-1, 0, 1)) + suffix
+
+
+def _three_month_weights(i, outer_weight):
+    return {(i - 1) % 12 + 1: outer_weight, i + 1: 1.0, (i + 1) % 12 + 1: outer_weight}
+
+
+# segment names (in order) and their weight in each calendar month
+_SEGMENT_MONTH_WEIGHTS = {
+    # a single segment also includes missing timestamps
+    "single": (["all"], _month_weight_matrix([dict.fromkeys(range(1, 14), 1.0)])),
+    "one_month": (
+        _MONTH_NAMES,
+        _month_weight_matrix([{i + 1: 1.0} for i in range(12)]),
+    ),
+    "three_month": (
+        [_three_month_names(i) for i in range(12)],
+        _month_weight_matrix([_three_month_weights(i, 1.0) for i in range(12)]),
+    ),
+    "three_month_weighted": (
+        [_three_month_names(i, "-weighted") for i in range(12)],
+        _month_weight_matrix([_three_month_weights(i, 0.5) for i in range(12)]),
+    ),
+}
+
+_SEGMENT_WEIGHTS_CACHE_SIZE = 32
+_segment_weights_cache = OrderedDict()
+_segment_weights_lock = threading.Lock()
+
+
+def _index_cache_key(index):
+    """Key identifying the timestamps of an index without reading all of them.
+
+    A regular index (one with a freq) is determined by its dtype, start, freq
+    and length. Any other index is keyed on its identity.
+    """
+    if index.freq is not None:
+        start = index.asi8[0] if len(index) else None
+        return (str(index.dtype), index.freqstr, start, len(index))
+    return ("id", id(index))
 
-def _segment_weights_three_month(index):
-    return pd.DataFrame(
-        {
-            month_names: (index.month.map(lambda i: i in month_numbers)).astype(float)
-            for month_names, month_numbers in [
-                ("dec-jan-feb", (12, 1, 2)),
-                ("jan-feb-mar", (1, 2, 3)),
-                ("feb-mar-apr", (2, 3, 4)),
-                ("mar-apr-may", (3, 4, 5)),
-                ("apr-may-jun", (4, 5, 6)),
-                ("may-jun-jul", (5, 6, 7)),
-                ("jun-jul-aug", (6, 7, 8)),
-                ("jul-aug-sep", (7, 8, 9)),
-                ("aug-sep-oct", (8, 9, 10)),
-                ("sep-oct-nov", (9, 10, 11)),
-                ("oct-nov-dec", (10, 11, 12)),
-                ("nov-dec-jan", (11, 12, 1)),
-            ]
-        },
-        index=index,
-        columns=[
-            "dec-jan-feb",
-            "jan-feb-mar",
-            "feb-mar-apr",
-            "mar-apr-may",
-            "apr-may-jun",
-            "may-jun-jul",
-            "jun-jul-aug",
-            "jul-aug-sep",
-            "aug-sep-oct",
-            "sep-oct-nov",
-            "oct-nov-dec",
-            "nov-dec-jan",
-        ],  # guarantee order
-    )
 
+def _segment_weights(index, segment_type):
+    """Weights of each segment for each timestamp in the index.
 
-def _segment_weights_three_month_weighted(index):
-    return pd.DataFrame(
-        {
-            month_names: index.month.map(
-                lambda i: month_weights.get(str(i), 0.0)
-            ).astype(float)
-            for month_names, month_weights in [
-                ("dec-jan-feb-weighted", {"12": 0.5, "1": 1, "2": 0.5}),
-                ("jan-feb-mar-weighted", {"1": 0.5, "2": 1, "3": 0.5}),
-                ("feb-mar-apr-weighted", {"2": 0.5, "3": 1, "4": 0.5}),
-                ("mar-apr-may-weighted", {"3": 0.5, "4": 1, "5": 0.5}),
-                ("apr-may-jun-weighted", {"4": 0.5, "5": 1, "6": 0.5}),
-                ("may-jun-jul-weighted", {"5": 0.5, "6": 1, "7": 0.5}),
-                ("jun-jul-aug-weighted", {"6": 0.5, "7": 1, "8": 0.5}),
-                ("jul-aug-sep-weighted", {"7": 0.5, "8": 1, "9": 0.5}),
-                ("aug-sep-oct-weighted", {"8": 0.5, "9": 1, "10": 0.5}),
-                ("sep-oct-nov-weighted", {"9": 0.5, "10": 1, "11": 0.5}),
-                ("oct-nov-dec-weighted", {"10": 0.5, "11": 1, "12": 0.5}),
-                ("nov-dec-jan-weighted", {"11": 0.5, "12": 1, "1": 0.5}),
-            ]
-        },
-        index=index,
-        columns=[
-            "dec-jan-feb-weighted",
-            "jan-feb-mar-weighted",
-            "feb-mar-apr-weighted",
-            "mar-apr-may-weighted",
-            "apr-may-jun-weighted",
-            "may-jun-jul-weighted",
-            "jun-jul-aug-weighted",
-            "jul-aug-sep-weighted",
-            "aug-sep-oct-weighted",
-            "sep-oct-nov-weighted",
-            "oct-nov-dec-weighted",
-            "nov-dec-jan-weighted",
-        ],  # guarantee order
+    Memoized by the index, so that repeated segmentations of the same index,
+    e.g., when predicting over the same reporting period, reuse the weights.
+    The returned frame is a copy which callers may modify.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(index)
+    key = (_index_cache_key(index), segment_type)
+    with _segment_weights_lock:
+        cached_weights = _segment_weights_cache.get(key)
+        if cached_weights is not None:
+            _segment_weights_cache.move_to_end(key)
+            segment_weights = cached_weights.copy()
+            segment_weights.index = index
+            return segment_weights
+
+    # gather each timestamp's row of the month -> segment weight matrix, with
+    # row 12 for missing timestamps
+    columns, month_weights = _SEGMENT_MONTH_WEIGHTS[segment_type]
+    months = np.asarray(index.month, dtype=float)
+    positions = np.where(np.isnan(months), 12, months - 1).astype(np.intp)
+    segment_weights = pd.DataFrame(
+        month_weights[positions], index=index, columns=columns
     )
 
+    with _segment_weights_lock:
+        # the cached frame holds its index, so the id of an index keyed on its
+        # identity can't be reused while the entry is cached
+        _segment_weights_cache[key] = segment_weights.copy()
+        _segment_weights_cache.move_to_end(key)
+        if len(_segment_weights_cache) > _SEGMENT_WEIGHTS_CACHE_SIZE:
+            _segment_weights_cache.popitem(last=False)
+    return segment_weights
+
 
 def segment_time_series(index, segment_type="single", drop_zero_weight_segments=False):
     """Split a time series index into segments by applying weights.
@@ -471,17 +647,10 @@ def segment_time_series(index, segment_type="single", drop_zero_weight_segments=
         A segmentation of the input index expressed as a dataframe which shares
         the input index and has named columns of weights.
     """
-    segment_weight_func = {
-        "single": _segment_weights_single,
-        "one_month": _segment_weights_one_month,
-        "three_month": _segment_weights_three_month,
-        "three_month_weighted": _segment_weights_three_month_weighted,
-    }.get(segment_type, None)
-
-    if segment_weight_func is None:
+    if segment_type not in _SEGMENT_MONTH_WEIGHTS:
         raise ValueError("Invalid segment type: %s" % (segment_type))
 
-    segment_weights = segment_weight_func(index)
+    segment_weights = _segment_weights(index, segment_type)
 
     if drop_zero_weight_segments:
         # keep only columns with non-zero weights
@@ -496,7 +665,9 @@ def segment_time_series(index, segment_type="single", drop_zero_weight_segments=
     return segment_weights
 
 
-def fit_model_segments(segmented_dataset_dict, fit_segment):
+def fit_model_segments(
+    segmented_dataset_dict, fit_segment, executor=None, max_workers=None
+):
     """A function which fits a model to each item in a dataset.
 
     Parameters
@@ -505,14 +676,42 @@ def fit_model_segments(segmented_dataset_dict, fit_segment):
         A dict with keys as segment names and values as dataframes of model input.
     fit_segment : :any:`function`
         A function which fits a model to a dataset in the `segmented_dataset_dict`.
+    executor : :any:`str`, default None
+        Fit segments concurrently on a ``'thread'`` or ``'process'`` pool. None
+        fits segments serially. With ``'process'``, `fit_segment` must be
+        picklable.
+    max_workers : :any:`int`, default None
+        Maximum number of workers for the executor. None uses the executor
+        default.
 
     Returns
     -------
     segment_models : :any:`list` of :any:`object`
-        List of fitted model objects - the return values of the fit_segment function.
+        List of fitted model objects - the return values of the fit_segment function,
+        in the same order as `segmented_dataset_dict` regardless of executor.
     """
-    segment_models = [
-        fit_segment(segment_name, segment_data)
-        for segment_name, segment_data in segmented_dataset_dict.items()
-    ]
-    return segment_models
+    if executor not in [None, "thread", "process"]:
+        raise ValueError("executor must be None, 'thread' or 'process'")
+
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+
+    segments = list(segmented_dataset_dict.items())
+    if executor is None or len(segments) < 2:
+        return [
+            fit_segment(segment_name, segment_data)
+            for segment_name, segment_data in segments
+        ]
+
+    if executor == "thread":
+        executor_cls = ThreadPoolExecutor
+    else:
+        executor_cls = ProcessPoolExecutor
+
+    with executor_cls(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(fit_segment, segment_name, segment_data)
+            for segment_name, segment_data in segments
+        ]
+
+        return [future.result() for future in futures]
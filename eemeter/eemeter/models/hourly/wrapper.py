@@ -34,6 +34,7 @@ from eemeter.eemeter.models.hourly.design_matrices import (
 from eemeter.eemeter.models.hourly.model import (
     CalTRACKHourlyModelResults,
     fit_caltrack_hourly_model,
+    fit_caltrack_hourly_model_from_monthly_stats,
 )
 from eemeter.eemeter.models.hourly.segmentation import segment_time_series
 
@@ -67,6 +68,18 @@ class HourlyModel:
         if settings is None:
             settings = {}
         self.segment_type = settings.get("segment_type", "three_month_weighted")
+
+        # "monthly_stats" fits every segment from shared per-month sums instead
+        # of building a design matrix per segment
+        self.fit_method = settings.get("fit_method", "design_matrices")
+        if self.fit_method not in ["design_matrices", "monthly_stats"]:
+            raise ValueError("fit_method must be 'design_matrices' or 'monthly_stats'")
+
+        # fit segment design matrices concurrently on a "thread" or "process" pool
+        self.segment_executor = settings.get("segment_executor")
+        self.segment_max_workers = settings.get("segment_max_workers")
+        if self.segment_executor not in [None, "thread", "process"]:
+            raise ValueError("segment_executor must be None, 'thread' or 'process'")
         self.alpha = 0.1
 
     def fit(self, data):
@@ -104,34 +117,61 @@ class HourlyModel:
         self.model_process_variables.occupied_temperature_bins = occupied_t_bins
         self.model_process_variables.unoccupied_temperature_bins = unoccupied_t_bins
 
-        # create segmented design matrices
-        segmented_design_matrices = create_caltrack_hourly_segmented_design_matrices(
-            preliminary_design_matrix,
-            segmentation,
-            occupancy_lookup,
-            occupied_t_bins,
-            unoccupied_t_bins,
-        )
-        self.model_process_variables.segmented_design_matrices = (
-            segmented_design_matrices
-        )
-
-        # fit model
-        self.model = fit_caltrack_hourly_model(
-            segmented_design_matrices,
-            occupancy_lookup,
-            occupied_t_bins,
-            unoccupied_t_bins,
-            self.segment_type,
-        )
+        if self.fit_method == "monthly_stats":
+            # fit model
+            self.model = fit_caltrack_hourly_model_from_monthly_stats(
+                preliminary_design_matrix,
+                segmentation,
+                occupancy_lookup,
+                occupied_t_bins,
+                unoccupied_t_bins,
+                self.segment_type,
+            )
+        else:
+            # create segmented design matrices from views of the rows of each
+            # segment, rather than a weighted copy of all rows per segment
+            segmented_design_matrices = (
+                create_caltrack_hourly_segmented_design_matrices(
+                    preliminary_design_matrix,
+                    segmentation,
+                    occupancy_lookup,
+                    occupied_t_bins,
+                    unoccupied_t_bins,
+                    segment_views=True,
+                )
+            )
+            self.model_process_variables.segmented_design_matrices = (
+                segmented_design_matrices
+            )
+
+            # fit model
+            self.model = fit_caltrack_hourly_model(
+                segmented_design_matrices,
+                occupancy_lookup,
+                occupied_t_bins,
+                unoccupied_t_bins,
+                self.segment_type,
+                executor=self.segment_executor,
+                max_workers=self.segment_max_workers,
+            )
         self.is_fit = True
         self.model_metrics = self.model.totals_metrics
 
-        # calculate baseline residuals
-        prediction = self.model.predict(temperature_data.index, temperature_data)
-        meter_data = meter_data.merge(
-            prediction.result, left_index=True, right_index=True
-        )
+        # calculate baseline residuals from the in-sample fitted values. Observed
+        # rows the segment models were not fit on, such as the final hour, are
+        # predicted from the temperatures spanning them
+        prediction = self.model.predict_in_sample(temperature_data.index).result
+        unfitted = prediction.index[
+            prediction["predicted_usage"].isna()
+            & temperature_data.notna()
+            & meter_data["value"].notna()
+        ]
+        if not unfitted.empty:
+            window = temperature_data.loc[unfitted[0] : unfitted[-1]]
+            prediction.loc[unfitted, "predicted_usage"] = self.model.predict(
+                window.index, window
+            ).result["predicted_usage"]
+        meter_data = meter_data.merge(prediction, left_index=True, right_index=True)
         meter_data.dropna(inplace=True)
         meter_data["resid"] = meter_data["value"] - meter_data["predicted_usage"]
 
@@ -179,32 +219,35 @@ class HourlyModel:
 
         # if observed isn't all nan, calculate uncertainty
         if not df_res["observed"].isna().all():
-            for month_n, unc_vars in self._autocorr_unc_vars.items():
-                if month_n == "all":
-                    idx = df_res.index
-                else:
-                    idx = df_res.index[df_res.index.month == month_n]
-
-                mean_baseline_usage = unc_vars["mean_baseline_usage"]
-                n = unc_vars["n"]
-                n_prime = unc_vars["n_prime"]
-                mse = unc_vars["MSE"]
-
-                reporting_usage = np.sum(df_res.loc[idx]["observed"])
-                m = len(idx)
-                t = t_stat(self.alpha, m, tail=2)
-
-                # ASHRAE 14
-                total_unc = (
-                    1.26
-                    * t
-                    * reporting_usage
-                    / (m * mean_baseline_usage)
-                    * np.sqrt(mse * n / n_prime * (1 + 2 / n_prime) * m)
-                )
-
-                avg_unc = np.sqrt(total_unc**2 / m)
-                df_res.loc[idx, "predicted_uncertainty"] = avg_unc
+            if "all" in self._autocorr_unc_vars:
+                unc_vars_key = pd.Series("all", index=df_res.index)
+            else:
+                unc_vars_key = pd.Series(df_res.index.month, index=df_res.index)
+
+            observed = df_res["observed"].groupby(unc_vars_key)
+            reporting_usage = observed.sum()
+            m = observed.size()
+            t = t_stat(self.alpha, m.to_numpy(), tail=2)
+
+            unc_vars = pd.DataFrame.from_dict(
+                self._autocorr_unc_vars, orient="index"
+            ).reindex(m.index)
+            mean_baseline_usage = unc_vars["mean_baseline_usage"]
+            n = unc_vars["n"]
+            n_prime = unc_vars["n_prime"]
+            mse = unc_vars["MSE"]
+
+            # ASHRAE 14
+            total_unc = (
+                1.26
+                * t
+                * reporting_usage
+                / (m * mean_baseline_usage)
+                * np.sqrt(mse * n / n_prime * (1 + 2 / n_prime) * m)
+            )
+
+            avg_unc = np.sqrt(total_unc**2 / m)
+            df_res["predicted_uncertainty"] = unc_vars_key.map(avg_unc)
 
         return df_res
 
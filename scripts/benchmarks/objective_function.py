@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2024 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+"""
+Benchmark objective function evaluations per second for the daily base models.
+
+Usage:
+    python scripts/benchmarks/objective_function.py [--n_eval N] [--n_days N] [--compiled]
+        [--adaptive] [--warm_start]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from eemeter.eemeter.models.daily.base_models.c_hdd_tidd import (
+    _c_hdd_tidd,
+    _c_hdd_tidd_smooth,
+    _c_hdd_tidd_smooth_weight,
+    _c_hdd_tidd_total_sum_of_squares,
+    _c_hdd_tidd_weight,
+)
+from eemeter.eemeter.models.daily.base_models.hdd_tidd_cdd import (
+    _hdd_tidd_cdd,
+    _hdd_tidd_cdd_smooth_weight,
+    _hdd_tidd_cdd_total_sum_of_squares,
+    _hdd_tidd_cdd_weight,
+    evaluate_hdd_tidd_cdd_smooth,
+)
+from eemeter.eemeter.models.daily.base_models.tidd import (
+    _tidd,
+    _tidd_total_sum_of_squares,
+    _tidd_weight,
+)
+from eemeter.eemeter.models.daily.objective_function import obj_fcn_decorator
+from eemeter.eemeter.models.daily.utilities.config import DailySettings
+
+
+def _synthetic_meter(n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    T = 60 + 25 * np.sin(np.linspace(0, 2 * np.pi, n_days)) + rng.normal(0, 4, n_days)
+    obs = (
+        20
+        + 1.5 * np.clip(50 - T, 0, None)
+        + 2.0 * np.clip(T - 70, 0, None)
+        + rng.normal(0, 3, n_days)
+    )
+
+    return T, obs
+
+
+# name: (model_fcn, weight_fcn, TSS_fcn, coef_id, X)
+_base_models = {
+    "hdd_tidd_cdd_smooth": (
+        evaluate_hdd_tidd_cdd_smooth,
+        _hdd_tidd_cdd_smooth_weight,
+        None,
+        ["hdd_bp", "hdd_beta", "hdd_k", "cdd_bp", "cdd_beta", "cdd_k", "intercept"],
+        [50.0, 1.5, 0.1, 70.0, 2.0, 0.1, 20.0],
+    ),
+    "hdd_tidd_cdd": (
+        _hdd_tidd_cdd,
+        _hdd_tidd_cdd_weight,
+        _hdd_tidd_cdd_total_sum_of_squares,
+        ["hdd_bp", "hdd_beta", "cdd_bp", "cdd_beta", "intercept"],
+        [50.0, 1.5, 70.0, 2.0, 20.0],
+    ),
+    "c_hdd_tidd_smooth": (
+        _c_hdd_tidd_smooth,
+        _c_hdd_tidd_smooth_weight,
+        None,
+        ["c_hdd_bp", "c_hdd_beta", "c_hdd_k", "intercept"],
+        [50.0, -1.5, 0.1, 20.0],
+    ),
+    "c_hdd_tidd": (
+        _c_hdd_tidd,
+        _c_hdd_tidd_weight,
+        _c_hdd_tidd_total_sum_of_squares,
+        ["c_hdd_bp", "c_hdd_beta", "intercept"],
+        [50.0, -1.5, 20.0],
+    ),
+    "tidd": (
+        _tidd,
+        _tidd_weight,
+        _tidd_total_sum_of_squares,
+        ["intercept"],
+        [20.0],
+    ),
+}
+
+
+def benchmark(n_eval=2000, n_days=365, settings=None, alpha=None):
+    if settings is None:
+        settings = DailySettings()
+
+    if alpha is None:
+        alpha = settings.alpha_selection
+
+    T, obs = _synthetic_meter(n_days)
+    rng = np.random.default_rng(1)
+
+    res = {}
+    for name, (model_fcn, weight_fcn, TSS_fcn, coef_id, X) in _base_models.items():
+        obj_fcn = obj_fcn_decorator(
+            model_fcn,
+            weight_fcn,
+            TSS_fcn,
+            T,
+            obs,
+            settings,
+            alpha=alpha,
+            coef_id=coef_id,
+            initial_fit=True,
+            model_key=name,
+        )
+
+        X = np.array(X)
+        X_eval = X * (1 + 0.05 * rng.standard_normal((n_eval, len(X))))
+
+        obj_fcn(X)  # compile and warm caches
+
+        t_start = time.perf_counter()
+        for x in X_eval:
+            obj_fcn(x)
+        t_elapsed = time.perf_counter() - t_start
+
+        res[name] = n_eval / t_elapsed
+
+    return res
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_eval", type=int, default=2000)
+    parser.add_argument("--n_days", type=int, default=365)
+    parser.add_argument("--compiled", action="store_true")
+    parser.add_argument("--adaptive", action="store_true", help="use alpha='adaptive'")
+    parser.add_argument("--warm_start", action="store_true")
+    args = parser.parse_args()
+
+    settings = DailySettings(
+        compiled_objective=args.compiled,
+        adaptive_alpha_warm_start=args.warm_start,
+    )
+    alpha = "adaptive" if args.adaptive else None
+    res = benchmark(
+        n_eval=args.n_eval, n_days=args.n_days, settings=settings, alpha=alpha
+    )
+    for name, evals_per_sec in res.items():
+        print(f"{name:>20s}: {evals_per_sec:>10.0f} evaluations/s")
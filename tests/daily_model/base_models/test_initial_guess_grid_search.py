@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2024 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+import numpy as np
+import pytest
+from scipy.stats import linregress
+
+from eemeter.eemeter.models.daily.utilities.config import DailySettings as Settings
+from eemeter.eemeter.models.daily.base_models.c_hdd_tidd import (
+    _c_hdd_tidd,
+    _c_hdd_tidd_bp0,
+    _c_hdd_tidd_grid_scores,
+)
+from eemeter.eemeter.models.daily.base_models.hdd_tidd_cdd import (
+    _hdd_tidd_cdd_grid_scores,
+    _hdd_tidd_cdd_smooth_x0,
+)
+
+
+def _meter_data(hdd_bp=50, cdd_bp=68, seed=0):
+    rng = np.random.default_rng(seed)
+    n = 365
+    T = 60 + 25 * np.sin(np.linspace(0, 2 * np.pi, n)) + rng.normal(0, 4, n)
+    obs = (
+        20
+        + 1.5 * np.clip(hdd_bp - T, 0, None)
+        + 2.0 * np.clip(T - cdd_bp, 0, None)
+        + rng.normal(0, 3, n)
+    )
+
+    idx_sorted = np.argsort(T)
+
+    return T[idx_sorted], obs[idx_sorted]
+
+
+def test_hdd_tidd_cdd_grid_scores():
+    T, obs = _meter_data()
+    N = len(T)
+    T_fit_bnds = np.array([T[0], T[-1]])
+    T_range = T_fit_bnds[1] - T_fit_bnds[0]
+    lasso_a = 0.02
+
+    hdd_bp = np.array([40.0, 50.0, 55.0])
+    cdd_bp = np.array([75.0, 68.0, 70.0])
+    scores = _hdd_tidd_cdd_grid_scores(T, obs, hdd_bp, cdd_bp, lasso_a)
+
+    for i in range(len(hdd_bp)):
+        idx_hdd = T < hdd_bp[i]
+        idx_tidd = (hdd_bp[i] <= T) & (T <= cdd_bp[i])
+        idx_cdd = cdd_bp[i] < T
+
+        intercept = np.mean(obs[idx_tidd])
+        model = np.full_like(T, intercept)
+        for idx, bp, sign in [(idx_hdd, hdd_bp[i], -1), (idx_cdd, cdd_bp[i], 1)]:
+            u = T[idx] - bp
+            slope = np.sum(u * (obs[idx] - intercept)) / np.sum(u**2)
+            slope = sign * max(sign * slope, 0)
+            model[idx] += slope * u
+
+        resid = model - obs
+        resid -= np.mean(resid)
+        loss = np.sum(resid**2)
+
+        X_lasso = np.array(
+            [np.min(np.abs(bp - T_fit_bnds)) for bp in [hdd_bp[i], cdd_bp[i]]]
+        )
+        X_lasso += (cdd_bp[i] - hdd_bp[i]) / 2
+        loss += lasso_a * np.sum(np.abs(X_lasso)) * np.sqrt(loss / N) / T_range
+
+        assert scores[i] == pytest.approx(loss, rel=1e-10)
+
+    # no temperature independent data
+    scores = _hdd_tidd_cdd_grid_scores(T, obs, np.array([60.01]), np.array([60.02]), 0)
+    assert np.isinf(scores[0])
+
+
+def test_c_hdd_tidd_grid_scores():
+    T, obs = _meter_data(hdd_bp=55, cdd_bp=np.inf)
+    T_fit_bnds = np.array([T[0], T[-1]])
+
+    c_hdd_bp = np.array([45.0, 55.0, 65.0, 75.0])
+    scores = _c_hdd_tidd_grid_scores(T, obs, c_hdd_bp)
+
+    for i, bp in enumerate(c_hdd_bp):
+        idx_hdd = T <= bp
+        idx_cdd = T >= bp
+
+        hdd_beta = min(linregress(obs[idx_hdd], T[idx_hdd]).slope, 0)
+        cdd_beta = max(linregress(obs[idx_cdd], T[idx_cdd]).slope, 0)
+        if -hdd_beta >= cdd_beta:
+            c_hdd_beta, intercept = hdd_beta, np.mean(obs[idx_cdd])
+        else:
+            c_hdd_beta, intercept = cdd_beta, np.mean(obs[idx_hdd])
+
+        model = _c_hdd_tidd(bp, c_hdd_beta, intercept, T_fit_bnds=T_fit_bnds, T=T)
+        loss = np.sum((model - obs) ** 2)
+
+        assert scores[i] == pytest.approx(loss, rel=1e-10)
+
+
+def test_hdd_tidd_cdd_smooth_x0_grid_search():
+    T, obs = _meter_data(hdd_bp=50, cdd_bp=68)
+    settings = Settings(
+        developer_mode=True, initial_guess_algorithm_choice="grid_search"
+    )
+
+    x0 = _hdd_tidd_cdd_smooth_x0(T, obs, 2.0, settings, smooth=False)
+
+    assert x0.hdd_bp == pytest.approx(50, abs=2)
+    assert x0.cdd_bp == pytest.approx(68, abs=2)
+    assert x0.hdd_beta == pytest.approx(1.5, rel=0.2)
+    assert x0.cdd_beta == pytest.approx(2.0, rel=0.2)
+
+
+def test_c_hdd_tidd_bp0_grid_search():
+    T, obs = _meter_data(hdd_bp=55, cdd_bp=np.inf)
+    settings = Settings(
+        developer_mode=True, initial_guess_algorithm_choice="grid_search"
+    )
+
+    bp = _c_hdd_tidd_bp0(T, obs, 2.0, settings)
+
+    min_T_idx = settings.segment_minimum_count
+    assert T[min_T_idx - 1] <= bp <= T[-min_T_idx]
@@ -766,6 +766,68 @@ def test_daily_reporting_data_with_missing_daily_frequencies(get_datetime_index)
         for disqualification in cls.disqualification
     )
 
+
+def test_daily_baseline_data_from_arrays_matches_hourly_input(
+    get_meter_data_daily, get_temperature_data_hourly
+):
+    df_temp = get_temperature_data_hourly
+    mask = df_temp.index.dayofweek.isin([1, 3])
+    df_temp.loc[
+        df_temp[mask].sample(frac=0.6, random_state=42).index, "temperature"
+    ] = np.nan
+    df_meter = get_meter_data_daily
+    df_meter.iloc[10:15] = 0
+
+    df = df_temp.merge(df_meter, left_index=True, right_index=True, how="outer")
+    expected = DailyBaselineData(df, is_electricity_data=True)
+
+    daily_temp = df_temp.temperature.groupby(df_temp.index.normalize())
+    cls = DailyBaselineData.from_arrays(
+        df_meter.index,
+        df_meter.observed.to_numpy(),
+        daily_temp.mean().to_numpy(),
+        is_electricity_data=True,
+        temperature_coverage=(daily_temp.count() / daily_temp.size()).to_numpy(),
+    )
+
+    pd.testing.assert_frame_equal(cls.df, expected.df, check_freq=False)
+    assert [w.json() for w in cls.warnings] == [w.json() for w in expected.warnings]
+    assert [dq.json() for dq in cls.disqualification] == [
+        dq.json() for dq in expected.disqualification
+    ]
+
+
+@pytest.mark.parametrize("get_datetime_index", [["D", True]], indirect=True)
+def test_daily_reporting_data_from_arrays_matches_daily_input(get_datetime_index):
+    np.random.seed(TEMPERATURE_SEED)
+    temperature_mean = np.random.rand(len(get_datetime_index))
+    temperature_mean[::9] = np.nan
+    df = pd.DataFrame(data={"temperature": temperature_mean}, index=get_datetime_index)
+    expected = DailyReportingData(df, is_electricity_data=True)
+
+    cls = DailyReportingData.from_arrays(
+        get_datetime_index, None, temperature_mean, is_electricity_data=True
+    )
+
+    pd.testing.assert_frame_equal(cls.df, expected.df, check_freq=False)
+    assert "observed" not in cls.df.columns
+    assert [w.json() for w in cls.warnings] == [w.json() for w in expected.warnings]
+    assert [dq.json() for dq in cls.disqualification] == [
+        dq.json() for dq in expected.disqualification
+    ]
+
+
+@pytest.mark.parametrize("get_datetime_index", [["D", True]], indirect=True)
+def test_daily_baseline_data_from_arrays_length_mismatch(get_datetime_index):
+    with pytest.raises(ValueError):
+        DailyBaselineData.from_arrays(
+            get_datetime_index,
+            np.ones(len(get_datetime_index)),
+            np.ones(len(get_datetime_index) - 1),
+            is_electricity_data=True,
+        )
+
+
 @pytest.fixture
 def baseline_data_daily_params(il_electricity_cdd_hdd_daily):
     def _baseline(tz='UTC', hour=0):
@@ -17,11 +17,14 @@
    limitations under the License.
 
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import numpy as np
 
 from eemeter.eemeter import DailyModel, DailyBaselineData, DailyReportingData
+from eemeter.eemeter.models.daily import model as daily_model_module
 from eemeter.eemeter.samples import load_sample
 from eemeter.eemeter.common.transform import get_baseline_data
 from eemeter.eemeter.common.exceptions import (
@@ -131,3 +134,149 @@ def test_predict_df_matches_input_index(daily_series):
     )
     res = baseline_model.predict(reporting_data_missing_temp)
     assert len(res) == len(reporting_data_missing_temp.df)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_component_executor_matches_serial(daily_series, executor):
+    meter, temp = daily_series
+    baseline_data = DailyBaselineData.from_series(meter, temp, is_electricity_data=True)
+
+    serial_model = DailyModel().fit(baseline_data)
+    parallel_model = DailyModel(
+        settings={"component_executor": executor, "component_max_workers": 2}
+    ).fit(baseline_data)
+
+    assert parallel_model.best_combination == serial_model.best_combination
+    assert parallel_model.error == serial_model.error
+    assert parallel_model.to_dict()["submodels"] == serial_model.to_dict()["submodels"]
+
+
+def test_component_executor_shared_by_fit(daily_series, monkeypatch):
+    meter, temp = daily_series
+    baseline_data = DailyBaselineData.from_series(meter, temp, is_electricity_data=True)
+
+    executors = []
+
+    class CountingThreadPoolExecutor(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    monkeypatch.setattr(
+        daily_model_module, "ThreadPoolExecutor", CountingThreadPoolExecutor
+    )
+
+    # without a split penalty the final fit has several components
+    model = DailyModel(
+        settings={
+            "component_executor": "thread",
+            "developer_mode": True,
+            "split_selection_penalty_multiplier": 0.0,
+        }
+    )
+    model.fit(baseline_data)
+    assert model.settings.alpha_final_type is not None
+    assert len(model.best_combination.split("__")) > 1
+
+    # the initial and final component fits run on the same pool
+    assert len(executors) == 1
+    assert model._component_executor is None
+    assert executors[0]._shutdown
+
+
+def test_compiled_objective_matches_python(daily_series):
+    meter, temp = daily_series
+    baseline_data = DailyBaselineData.from_series(meter, temp, is_electricity_data=True)
+
+    model = DailyModel().fit(baseline_data)
+    compiled_model = DailyModel(settings={"compiled_objective": True}).fit(
+        baseline_data
+    )
+
+    assert compiled_model.best_combination == model.best_combination
+    assert compiled_model.error == model.error
+    assert compiled_model.to_dict()["submodels"] == model.to_dict()["submodels"]
+
+
+def test_prior_model_warm_start(daily_series):
+    meter, temp = daily_series
+    prior_data = DailyBaselineData.from_series(
+        meter[:-30], temp, is_electricity_data=True
+    )
+    baseline_data = DailyBaselineData.from_series(
+        meter[30:], temp, is_electricity_data=True
+    )
+
+    prior_model = DailyModel().fit(prior_data, ignore_disqualification=True)
+    cold_model = DailyModel().fit(baseline_data, ignore_disqualification=True)
+    warm_model = DailyModel().fit(
+        baseline_data, ignore_disqualification=True, prior_model=prior_model
+    )
+
+    assert warm_model.best_combination == cold_model.best_combination
+    assert warm_model.error["CVRMSE"] == pytest.approx(
+        cold_model.error["CVRMSE"], abs=0.01
+    )
+
+    # prior parameters, dictionaries and json are equivalent to the prior model
+    for prior in [
+        prior_model.params,
+        prior_model.to_dict(),
+        prior_model.to_json(),
+        DailyModel.from_json(prior_model.to_json()),
+    ]:
+        model = DailyModel().fit(
+            baseline_data, ignore_disqualification=True, prior_model=prior
+        )
+        assert model.to_dict()["submodels"] == warm_model.to_dict()["submodels"]
+
+    with pytest.raises(TypeError):
+        DailyModel().fit(baseline_data, prior_model=1)
+
+    with pytest.raises(ValueError):
+        DailyModel().fit(baseline_data, prior_model=DailyModel())
+
+
+def test_inconsistent_prior_model_cold_start(daily_series):
+    meter, temp = daily_series
+    baseline_data = DailyBaselineData.from_series(meter, temp, is_electricity_data=True)
+
+    cold_model = DailyModel().fit(baseline_data)
+
+    # a prior fit to very different usage is ignored
+    prior = cold_model.to_dict()
+    for submodel in prior["submodels"].values():
+        submodel["coefficients"]["intercept"] *= 100
+
+    model = DailyModel().fit(baseline_data, prior_model=prior)
+    assert model.to_dict()["submodels"] == cold_model.to_dict()["submodels"]
+
+
+def test_segment_rows_match_season_day_mask(daily_series):
+    meter, temp = daily_series
+    baseline_data = DailyBaselineData.from_series(meter, temp, is_electricity_data=True)
+    model = DailyModel().fit(baseline_data)
+    df_meter = model.df_meter
+    segment_index = model._segment_index(model._segment_codes(df_meter.copy()))
+
+    for days in ["fw", "wd", "we"]:
+        for seasons in ["su", "sh", "wi", "su_sh", "su_wi", "sh_wi", "su_sh_wi"]:
+            component = f"{days}-{seasons}"
+            season_names = [model.combo_dictionary[s] for s in seasons.split("_")]
+            mask = df_meter["season"].isin(season_names) & df_meter["day_of_week"].isin(
+                model.combo_dictionary[days]
+            )
+
+            rows = model._segment_rows(component)
+            np.testing.assert_array_equal(rows, np.flatnonzero(mask))
+            np.testing.assert_array_equal(
+                model._segment_rows(component, segment_index), rows
+            )
+
+            meter_segment = model._meter_segment(rows)
+            np.testing.assert_array_equal(
+                meter_segment["temperature"], df_meter["temperature"][mask]
+            )
+            np.testing.assert_array_equal(
+                meter_segment["observed"], df_meter["observed"][mask]
+            )
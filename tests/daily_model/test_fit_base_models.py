@@ -20,7 +20,10 @@
 import numpy as np
 import pandas as pd
 import pytest
-from eemeter.eemeter.models.daily.parameters import ModelCoefficients
+from eemeter.eemeter.models.daily.parameters import (
+    DailySubmodelParameters,
+    ModelCoefficients,
+)
 
 from eemeter.eemeter.models.daily.utilities.config import DailySettings as Settings
 from eemeter.eemeter.models.daily.parameters import ModelType
@@ -29,6 +32,7 @@ from eemeter.eemeter.models.daily.fit_base_models import (
     fit_model,
     fit_final_model,
     _get_opt_options,
+    _prior_x0,
 )
 
 from eemeter.eemeter.models.daily.optimize_results import OptimizedResult
@@ -213,3 +217,47 @@ def test_fit_final_model(meter_data, get_settings, get_optimized_result):
     # Test case 2: Test if the function raises a TypeError when the input arguments are of the wrong type
     with pytest.raises(TypeError):
         fit_final_model("not a dataframe", "not an OptimizedResult", "not a dictionary")
+
+
+def test_prior_x0(meter_data, get_settings):
+    T = np.array(meter_data["temperature"])
+    temperature_constraints = {
+        "T_min": 10.0,
+        "T_max": 100.0,
+        "T_min_seg": 15.0,
+        "T_max_seg": 95.0,
+    }
+
+    # heating only prior seeds the full model with no cooling slope
+    prior = DailySubmodelParameters(
+        coefficients=ModelCoefficients(
+            model_type=ModelType.HDD_TIDD_SMOOTH,
+            hdd_bp=60.0,
+            hdd_beta=-2.0,
+            hdd_k=5.0,
+            intercept=50.0,
+        ),
+        temperature_constraints=temperature_constraints,
+        f_unc=1.0,
+    )
+    x0 = _prior_x0(prior, T, get_settings)
+    assert x0.model_type == ModelType.HDD_TIDD_CDD_SMOOTH
+    assert x0.hdd_bp == 60.0
+    assert x0.hdd_beta == 2.0
+    assert x0.cdd_beta == 0.0
+    assert x0.hdd_k == x0.cdd_k == 0.0
+    assert x0.intercept == 50.0
+
+    res = fit_initial_models_from_full_model(
+        meter_data, get_settings, prior_submodel=prior
+    )
+    assert isinstance(res, OptimizedResult)
+
+    # intercept only and non-finite priors fall back to a cold start
+    prior.coefficients = ModelCoefficients(model_type=ModelType.TIDD, intercept=50.0)
+    assert _prior_x0(prior, T, get_settings) is None
+
+    prior.coefficients = ModelCoefficients(
+        model_type=ModelType.HDD_TIDD, hdd_bp=np.nan, hdd_beta=-2.0, intercept=50.0
+    )
+    assert _prior_x0(prior, T, get_settings) is None
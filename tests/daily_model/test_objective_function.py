@@ -19,6 +19,7 @@
 """
 import numpy as np
 import pytest
+from scipy.optimize import approx_fprime
 
 from eemeter.eemeter.models.daily.objective_function import (
     get_idx,
@@ -26,10 +27,19 @@ from eemeter.eemeter.models.daily.objective_function import (
     obj_fcn_decorator,
 )
 
+from eemeter.eemeter.models.daily.base_models.c_hdd_tidd import (
+    _c_hdd_tidd,
+    _c_hdd_tidd_smooth,
+    _c_hdd_tidd_smooth_weight,
+    _c_hdd_tidd_weight,
+)
 from eemeter.eemeter.models.daily.base_models.hdd_tidd_cdd import (
     evaluate_hdd_tidd_cdd_smooth,
+    _hdd_tidd_cdd,
     _hdd_tidd_cdd_smooth_weight,
+    _hdd_tidd_cdd_weight,
 )
+from eemeter.eemeter.models.daily.base_models.tidd import _tidd, _tidd_weight
 
 from eemeter.eemeter.models.daily.utilities.config import DailySettings as Settings
 
@@ -191,3 +201,295 @@ def test_obj_fcn_decorator():
         )
         == 1295.1226641177577
     )
+
+
+def test_obj_fcn_decorator_unsorted_input():
+    rng = np.random.default_rng(42)
+    T = np.linspace(20, 90, 120)
+    obs = 20 + 1.5 * np.clip(50 - T, 0, None) + 2.0 * np.clip(T - 70, 0, None)
+    obs += rng.normal(0, 2, len(T))
+    X = np.array([50.0, 1.5, 0.1, 70.0, 2.0, 0.1, 20.0])
+    coef_id = [
+        "hdd_bp",
+        "hdd_beta",
+        "hdd_k",
+        "cdd_bp",
+        "cdd_beta",
+        "cdd_k",
+        "intercept",
+    ]
+    settings = Settings(developer_mode=True, alpha_selection=1.0)
+
+    def get_obj_fcn(T, obs):
+        return obj_fcn_decorator(
+            evaluate_hdd_tidd_cdd_smooth,
+            _hdd_tidd_cdd_smooth_weight,
+            None,
+            T,
+            obs,
+            settings,
+            settings.alpha_selection,
+            coef_id,
+            True,
+        )
+
+    idx = rng.permutation(len(T))
+    obj_fcn_sorted = get_obj_fcn(T, obs)
+    obj_fcn_shuffled = get_obj_fcn(T[idx], obs[idx])
+
+    # evaluating repeatedly must not change the result
+    loss = obj_fcn_shuffled(X)
+    assert obj_fcn_shuffled(X) == loss
+    assert loss == pytest.approx(obj_fcn_sorted(X))
+
+    res = obj_fcn_shuffled(X, optimize_flag=False)
+    np.testing.assert_allclose(res[5], obj_fcn_sorted(X, optimize_flag=False)[5][idx])
+
+
+# (model_key, model_fcn, weight_fcn, coef_id, X)
+compiled_base_models = [
+    (
+        "hdd_tidd_cdd_smooth",
+        evaluate_hdd_tidd_cdd_smooth,
+        _hdd_tidd_cdd_smooth_weight,
+        ["hdd_bp", "hdd_beta", "hdd_k", "cdd_bp", "cdd_beta", "cdd_k", "intercept"],
+        [50.0, 1.5, 0.1, 70.0, 2.0, 0.1, 20.0],
+    ),
+    (
+        "hdd_tidd_cdd",
+        _hdd_tidd_cdd,
+        _hdd_tidd_cdd_weight,
+        ["hdd_bp", "hdd_beta", "cdd_bp", "cdd_beta", "intercept"],
+        [50.0, 1.5, 70.0, 2.0, 20.0],
+    ),
+    (
+        "c_hdd_tidd_smooth",
+        _c_hdd_tidd_smooth,
+        _c_hdd_tidd_smooth_weight,
+        ["c_hdd_bp", "c_hdd_beta", "c_hdd_k", "intercept"],
+        [50.0, -1.5, 0.1, 20.0],
+    ),
+    (
+        "c_hdd_tidd",
+        _c_hdd_tidd,
+        _c_hdd_tidd_weight,
+        ["c_hdd_bp", "c_hdd_beta", "intercept"],
+        [70.0, 2.0, 20.0],
+    ),
+    ("tidd", _tidd, _tidd_weight, ["intercept"], [20.0]),
+]
+
+
+@pytest.mark.parametrize(
+    "model_key, model_fcn, weight_fcn, coef_id, X", compiled_base_models
+)
+@pytest.mark.parametrize(
+    "settings_kwargs",
+    [
+        {},
+        {"developer_mode": True, "alpha_selection": -3.0},
+        {"developer_mode": True, "regularization_alpha": 0.0},
+    ],
+)
+def test_obj_fcn_decorator_compiled(
+    model_key, model_fcn, weight_fcn, coef_id, X, settings_kwargs
+):
+    rng = np.random.default_rng(7)
+    T = rng.uniform(20, 90, 200)
+    obs = 20 + 1.5 * np.clip(50 - T, 0, None) + 2.0 * np.clip(T - 70, 0, None)
+    obs += rng.normal(0, 2, len(T))
+
+    def get_obj_fcn(compiled_objective):
+        settings = Settings(compiled_objective=compiled_objective, **settings_kwargs)
+        return obj_fcn_decorator(
+            model_fcn,
+            weight_fcn,
+            None,
+            T,
+            obs,
+            settings,
+            settings.alpha_selection,
+            coef_id,
+            True,
+            model_key,
+        )
+
+    obj_fcn = get_obj_fcn(False)
+    obj_fcn_compiled = get_obj_fcn(True)
+
+    # the compiled objective function must give identical losses
+    for _ in range(25):
+        X_i = np.array(X) * (1 + 0.3 * rng.standard_normal(len(X)))
+        assert obj_fcn_compiled(X_i.copy()) == obj_fcn(X_i.copy())
+
+    # the full output is unchanged
+    res = obj_fcn_compiled(np.array(X), optimize_flag=False)
+    res_expected = obj_fcn(np.array(X), optimize_flag=False)
+    assert res[1] == res_expected[1]
+    np.testing.assert_array_equal(res[5], res_expected[5])
+
+
+def test_obj_fcn_decorator_compiled_adaptive_alpha():
+    rng = np.random.default_rng(7)
+    T = rng.uniform(20, 90, 150)
+    obs = 20 + 1.5 * np.clip(50 - T, 0, None) + 2.0 * np.clip(T - 70, 0, None)
+    obs += rng.normal(0, 2, len(T))
+    obs[::13] += 30
+    X = np.array([50.0, 1.5, 70.0, 2.0, 20.0])
+    coef_id = ["hdd_bp", "hdd_beta", "cdd_bp", "cdd_beta", "intercept"]
+
+    obj_fcns = []
+    for settings_kwargs in [
+        {},
+        {"compiled_objective": True},
+        {"compiled_objective": True, "adaptive_alpha_warm_start": True},
+    ]:
+        settings = Settings(**settings_kwargs)
+        obj_fcns.append(
+            obj_fcn_decorator(
+                _hdd_tidd_cdd,
+                _hdd_tidd_cdd_weight,
+                None,
+                T,
+                obs,
+                settings,
+                "adaptive",
+                coef_id,
+                False,
+                "hdd_tidd_cdd",
+            )
+        )
+
+    obj_fcn, obj_fcn_compiled, obj_fcn_warm = obj_fcns
+    for _ in range(20):
+        X = X * (1 + 0.01 * rng.standard_normal(len(X)))
+        loss = obj_fcn(X.copy())
+
+        # without warm start the compiled objective function is identical
+        assert obj_fcn_compiled(X.copy()) == loss
+
+        # with warm start alpha is only solved to the solver tolerance
+        assert obj_fcn_warm(X.copy()) == pytest.approx(loss, rel=1e-3)
+
+
+@pytest.mark.parametrize(
+    "model_key, model_fcn, weight_fcn, coef_id, X", compiled_base_models
+)
+@pytest.mark.parametrize(
+    "settings_kwargs",
+    [
+        {},
+        {"developer_mode": True, "regularization_percent_lasso": 0.5},
+        {"compiled_objective": True},
+    ],
+)
+def test_obj_fcn_decorator_gradient(
+    model_key, model_fcn, weight_fcn, coef_id, X, settings_kwargs
+):
+    rng = np.random.default_rng(11)
+    T = rng.uniform(20, 90, 200)
+    obs = 20 + 1.5 * np.clip(50 - T, 0, None) + 2.0 * np.clip(T - 70, 0, None)
+    obs += rng.normal(0, 2, len(T))
+
+    settings = Settings(**settings_kwargs)
+    obj_fcn = obj_fcn_decorator(
+        model_fcn,
+        weight_fcn,
+        None,
+        T,
+        obs,
+        settings,
+        2.0,
+        coef_id,
+        False,
+        model_key,
+    )
+
+    for _ in range(10):
+        X_i = np.array(X) * (1 + 0.1 * rng.standard_normal(len(X)))
+        X_i[get_idx(["dd_k"], coef_id)] = rng.uniform(0.05, 0.6)
+
+        grad = np.empty(len(X_i))
+        loss = obj_fcn(X_i, grad)
+        assert loss == obj_fcn(X_i)
+
+        # central finite differences
+        grad_fd = np.empty(len(X_i))
+        for i in range(len(X_i)):
+            h = 1e-6 * max(1, abs(X_i[i]))
+            X_upper, X_lower = X_i.copy(), X_i.copy()
+            X_upper[i] += h
+            X_lower[i] -= h
+            grad_fd[i] = (obj_fcn(X_upper) - obj_fcn(X_lower)) / (2 * h)
+
+        np.testing.assert_allclose(
+            grad, grad_fd, rtol=1e-5, atol=1e-6 * np.max(np.abs(grad_fd))
+        )
+
+    # model jacobian is returned for uncertainty calculations
+    res = obj_fcn(np.array(X), optimize_flag=False)
+    assert res[7].shape == (len(T), len(X))
+
+
+@pytest.mark.parametrize(
+    "model_key, model_fcn, weight_fcn, coef_id, X", compiled_base_models
+)
+@pytest.mark.parametrize("alpha", [1.0, -2.0, "adaptive"])
+def test_obj_fcn_decorator_gradient_alpha(
+    model_key, model_fcn, weight_fcn, coef_id, X, alpha
+):
+    rng = np.random.default_rng(5)
+    T = rng.uniform(20, 90, 200)
+    obs = 20 + 1.5 * np.clip(50 - T, 0, None) + 2.0 * np.clip(T - 70, 0, None)
+    obs += rng.standard_t(2, len(T))
+
+    obj_fcn = obj_fcn_decorator(
+        model_fcn,
+        weight_fcn,
+        None,
+        T,
+        obs,
+        Settings(),
+        alpha,
+        coef_id,
+        False,
+        model_key,
+    )
+
+    # the weights depend on the residuals, so the gradient includes their derivative
+    X = np.array(X) * (1 + 0.1 * rng.standard_normal(len(X)))
+    grad = np.empty(len(X))
+    obj_fcn(X, grad)
+    grad_expected = approx_fprime(X, obj_fcn, np.sqrt(np.finfo(float).eps))
+    np.testing.assert_allclose(grad, grad_expected, rtol=1e-6)
+
+
+def test_obj_fcn_decorator_gradient_no_model_key():
+    rng = np.random.default_rng(3)
+    T = np.linspace(20, 90, 100)
+    obs = 20 + 2.0 * np.clip(T - 70, 0, None) + rng.normal(0, 1, len(T))
+    X = np.array([60.0, -0.5, 25.0])
+
+    settings = Settings()
+    obj_fcn, obj_fcn_key = [
+        obj_fcn_decorator(
+            _c_hdd_tidd,
+            _c_hdd_tidd_weight,
+            None,
+            T,
+            obs,
+            settings,
+            2.0,
+            ["c_hdd_bp", "c_hdd_beta", "intercept"],
+            False,
+            model_key,
+        )
+        for model_key in [None, "c_hdd_tidd"]
+    ]
+
+    # without a model key the gradient is approximated by finite differences
+    grad, grad_expected = np.empty(3), np.empty(3)
+    assert obj_fcn(X, grad) == obj_fcn_key(X, grad_expected)
+    np.testing.assert_allclose(grad, grad_expected, rtol=1e-4)
+
+    assert obj_fcn(X, optimize_flag=False)[7] is None
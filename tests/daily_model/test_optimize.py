@@ -25,7 +25,9 @@ from eemeter.eemeter.models.daily.objective_function import obj_fcn_decorator
 
 from eemeter.eemeter.models.daily.base_models.hdd_tidd_cdd import (
     evaluate_hdd_tidd_cdd_smooth,
+    _hdd_tidd_cdd,
     _hdd_tidd_cdd_smooth_weight,
+    _hdd_tidd_cdd_weight,
 )
 
 from eemeter.eemeter.models.daily.fit_base_models import _get_opt_options
@@ -46,6 +48,22 @@ def test_obj_fcn_dec():
     assert obj_fcn_eval(x) == expected_output
     assert idx_opt == [0, 1, 2]
 
+    # Test case 2: Check that only the gradient of optimized variables is returned
+    def obj_fcn(x, grad=[]):
+        if np.size(grad) > 0:
+            grad[:] = 2 * x
+
+        return np.sum(x**2)
+
+    x0 = np.array([1.0, 2.0, 3.0])
+    bnds = np.array([[0, 1], [2, 2], [2, 3]])
+    obj_fcn_eval, idx_opt = obj_fcn_dec(obj_fcn, x0, bnds)
+
+    grad = np.empty(2)
+    assert obj_fcn_eval(np.array([0.5, 2.5]), grad) == 10.5
+    assert idx_opt == [0, 2]
+    np.testing.assert_array_equal(grad, [1.0, 5.0])
+
 
 @pytest.fixture
 def get_settings():
@@ -143,3 +161,41 @@ def test_optimizer_run(get_settings, get_obj_fcn, get_x0, get_bnds):
     optimizer = Optimizer(get_obj_fcn, x0, bnds, coef_id, settings, opt_options)
     res = optimizer.run()
     assert np.allclose(res.x, np.array([20.13393783]), rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "algorithm", ["scipy_L-BFGS-B", "scipy_SLSQP", "nlopt_LBFGS", "nlopt_SLSQP"]
+)
+def test_optimizer_gradient_algorithms(algorithm):
+    rng = np.random.default_rng(5)
+    T = rng.uniform(20, 90, 300)
+    obs = 20 + 1.5 * np.clip(50 - T, 0, None) + 2.0 * np.clip(T - 70, 0, None)
+    obs += rng.normal(0, 2, len(T))
+
+    coef_id = ["hdd_bp", "hdd_beta", "cdd_bp", "cdd_beta", "intercept"]
+    x0 = np.array([55.0, 1.0, 65.0, 1.0, 25.0])
+    bnds = np.array([[40, 60], [0, 5], [60, 80], [0, 5], [0, 50]]).astype(float)
+
+    res = {}
+    for algorithm_choice in ["nlopt_SBPLX", algorithm]:
+        settings = Settings(developer_mode=True, algorithm_choice=algorithm_choice)
+        obj_fcn = obj_fcn_decorator(
+            _hdd_tidd_cdd,
+            _hdd_tidd_cdd_weight,
+            None,
+            T,
+            obs,
+            settings,
+            2.0,
+            coef_id,
+            False,
+            "hdd_tidd_cdd",
+        )
+        opt_options = _get_opt_options(settings)
+        optimizer = Optimizer(obj_fcn, x0.copy(), bnds, coef_id, settings, opt_options)
+        res[algorithm_choice] = optimizer.run()
+
+    res_grad = res[algorithm]
+    assert res_grad.mean_loss == pytest.approx(res["nlopt_SBPLX"].mean_loss, rel=1e-3)
+    assert res_grad.nfev < res["nlopt_SBPLX"].nfev
+    assert np.all(res_grad.x_unc > 0)
@@ -18,11 +18,21 @@
 
 """
 import numpy as np
+from scipy.optimize import minimize_scalar
 
 from eemeter.common.adaptive_loss import (
+    LOSS_ALPHA_MIN,
     remove_outliers,
     adaptive_weights,
+    adaptive_weights_solve_alpha,
     adaptive_loss_fcn,
+    adaptive_alpha_solve,
+    alpha_scaled,
+    ln_Z,
+    ln_Z_fit,
+    ln_Z_inf,
+    ln_Z_numba,
+    penalized_loss_fcn,
 )
 
 
@@ -106,3 +116,68 @@ def test_adaptive_weights():
     assert np.allclose(weights, np.array([1, 1, 1, 0.9865, 0.9483, 0.0082]), atol=1e-3)
     assert np.isclose(C, 6.05975)
     assert np.isclose(alpha, 0.031, atol=1e-2)
+
+
+def test_ln_Z_numba():
+    # lookup table matches the spline within 1E-12 over the full alpha range of the knots
+    rng = np.random.default_rng(0)
+    alpha = np.concatenate(
+        [
+            np.linspace(-100, 100, 20001),
+            rng.uniform(-3, 2.1, 20000),
+            ln_Z_fit.t,
+        ]
+    )
+    expected = ln_Z_fit(alpha)
+    res = np.array([ln_Z_numba(a) for a in alpha])
+    assert np.allclose(res, expected, rtol=0, atol=1e-12)
+
+    # extrapolation outside of the knots
+    alpha = np.concatenate([np.linspace(-120, -100, 101), np.linspace(100, 120, 101)])
+    expected = ln_Z_fit(alpha)
+    res = np.array([ln_Z_numba(a) for a in alpha])
+    assert np.allclose(res, expected, rtol=1e-6, atol=0)
+
+    # alpha <= alpha_min
+    assert ln_Z_numba(LOSS_ALPHA_MIN, LOSS_ALPHA_MIN) == ln_Z_inf
+    assert ln_Z_numba(-1e7) == ln_Z_inf
+
+    assert ln_Z(1.5, LOSS_ALPHA_MIN) == ln_Z_numba(1.5, LOSS_ALPHA_MIN)
+
+
+def test_adaptive_alpha_solve():
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        x = rng.standard_normal(100)
+        x[rng.random(100) < 0.1] *= 10
+
+        # cold start is identical to bounded minimize_scalar
+        res = minimize_scalar(
+            lambda s: penalized_loss_fcn(x, a=alpha_scaled(s)).sum(),
+            bounds=[-1e-5, 1 + 1e-5],
+            method="Bounded",
+            options={"xatol": 1e-5},
+        )
+        s, fun, nfev = adaptive_alpha_solve(x)
+        assert s == res.x
+        assert fun == res.fun
+        assert nfev == res.nfev
+
+        # warm start from a nearby solution converges to the same alpha in fewer evaluations
+        s_warm, fun_warm, nfev_warm = adaptive_alpha_solve(x, s + 1e-3)
+        assert np.isclose(alpha_scaled(s_warm), alpha_scaled(s), atol=1e-3)
+        assert np.isclose(fun_warm, fun, rtol=1e-8)
+        assert nfev_warm < nfev
+
+
+def test_adaptive_weights_solve_alpha():
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(50)
+    x[::7] += 20
+
+    weights, C, alpha = adaptive_weights(x.copy())
+    weights_c, C_c, alpha_c, s = adaptive_weights_solve_alpha(x.copy())
+    assert np.array_equal(weights_c, weights)
+    assert C_c == C
+    assert alpha_c == alpha
+    assert alpha_scaled(s) == alpha
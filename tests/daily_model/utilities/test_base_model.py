@@ -23,6 +23,9 @@ from scipy.stats import linregress, theilslopes
 
 from eemeter.eemeter.models.daily.utilities.config import DailySettings
 from eemeter.eemeter.models.daily.utilities.base_model import (
+    cumulative_sums,
+    grid_search_candidates,
+    refine_grid_candidates,
     get_slope,
     linear_fit,
     get_smooth_coeffs,
@@ -176,3 +179,46 @@ def test_fix_identical_bnds():
     bnds = np.array([[1, 1], [1, 1], [1, 1]])
     expected_output = np.array([[0, 2], [0, 2], [0, 2]])
     assert np.array_equal(fix_identical_bnds(bnds), expected_output)
+
+
+def test_cumulative_sums():
+    T = np.array([1.0, 2.0, 4.0, 5.0])
+    obs = np.array([3.0, 1.0, 2.0, 6.0])
+
+    S = cumulative_sums(T, obs)
+    assert S.shape == (6, 5)
+    assert np.all(S[:, 0] == 0)
+
+    # sums over T[1:3]
+    expected = [2, 6, 20, 3, 5, 10]
+    assert np.allclose(S[:, 3] - S[:, 1], expected)
+
+
+def test_grid_search_candidates():
+    T = np.array([1.0, 2.0, 2.0, 3.0, 4.0, 5.0])
+    assert np.array_equal(grid_search_candidates(T, 2, 4), [2.0, 3.0, 4.0])
+
+    T = np.arange(1000, dtype=float)
+    T_cand = grid_search_candidates(T, 100, 899, max_candidates=50)
+    assert len(T_cand) == 50
+    assert T_cand[0] == 100 and T_cand[-1] == 899
+
+    # no temperatures within bounds returns the midpoint
+    assert np.array_equal(grid_search_candidates(T, 10.2, 10.8), [10.5])
+
+
+def test_refine_grid_candidates():
+    def obj_fcn(x, grad=[]):
+        return (x[0] - 3.3) ** 2 + (x[1] - 7.7) ** 2
+
+    candidates = np.array([[1.0, 1.0], [3.0, 8.0], [9.0, 9.0]])
+    scores = np.array([obj_fcn(x) for x in candidates])
+    bnds = np.array([[0, 0], [10, 10]])
+
+    x_opt = refine_grid_candidates(obj_fcn, candidates, scores, bnds, 0.5)
+    assert obj_fcn(x_opt) <= np.min(scores)
+    assert np.all(x_opt >= bnds[0]) and np.all(x_opt <= bnds[1])
+
+    # collapsed bounds return the best candidate without refinement
+    x_opt = refine_grid_candidates(obj_fcn, candidates, scores, bnds, 0)
+    assert np.array_equal(x_opt, [3.0, 8.0])
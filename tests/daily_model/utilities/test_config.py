@@ -89,3 +89,43 @@ def test_invalid_settings():
         DailySettings(developer_mode=False, alpha_selection=1.5)
     with pytest.raises(ValueError):
         DailySettings(developer_mode=False, alpha_final_type="invalid_type")
+
+
+def test_component_executor_settings():
+    settings = DailySettings(component_executor="Thread", component_max_workers=4)
+    assert settings.component_executor == "thread"
+    assert settings.component_max_workers == 4
+    assert DailySettings().component_executor is None
+
+    with pytest.raises(ValueError):
+        DailySettings(component_executor="invalid_executor")
+    with pytest.raises(ValueError):
+        DailySettings(component_max_workers=0)
+
+
+def test_compiled_objective_settings():
+    settings = DailySettings(compiled_objective=True, adaptive_alpha_warm_start=True)
+    assert settings.compiled_objective
+    assert settings.adaptive_alpha_warm_start
+    assert not DailySettings().compiled_objective
+    assert not DailySettings().adaptive_alpha_warm_start
+
+    with pytest.raises(ValueError):
+        DailySettings(compiled_objective="yes")
+    with pytest.raises(ValueError):
+        DailySettings(adaptive_alpha_warm_start=1)
+
+
+def test_initial_guess_grid_search_settings():
+    settings = DailySettings(
+        developer_mode=True, initial_guess_algorithm_choice="GRID_SEARCH"
+    )
+    assert settings.initial_guess_algorithm_choice == "grid_search"
+
+    settings = DailySettings(
+        developer_mode=True, initial_guess_algorithm_choice="nlopt_sbplx"
+    )
+    assert settings.initial_guess_algorithm_choice == "nlopt_sbplx"
+
+    with pytest.raises(ValueError):
+        DailySettings(developer_mode=True, initial_guess_algorithm_choice="invalid")
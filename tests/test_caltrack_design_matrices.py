@@ -17,6 +17,7 @@
    limitations under the License.
 
 """
+import pandas as pd
 import pytest
 
 from eemeter.eemeter.models.hourly.design_matrices import (
@@ -163,6 +164,32 @@ def test_create_caltrack_hourly_segmented_design_matrices(
     assert round(design_matrix.sum().sum(), 2) == 167659.28
 
 
+def test_create_caltrack_hourly_segmented_design_matrices_segment_views(
+    preliminary_hourly_design_matrix, segmentation, occupancy_lookup, temperature_bins
+):
+    occupied_temperature_bins, unoccupied_temperature_bins = temperature_bins
+    args = (
+        preliminary_hourly_design_matrix,
+        segmentation,
+        occupancy_lookup,
+        occupied_temperature_bins,
+        unoccupied_temperature_bins,
+    )
+    design_matrices = create_caltrack_hourly_segmented_design_matrices(*args)
+    view_design_matrices = create_caltrack_hourly_segmented_design_matrices(
+        *args, segment_views=True
+    )
+
+    assert list(view_design_matrices) == list(design_matrices)
+    for segment_name, design_matrix in design_matrices.items():
+        expected = design_matrix[segmentation[segment_name] > 0]
+        view_design_matrix = view_design_matrices[segment_name]
+        assert view_design_matrix.index.equals(expected.index)
+        pd.testing.assert_frame_equal(
+            view_design_matrix.astype(float), expected.astype(float)
+        )
+
+
 def test_create_caltrack_billing_design_matrix_empty_temp(
     il_electricity_cdd_hdd_billing_monthly,
 ):
@@ -27,6 +27,7 @@ from eemeter.eemeter.models.hourly.model import (
     caltrack_hourly_prediction_feature_processor,
     fit_caltrack_hourly_model_segment,
     fit_caltrack_hourly_model,
+    fit_hourly_wls,
 )
 from eemeter.eemeter.common.features import (
     compute_time_features,
@@ -164,6 +165,59 @@ def test_fit_caltrack_hourly_model_segment(segmented_design_matrices):
     assert round(prediction.sum(), 2) == 960.0
 
 
+def test_fit_caltrack_hourly_model_segment_keeps_data(segmented_design_matrices):
+    segment_data = segmented_design_matrices["dec-jan-feb-weighted"].astype(
+        {"hour_of_week": int}
+    )
+    original_data = segment_data.copy()
+    fit_caltrack_hourly_model_segment("dec-jan-feb-weighted", segment_data)
+    pd.testing.assert_frame_equal(segment_data, original_data)
+
+
+def test_fit_hourly_wls_matches_statsmodels(
+    occupancy_lookup, occupied_temperature_bins, unoccupied_temperature_bins
+):
+    import statsmodels.formula.api as smf
+
+    index = pd.date_range(start="2017-01-01", periods=24 * 21, freq="H", tz="UTC")
+    rng = np.random.default_rng(42)
+    segmented_data = pd.DataFrame(
+        {
+            "hour_of_week": compute_time_features(index).hour_of_week,
+            "temperature_mean": rng.uniform(0, 100, len(index)),
+            "meter_value": rng.uniform(10, 70, len(index)),
+            "weight": rng.choice([0.5, 1.0], len(index)),
+        },
+        index=index,
+    )
+    segmented_data.iloc[::17, 2] = np.nan
+    segment_data = caltrack_hourly_fit_feature_processor(
+        "dec-jan-feb-weighted",
+        segmented_data,
+        occupancy_lookup,
+        occupied_temperature_bins,
+        unoccupied_temperature_bins,
+    )
+    segment_model = fit_caltrack_hourly_model_segment(
+        "dec-jan-feb-weighted", segment_data
+    )
+
+    expected = smf.wls(
+        formula=segment_model.formula, data=segment_data, weights=segment_data.weight
+    ).fit()
+
+    assert list(segment_model.model_params.keys()) == list(expected.params.index)
+    assert np.allclose(
+        list(segment_model.model_params.values()), expected.params.values
+    )
+
+    result = fit_hourly_wls(segment_data)
+    assert result.rank == len(expected.params)
+    assert np.allclose(
+        result.fittedvalues[expected.fittedvalues.index], expected.fittedvalues
+    )
+
+
 @pytest.fixture
 def temps():
     index = pd.date_range(start="2017-01-01", periods=24, freq="H", tz="UTC")
@@ -488,3 +542,290 @@ def test_fit_caltrack_hourly_model_segment_single_mode(
     assert segment_model.warnings is not None
     prediction = segment_model.predict(segment_data)
     assert round(prediction.sum(), 2) == 960.0
+
+
+@pytest.fixture
+def preliminary_design_matrix():
+    from eemeter.eemeter.models.hourly.design_matrices import (
+        create_caltrack_hourly_preliminary_design_matrix,
+    )
+    from eemeter.eemeter.samples import load_sample
+
+    meter_data, temperature_data, _ = load_sample("il-electricity-cdd-hdd-hourly")
+    meter_data = meter_data[: 24 * 365].copy()
+    meter_data.iloc[100:400] = np.nan
+    return create_caltrack_hourly_preliminary_design_matrix(
+        meter_data, temperature_data
+    )
+
+
+@pytest.mark.parametrize("missing_months", [False, True])
+@pytest.mark.parametrize(
+    "segment_type", ["single", "one_month", "three_month", "three_month_weighted"]
+)
+def test_fit_model_segments_from_monthly_stats(
+    preliminary_design_matrix, segment_type, missing_months
+):
+    from eemeter.eemeter.common.features import (
+        estimate_hour_of_week_occupancy,
+        fit_temperature_bins,
+    )
+    from eemeter.eemeter.models.hourly.design_matrices import (
+        create_caltrack_hourly_segmented_design_matrices,
+    )
+    from eemeter.eemeter.models.hourly.model import (
+        fit_model_segments_from_monthly_stats,
+    )
+    from eemeter.eemeter.models.hourly.segmentation import (
+        fit_model_segments,
+        segment_time_series,
+    )
+
+    segmentation = segment_time_series(preliminary_design_matrix.index, segment_type)
+    occupancy_lookup = estimate_hour_of_week_occupancy(
+        preliminary_design_matrix, segmentation=segmentation
+    )
+    occupied_bins, unoccupied_bins = fit_temperature_bins(
+        preliminary_design_matrix,
+        segmentation=segmentation,
+        occupancy_lookup=occupancy_lookup,
+    )
+    if missing_months:
+        # no meter data from july to september, and only mornings in october
+        month = preliminary_design_matrix.index.month
+        missing = ((month >= 7) & (month <= 9)) | (
+            (month == 10) & (preliminary_design_matrix.index.hour >= 12)
+        )
+        preliminary_design_matrix = preliminary_design_matrix.copy()
+        preliminary_design_matrix.loc[missing, "meter_value"] = np.nan
+
+    segmented_design_matrices = create_caltrack_hourly_segmented_design_matrices(
+        preliminary_design_matrix,
+        segmentation,
+        occupancy_lookup,
+        occupied_bins,
+        unoccupied_bins,
+        segment_views=True,
+    )
+
+    expected = fit_model_segments(
+        segmented_design_matrices, fit_caltrack_hourly_model_segment
+    )
+    result = fit_model_segments_from_monthly_stats(
+        preliminary_design_matrix,
+        segmentation,
+        occupancy_lookup,
+        occupied_bins,
+        unoccupied_bins,
+    )
+
+    assert len(result) == len(expected)
+    for segment_model, expected_model in zip(result, expected):
+        assert segment_model.segment_name == expected_model.segment_name
+        assert segment_model.formula == expected_model.formula
+        assert [w.json() for w in segment_model.warnings] == [
+            w.json() for w in expected_model.warnings
+        ]
+        if expected_model.model is None:
+            assert segment_model.model is None
+            assert segment_model.totals_metrics is None
+            continue
+
+        assert list(segment_model.model_params) == list(expected_model.model_params)
+        assert np.allclose(
+            list(segment_model.model_params.values()),
+            list(expected_model.model_params.values()),
+            rtol=1e-6,
+            atol=1e-6,
+        )
+        fittedvalues = segment_model.model.fittedvalues
+        expected_fittedvalues = expected_model.model.fittedvalues
+        assert fittedvalues.index.equals(expected_fittedvalues.index)
+        assert np.allclose(
+            fittedvalues, expected_fittedvalues, atol=1e-5, equal_nan=True
+        )
+        metrics = segment_model.totals_metrics
+        expected_metrics = expected_model.totals_metrics
+        assert metrics.observed_length == expected_metrics.observed_length
+        assert metrics.rmse == pytest.approx(expected_metrics.rmse, nan_ok=True)
+
+    if missing_months and segment_type == "one_month":
+        assert [m.segment_name for m in result if m.model is None] == [
+            "jul",
+            "aug",
+            "sep",
+        ]
+
+
+def test_hourly_model_fit_method_monthly_stats():
+    from eemeter.eemeter.models.hourly import HourlyBaselineData, HourlyModel
+    from eemeter.eemeter.samples import load_sample
+
+    meter_data, temperature_data, _ = load_sample("il-electricity-cdd-hdd-hourly")
+    baseline = HourlyBaselineData.from_series(
+        meter_data[: 24 * 365], temperature_data, is_electricity_data=True
+    )
+
+    model = HourlyModel().fit(baseline)
+    stats_model = HourlyModel({"fit_method": "monthly_stats"}).fit(baseline)
+    assert stats_model.model_process_variables.segmented_design_matrices is None
+
+    result = model.predict(baseline)
+    stats_result = stats_model.predict(baseline)
+    assert np.allclose(
+        stats_result["predicted"], result["predicted"], atol=1e-5, equal_nan=True
+    )
+
+    with pytest.raises(ValueError):
+        HourlyModel({"fit_method": "unknown"})
+
+
+@pytest.mark.parametrize("segment_type", ["single", "three_month_weighted"])
+def test_hourly_model_fit_segment_views(segment_type):
+    from eemeter.eemeter.models.hourly import HourlyBaselineData, HourlyModel
+    from eemeter.eemeter.models.hourly.design_matrices import (
+        create_caltrack_hourly_segmented_design_matrices,
+    )
+    from eemeter.eemeter.samples import load_sample
+
+    meter_data, temperature_data, _ = load_sample("il-electricity-cdd-hdd-hourly")
+    baseline = HourlyBaselineData.from_series(
+        meter_data[: 24 * 365], temperature_data, is_electricity_data=True
+    )
+    model = HourlyModel({"segment_type": segment_type}).fit(baseline)
+
+    # design matrices only hold the rows of their segment
+    variables = model.model_process_variables
+    segmented_design_matrices = variables.segmented_design_matrices
+    for segment_name, segment_weights in variables.segmentation.items():
+        assert len(segmented_design_matrices[segment_name]) == (
+            (segment_weights > 0).sum()
+        )
+
+    # and fit the same coefficients as weighted copies of all rows
+    expected = fit_caltrack_hourly_model(
+        create_caltrack_hourly_segmented_design_matrices(
+            variables.preliminary_design_matrix,
+            variables.segmentation,
+            variables.occupancy_lookup,
+            variables.occupied_temperature_bins,
+            variables.unoccupied_temperature_bins,
+        ),
+        variables.occupancy_lookup,
+        variables.occupied_temperature_bins,
+        variables.unoccupied_temperature_bins,
+        segment_type,
+    )
+    for segment_model, expected_model in zip(
+        model.model.model.segment_models, expected.model.segment_models
+    ):
+        assert list(segment_model.model_params) == list(expected_model.model_params)
+        assert np.allclose(
+            list(segment_model.model_params.values()),
+            list(expected_model.model_params.values()),
+        )
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_hourly_model_segment_executor(executor):
+    from eemeter.eemeter.models.hourly import HourlyBaselineData, HourlyModel
+    from eemeter.eemeter.samples import load_sample
+
+    meter_data, temperature_data, _ = load_sample("il-electricity-cdd-hdd-hourly")
+    baseline = HourlyBaselineData.from_series(
+        meter_data[: 24 * 365], temperature_data, is_electricity_data=True
+    )
+
+    model = HourlyModel().fit(baseline)
+    parallel_model = HourlyModel(
+        {"segment_executor": executor, "segment_max_workers": 2}
+    ).fit(baseline)
+
+    assert parallel_model.to_dict() == model.to_dict()
+
+    with pytest.raises(ValueError):
+        HourlyModel({"segment_executor": "gpu"})
+
+
+@pytest.mark.parametrize("fit_method", ["design_matrices", "monthly_stats"])
+def test_hourly_model_predict_in_sample(fit_method):
+    from eemeter.eemeter.models.hourly import HourlyBaselineData, HourlyModel
+    from eemeter.eemeter.samples import load_sample
+
+    meter_data, temperature_data, _ = load_sample("il-electricity-cdd-hdd-hourly")
+    baseline = HourlyBaselineData.from_series(
+        meter_data[: 24 * 365], temperature_data, is_electricity_data=True
+    )
+    model = HourlyModel({"fit_method": fit_method}).fit(baseline)
+
+    index = baseline.df.index
+    prediction = model.model.predict(index, baseline.df["temperature"]).result
+    in_sample = model.model.predict_in_sample(index).result
+    assert in_sample.index.equals(index)
+
+    # segment models only keep the fitted values of their own rows
+    segment_models = model.model.model.segment_models
+    assert sum(len(m.model.fittedvalues) for m in segment_models) <= len(index)
+
+    # only the rows the segment models were fit on have fitted values
+    fitted = in_sample.predicted_usage.notna()
+    assert fitted.sum() > 0.99 * len(index)
+    assert np.allclose(
+        in_sample.predicted_usage[fitted], prediction.predicted_usage[fitted]
+    )
+
+    # baseline residuals still cover the rows without a fitted value
+    observed = baseline.df["observed"]
+    resid = (observed - prediction.predicted_usage).dropna()
+    for month, unc_vars in model._autocorr_unc_vars.items():
+        in_month = resid.index.month == month
+        assert unc_vars["mean_baseline_usage"] == np.mean(
+            observed[resid.index][in_month]
+        )
+        assert np.isclose(unc_vars["MSE"], np.mean(resid[in_month] ** 2))
+
+
+@pytest.mark.parametrize("segment_type", ["single", "three_month_weighted"])
+def test_hourly_model_predict_uncertainty(segment_type):
+    from eemeter.common.utils import t_stat
+    from eemeter.eemeter.models.hourly import (
+        HourlyBaselineData,
+        HourlyModel,
+        HourlyReportingData,
+    )
+    from eemeter.eemeter.samples import load_sample
+
+    meter_data, temperature_data, _ = load_sample("il-electricity-cdd-hdd-hourly")
+    baseline = HourlyBaselineData.from_series(
+        meter_data[: 24 * 365], temperature_data, is_electricity_data=True
+    )
+    reporting = HourlyReportingData.from_series(
+        meter_data[24 * 365 : 24 * 500], temperature_data, is_electricity_data=True
+    )
+    model = HourlyModel({"segment_type": segment_type}).fit(baseline)
+    result = model.predict(reporting)
+
+    # ASHRAE 14 uncertainty, month by month
+    for month_n, unc_vars in model._autocorr_unc_vars.items():
+        if month_n == "all":
+            month_result = result
+        else:
+            month_result = result[result.index.month == month_n]
+        m = len(month_result)
+        if m == 0:
+            continue
+
+        n = unc_vars["n"]
+        n_prime = unc_vars["n_prime"]
+        total_unc = (
+            1.26
+            * t_stat(model.alpha, m, tail=2)
+            * month_result["observed"].sum()
+            / (m * unc_vars["mean_baseline_usage"])
+            * np.sqrt(unc_vars["MSE"] * n / n_prime * (1 + 2 / n_prime) * m)
+        )
+        assert np.allclose(
+            month_result["predicted_uncertainty"],
+            np.sqrt(total_unc**2 / m),
+            rtol=1e-12,
+        )
@@ -32,7 +32,14 @@ from eemeter.eemeter.common.features import (
     fit_temperature_bins,
     merge_features,
 )
-from eemeter.eemeter.models.hourly.segmentation import segment_time_series
+from eemeter.eemeter.common.features import (
+    _estimate_hour_of_week_occupancy,
+    _grouped_temperature_features,
+)
+from eemeter.eemeter.models.hourly.segmentation import (
+    iterate_segmented_dataset,
+    segment_time_series,
+)
 
 
 def test_compute_temperature_features_no_freq_index(
@@ -841,6 +848,96 @@ def test_compute_temperature_features_empty_meter_data():
     assert round(df.temperature_mean.sum()) == 0
 
 
+@pytest.mark.parametrize("degree_day_method", ["daily", "hourly"])
+@pytest.mark.parametrize("use_mean_daily_values", [True, False])
+def test_compute_temperature_features_matches_grouped_aggregation(
+    il_electricity_cdd_hdd_billing_monthly, degree_day_method, use_mean_daily_values
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    # knock out whole days and scattered hours to exercise the coverage limits
+    temperature_data = temperature_data.copy()
+    temperature_data.iloc[1000:1200] = np.nan
+    temperature_data.iloc[::7] = np.nan
+
+    kwargs = dict(
+        heating_balance_points=[50, 55.5, 60],
+        cooling_balance_points=[65, 70],
+        data_quality=True,
+        temperature_mean=True,
+        degree_day_method=degree_day_method,
+        percent_hourly_coverage_per_day=0.5,
+        percent_hourly_coverage_per_billing_period=0.9,
+        use_mean_daily_values=use_mean_daily_values,
+    )
+    df = compute_temperature_features(
+        meter_data.index, temperature_data, keep_partial_nan_rows=True, **kwargs
+    )
+    expected = _grouped_temperature_features(
+        meter_data.index, temperature_data, tolerance=None, **kwargs
+    ).astype(float)
+    expected = expected.iloc[:-1].reindex(expected.index)
+
+    assert df.temperature_null.sum() > 0
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+
+@pytest.mark.parametrize(
+    "sample", ["il_electricity_cdd_hdd_daily", "il_electricity_cdd_hdd_billing_monthly"]
+)
+def test_compute_temperature_features_means_match_grouped_aggregation_exactly(
+    request, sample
+):
+    # model fits are sensitive to the last bits of the temperature means
+    data = request.getfixturevalue(sample)
+    meter_data = data["meter_data"]
+    temperature_data = data["temperature_data"].copy()
+    temperature_data.iloc[::7] = np.nan
+
+    kwargs = dict(
+        heating_balance_points=[60],
+        cooling_balance_points=[65],
+        data_quality=False,
+        temperature_mean=True,
+        degree_day_method="daily",
+        percent_hourly_coverage_per_day=0.5,
+        percent_hourly_coverage_per_billing_period=0.9,
+        use_mean_daily_values=True,
+    )
+    df = compute_temperature_features(
+        meter_data.index, temperature_data, keep_partial_nan_rows=True, **kwargs
+    )
+    expected = _grouped_temperature_features(
+        meter_data.index, temperature_data, tolerance=None, **kwargs
+    )
+    expected = expected.iloc[:-1].reindex(expected.index)
+
+    np.testing.assert_array_equal(df.temperature_mean, expected.temperature_mean)
+
+
+def test_compute_temperature_features_index_timezone_and_resolution(
+    il_electricity_cdd_hdd_billing_monthly,
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    kwargs = dict(heating_balance_points=[60], cooling_balance_points=[65])
+    expected = compute_temperature_features(
+        meter_data.index, temperature_data, **kwargs
+    )
+
+    # periods are matched by instant, whatever the timezone or resolution
+    meter_index = meter_data.index.tz_convert("America/Chicago")
+    if hasattr(meter_index, "as_unit"):
+        meter_index = meter_index.as_unit("s")
+    df = compute_temperature_features(meter_index, temperature_data, **kwargs)
+    pd.testing.assert_frame_equal(
+        df.reset_index(drop=True), expected.reset_index(drop=True)
+    )
+
+    with pytest.raises(ValueError):
+        compute_temperature_features(meter_data.index[::-1], temperature_data, **kwargs)
+
+
 def test_merge_features():
     index = pd.date_range("2017-01-01", periods=100, freq="H", tz="UTC")
     features = merge_features(
@@ -1024,6 +1121,28 @@ def test_estimate_hour_of_week_occupancy_one_month_segmentation(
     assert occupancy.sum().sum() == 84.0
 
 
+@pytest.mark.parametrize("segment_type", [None, "one_month", "three_month_weighted"])
+def test_estimate_hour_of_week_occupancy_matches_segment_fits(
+    occupancy_precursor, segment_type
+):
+    # a partial year leaves some segments without data
+    data = occupancy_precursor.iloc[2000:6000]
+    segmentation = None
+    if segment_type is not None:
+        segmentation = segment_time_series(data.index, segment_type=segment_type)
+
+    occupancy = estimate_hour_of_week_occupancy(data, segmentation=segmentation)
+
+    expected = {
+        "occupancy"
+        if segment_name is None
+        else segment_name: (_estimate_hour_of_week_occupancy(segment_data, 0.65))
+        for segment_name, segment_data in iterate_segmented_dataset(data, segmentation)
+    }
+    expected = pd.DataFrame(expected, columns=occupancy.columns)
+    pd.testing.assert_frame_equal(occupancy, expected)
+
+
 @pytest.fixture
 def temperature_means():
     index = pd.date_range("2017-01-01", periods=2000, freq="H", tz="UTC")
@@ -1144,6 +1263,16 @@ def test_fit_temperature_bins_empty(temperature_means):
     assert bins.sum().sum() == 0
 
 
+def test_fit_temperature_bins_right_closed_counts():
+    index = pd.date_range("2017-01-01", periods=65, freq="H", tz="UTC")
+    temps = pd.DataFrame(
+        {"temperature_mean": [45.0] * 20 + [60.0] * 20 + [80.0] * 20 + [np.nan] * 5},
+        index=index,
+    )
+    bins = fit_temperature_bins(temps)
+    assert bins.keep_bin_endpoint.tolist() == [False, True, False, True, False, False]
+
+
 def test_compute_temperature_bin_features(temperature_means):
     temps = temperature_means.temperature_mean
     bin_features = compute_temperature_bin_features(temps, [25, 75])
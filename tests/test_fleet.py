@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2024 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from eemeter.eemeter import (
+    BillingBaselineData,
+    DailyBaselineData,
+    DailyModel,
+    DailyReportingData,
+    fit_fleet,
+    iter_fleet_data,
+)
+from eemeter.eemeter.common.transform import get_baseline_data
+
+
+@pytest.fixture
+def daily_fleet(il_electricity_cdd_hdd_daily):
+    meter_data = il_electricity_cdd_hdd_daily["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
+    blackout_start_date = il_electricity_cdd_hdd_daily["blackout_start_date"]
+
+    meter_data, _ = get_baseline_data(meter_data, end=blackout_start_date, max_days=365)
+    df = pd.concat(
+        [
+            temperature_data.resample("D").mean().rename("temperature"),
+            meter_data["value"].rename("observed"),
+        ],
+        axis=1,
+    ).reindex(meter_data.index)
+
+    # second meter has too little data and is disqualified
+    fleet = pd.concat({"good": df, "short": df.iloc[:40]}, names=["id", "datetime"])
+    return df, fleet
+
+
+def test_fit_fleet_serial(daily_fleet):
+    df, fleet = daily_fleet
+    results = {res["id"]: res for res in fit_fleet(fleet, True, max_workers=1)}
+
+    assert set(results) == {"good", "short"}
+
+    good = results["good"]
+    model = DailyModel().fit(DailyBaselineData(df, is_electricity_data=True))
+    assert good["success"]
+    assert good["exception"] is None
+    assert good["error"] == model.error
+    assert good["params"]["submodels"] == model.to_dict()["submodels"]
+    assert good["timings"]["total"] >= good["timings"]["fit"] > 0
+
+    short = results["short"]
+    assert not short["success"]
+    assert short["params"] is None
+    assert short["exception"].startswith("DataSufficiencyError")
+    assert len(short["disqualification"]) > 0
+
+
+def test_fit_fleet_process_pool(daily_fleet):
+    df, fleet = daily_fleet
+    serial = {res["id"]: res for res in fit_fleet(fleet, True, max_workers=1)}
+    pooled = {
+        res["id"]: res for res in fit_fleet(fleet, True, max_workers=2, chunksize=2)
+    }
+
+    assert set(pooled) == set(serial)
+    for meter_id in serial:
+        assert pooled[meter_id]["success"] == serial[meter_id]["success"]
+        assert pooled[meter_id]["error"] == serial[meter_id]["error"]
+
+
+def test_fit_fleet_process_pool_many_chunks(daily_fleet):
+    df, _ = daily_fleet
+    # more chunks than are kept in flight at once
+    fleet = pd.concat(
+        {meter_id: df.iloc[:40] for meter_id in range(6)}, names=["id", "datetime"]
+    )
+    results = list(fit_fleet(fleet, True, max_workers=2))
+
+    assert sorted(res["id"] for res in results) == list(range(6))
+    assert not any(res["success"] for res in results)
+
+
+def test_fit_fleet_invalid_input(daily_fleet):
+    df, fleet = daily_fleet
+    with pytest.raises(ValueError):
+        list(fit_fleet(df, True))
+    with pytest.raises(ValueError):
+        list(fit_fleet(fleet, True, model="hourly"))
+    with pytest.raises(ValueError):
+        list(fit_fleet(fleet, True, chunksize=0))
+
+
+@pytest.fixture
+def hourly_meters(il_electricity_cdd_hdd_hourly):
+    meter_data = il_electricity_cdd_hdd_hourly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_hourly["temperature_data"]
+
+    index = pd.date_range(
+        "2015-12-01", "2017-01-05", freq="H", tz="America/Chicago", inclusive="left"
+    )
+    index.name = "datetime"
+    long_df = pd.DataFrame(
+        {
+            "temperature": temperature_data.tz_convert(index.tz).reindex(index),
+            "observed": meter_data["value"].tz_convert(index.tz).reindex(index),
+        }
+    )
+    df = long_df.loc["2016-01-01":"2016-04-30"]
+
+    gaps = df.copy()
+    gaps.loc[gaps.sample(frac=0.1, random_state=1).index, "observed"] = np.nan
+    gaps.loc[gaps.sample(frac=0.02, random_state=2).index, "observed"] = 0
+    gaps.iloc[1000:1100, 1] = np.nan
+    gaps.iloc[2000:2600, 0] = np.nan
+
+    daily_gaps = df.resample("D").agg({"temperature": "mean", "observed": "sum"})
+    daily_gaps.iloc[50:53, 1] = np.nan
+
+    return {
+        "complete": df,
+        "gaps": gaps,
+        # ends at a local midnight, leaving the last day without coverage
+        "short_last_day": df.loc[:"2016-03-12 00:00"],
+        "daily": df.resample("D").agg({"temperature": "mean", "observed": "sum"}),
+        "daily_gaps": daily_gaps,
+        # spans run past each other
+        "short": df.loc[:"2016-01-10"],
+        "long_daily": long_df.resample("D").agg(
+            {"temperature": "mean", "observed": "sum"}
+        ),
+        # not handled by the batched path
+        "missing_row": long_df.drop(long_df.index[4000]),
+        "two_hourly": df.iloc[::2],
+    }
+
+
+@pytest.mark.parametrize(
+    "reporting, data_cls", [(False, DailyBaselineData), (True, DailyReportingData)]
+)
+def test_iter_fleet_data_matches_data_class(hourly_meters, reporting, data_cls):
+    # meters not in first appearance order
+    fleet = pd.concat(hourly_meters, names=["id", "datetime"]).sort_index(
+        level="datetime", sort_remaining=False
+    )
+    results = list(iter_fleet_data(fleet, True, reporting=reporting))
+
+    assert [meter_id for meter_id, _ in results] == list(
+        fleet.index.get_level_values("id").unique()
+    )
+    for meter_id, data in results:
+        expected = data_cls(hourly_meters[meter_id], is_electricity_data=True)
+        assert type(data) is data_cls
+        pd.testing.assert_frame_equal(data.df, expected.df, check_freq=False)
+        assert [w.json() for w in data.warnings] == [
+            w.json() for w in expected.warnings
+        ]
+        assert [dq.json() for dq in data.disqualification] == [
+            dq.json() for dq in expected.disqualification
+        ]
+
+
+def test_iter_fleet_data_billing(il_electricity_cdd_hdd_billing_monthly):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    df = pd.concat(
+        [
+            temperature_data.rename("temperature"),
+            meter_data["value"].rename("observed"),
+        ],
+        axis=1,
+    )
+    df.index.name = "datetime"
+    fleet = pd.concat({"a": df, "b": df.iloc[: len(df) // 2]}, names=["id", "datetime"])
+
+    results = dict(iter_fleet_data(fleet, True, model="billing"))
+
+    assert list(results) == ["a", "b"]
+    expected = BillingBaselineData(df, is_electricity_data=True)
+    assert isinstance(results["a"], BillingBaselineData)
+    pd.testing.assert_frame_equal(results["a"].df, expected.df)
+
+
+def test_iter_fleet_data_invalid_input(daily_fleet):
+    df, fleet = daily_fleet
+    with pytest.raises(ValueError):
+        list(iter_fleet_data(df, True))
+    with pytest.raises(ValueError):
+        list(iter_fleet_data(fleet, True, model="hourly"))
@@ -18,15 +18,20 @@
 
 """
 import json
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 import pytest
 
+from eemeter.eemeter.models.hourly import segmentation as segmentation_module
 from eemeter.eemeter.models.hourly.segmentation import (
     CalTRACKSegmentModel,
     SegmentedModel,
+    SegmentView,
     segment_time_series,
     iterate_segmented_dataset,
+    fit_model_segments,
 )
 
 
@@ -116,6 +121,62 @@ def test_segment_time_series_drop_zero_weight_segments(index_8760):
     assert weights.sum().sum() == 100.0
 
 
+def test_segment_time_series_three_month_weighted_month_weights():
+    index = pd.date_range("2017-12-31", periods=3, freq="D", tz="UTC")
+    weights = segment_time_series(index, segment_type="three_month_weighted")
+    assert weights.loc[:, "nov-dec-jan-weighted"].tolist() == [1.0, 0.5, 0.5]
+    assert weights.loc[:, "dec-jan-feb-weighted"].tolist() == [0.5, 1.0, 1.0]
+    assert weights.loc[:, "jan-feb-mar-weighted"].tolist() == [0.0, 0.5, 0.5]
+    assert weights.loc[:, "oct-nov-dec-weighted"].tolist() == [0.5, 0.0, 0.0]
+
+
+def test_segment_time_series_reuses_months_of_index(index_8760):
+    weights = segment_time_series(index_8760, segment_type="one_month")
+    weights.iloc[:, :] = -1.0
+
+    # an equal index reuses the cached months, but not the returned weights
+    repeated_weights = segment_time_series(index_8760.copy(), segment_type="one_month")
+    assert repeated_weights.sum().sum() == 8760.0
+    assert repeated_weights["feb"].sum() == 672.0
+
+    shifted_weights = segment_time_series(
+        index_8760[:1000] + pd.Timedelta(days=31), segment_type="one_month"
+    )
+    assert shifted_weights["jan"].sum() == 0.0
+    assert shifted_weights["feb"].sum() == 672.0
+
+
+def test_segment_time_series_weights_cache_keys(index_8760, monkeypatch):
+    cache = OrderedDict()
+    monkeypatch.setattr(segmentation_module, "_segment_weights_cache", cache)
+
+    # a regular index is keyed on its start, freq and length
+    segment_time_series(index_8760, segment_type="one_month")
+    segment_time_series(index_8760.copy(), segment_type="one_month")
+    assert len(cache) == 1
+    segment_time_series(index_8760, segment_type="three_month")
+    assert len(cache) == 2
+
+    shifted_weights = segment_time_series(
+        index_8760[:1000] + pd.Timedelta(days=31), segment_type="one_month"
+    )
+    assert len(cache) == 3
+    assert shifted_weights["jan"].sum() == 0.0
+    assert shifted_weights["feb"].sum() == 672.0
+
+    # an irregular index is keyed on its identity
+    irregular_index = index_8760[[0, 2, 3]]
+    assert irregular_index.freq is None
+    segment_time_series(irregular_index, segment_type="one_month")
+    segment_time_series(irregular_index, segment_type="one_month")
+    assert len(cache) == 4
+    other_weights = segment_time_series(
+        irregular_index + pd.Timedelta(days=31), segment_type="one_month"
+    )
+    assert len(cache) == 5
+    assert other_weights["feb"].sum() == 3.0
+
+
 @pytest.fixture
 def dataset():
     index = pd.date_range("2017-01-01", periods=1000, freq="H", tz="UTC")
@@ -160,6 +221,60 @@ def test_iterate_segmented_dataset_with_segmentation(dataset, segmentation):
     assert data.sum().sum() == 0.0
 
 
+@pytest.mark.parametrize("segment_type", [None, "one_month", "three_month_weighted"])
+def test_iterate_segmented_dataset_segment_views(dataset, segment_type):
+    dataset = dataset.assign(a=np.arange(1000.0))
+    segmentation = None
+    if segment_type is not None:
+        segmentation = segment_time_series(dataset.index, segment_type=segment_type)
+
+    segments = list(iterate_segmented_dataset(dataset, segmentation=segmentation))
+    segment_views = list(
+        iterate_segmented_dataset(
+            dataset, segmentation=segmentation, segment_views=True
+        )
+    )
+    assert len(segment_views) == len(segments)
+    for (segment_name, data), (view_segment_name, view) in zip(segments, segment_views):
+        assert view_segment_name == segment_name
+        assert isinstance(view, SegmentView)
+        assert view.data is dataset
+        assert view.index.equals(data.index)
+        pd.testing.assert_frame_equal(view.to_frame(), data, check_dtype=False)
+        pd.testing.assert_frame_equal(
+            view.to_frame(["b"]), data[["b", "weight"]], check_dtype=False
+        )
+
+
+def _fit_weight_sum(segment_name, segment_data):
+    return segment_name, segment_data.weight.sum()
+
+
+@pytest.mark.parametrize("executor", [None, "thread", "process"])
+def test_fit_model_segments(dataset, segmentation, executor):
+    segmented_dataset_dict = dict(
+        iterate_segmented_dataset(dataset, segmentation=segmentation)
+    )
+    segment_models = fit_model_segments(
+        segmented_dataset_dict, _fit_weight_sum, executor=executor, max_workers=2
+    )
+    assert [name for name, _ in segment_models] == list(segmentation.columns)
+    assert [weight for _, weight in segment_models][:3] == [744.0, 256.0, 0.0]
+
+
+def test_fit_model_segments_invalid_executor(dataset, segmentation):
+    segmented_dataset_dict = dict(
+        iterate_segmented_dataset(dataset, segmentation=segmentation)
+    )
+    with pytest.raises(ValueError):
+        fit_model_segments(segmented_dataset_dict, _fit_weight_sum, executor="gpu")
+
+    with pytest.raises(ValueError):
+        fit_model_segments(
+            segmented_dataset_dict, _fit_weight_sum, executor="thread", max_workers=0
+        )
+
+
 def test_iterate_segmented_dataset_with_processor(dataset, segmentation):
     feature_processor_segment_names = []
 
@@ -205,6 +320,38 @@ def test_segment_model():
     assert prediction.sum() == 4
 
 
+@pytest.mark.parametrize(
+    "model_params",
+    [
+        {"C(hour_of_week)[0]": 1.5, "C(hour_of_week)[2]": -2.0, "a": 0.5, "b": 3.0},
+        {"C(hour_of_week)[0]": 1.5, "C(hour_of_week)[1]": 2.0, "a": 0.5},
+        {"C(hour_of_week)[0]": 1.5, "C(hour_of_week)[1]": np.nan, "a": 0.5},
+        {"C(hour_of_week)[0]": 1.5, "C(hour_of_week)[1]": 2.0, "a": np.nan},
+    ],
+)
+def test_segment_model_predict_matches_design_matrix(model_params):
+    segment_model = CalTRACKSegmentModel(
+        segment_name="segment",
+        model=None,
+        formula="meter_value ~ C(hour_of_week) + a + b - 1",
+        model_params=model_params,
+        warnings=None,
+    )
+    index = pd.date_range("2017-01-01", periods=6, freq="H", tz="UTC")
+    data = pd.DataFrame(
+        {
+            "hour_of_week": pd.Categorical([0, 1, 2, 1, 0, 2], categories=[0, 1, 2]),
+            "a": [1.0, 2.0, 3.0, np.nan, 5.0, 6.0],
+            "b": [0.5, 0.25, 0.0, 1.0, np.nan, 2.0],
+        },
+        index=index,
+    )
+    prediction = segment_model.predict(data)
+    expected = segment_model._predict_design_matrix(data)
+    assert prediction.name == "predicted_usage"
+    pd.testing.assert_series_equal(prediction, expected, rtol=1e-12)
+
+
 def test_segmented_model():
     segment_model = CalTRACKSegmentModel(
         segment_name="jan",
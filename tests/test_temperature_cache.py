@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2024 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from eemeter.eemeter import (
+    BillingBaselineData,
+    BillingReportingData,
+    DailyBaselineData,
+    DailyReportingData,
+    HourlyBaselineData,
+    HourlyReportingData,
+    TemperatureFeatureCache,
+    WeatherStation,
+)
+from eemeter.eemeter.common.data_processor_utilities import as_freq
+from eemeter.eemeter.common.transform import get_baseline_data
+
+
+@pytest.fixture
+def temperature_data(il_electricity_cdd_hdd_hourly):
+    return il_electricity_cdd_hdd_hourly["temperature_data"]
+
+
+@pytest.fixture
+def daily_meter_data(il_electricity_cdd_hdd_daily):
+    meter_data, _ = get_baseline_data(
+        il_electricity_cdd_hdd_daily["meter_data"],
+        end=il_electricity_cdd_hdd_daily["blackout_start_date"],
+        max_days=365,
+    )
+    return meter_data
+
+
+def _assert_data_equal(data, expected):
+    assert_frame_equal(data.df, expected.df)
+    assert [w.qualified_name for w in data.warnings] == [
+        w.qualified_name for w in expected.warnings
+    ]
+    assert [d.qualified_name for d in data.disqualification] == [
+        d.qualified_name for d in expected.disqualification
+    ]
+
+
+def test_cache_lru_eviction():
+    cache = TemperatureFeatureCache(maxsize=2)
+    calls = []
+
+    def compute(value):
+        return lambda: calls.append(value) or value
+
+    assert cache.get("a", compute(1)) == 1
+    assert cache.get("b", compute(2)) == 2
+    assert cache.get("a", compute(3)) == 1
+    # "b" is the least recently used entry
+    assert cache.get("c", compute(4)) == 4
+    assert cache.get("b", compute(5)) == 5
+    assert calls == [1, 2, 4, 5]
+    assert cache.cache_info() == (1, 4, 2, 2)
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+    with pytest.raises(ValueError):
+        TemperatureFeatureCache(maxsize=0)
+
+
+def test_cache_threads():
+    cache = TemperatureFeatureCache(maxsize=4)
+    keys = [i % 7 for i in range(2000)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        values = list(pool.map(lambda key: cache.get(key, lambda: key * 10), keys))
+
+    assert values == [key * 10 for key in keys]
+    hits, misses, maxsize, currsize = cache.cache_info()
+    assert hits + misses == len(keys)
+    assert currsize == maxsize == 4
+
+
+def test_cache_persistence(tmp_path, temperature_data):
+    station = WeatherStation(
+        temperature_data, "722880", cache=TemperatureFeatureCache(path=tmp_path)
+    )
+    features = station.temperature_features("America/Chicago")
+    assert station.cache.cache_info().misses == 1
+
+    # a new cache on the same directory loads the entry instead of computing it
+    station = WeatherStation(
+        temperature_data, "722880", cache=TemperatureFeatureCache(path=tmp_path)
+    )
+    assert_frame_equal(station.temperature_features("America/Chicago"), features)
+    assert station.cache.cache_info() == (1, 0, 128, 1)
+
+
+def test_station_key(temperature_data):
+    cache = TemperatureFeatureCache()
+    assert WeatherStation(temperature_data, 722880).key == "722880"
+
+    station = WeatherStation(temperature_data.to_frame(), cache=cache)
+    assert station.key.startswith("sha1:")
+    assert WeatherStation(temperature_data.copy(), cache=cache).key == station.key
+    assert WeatherStation(temperature_data + 1, cache=cache).key != station.key
+
+    # entries are keyed by timezone and frequency
+    station.temperature_features("UTC")
+    station.temperature_features("UTC", "H")
+    station.temperature_features("America/Chicago")
+    station.temperature_features("UTC")
+    assert cache.cache_info() == (1, 3, 128, 3)
+
+    with pytest.raises(ValueError):
+        station.temperature_features("UTC", "M")
+    with pytest.raises(ValueError):
+        WeatherStation(temperature_data.tz_localize(None))
+    with pytest.raises(ValueError):
+        WeatherStation(temperature_data.iloc[:0])
+
+
+@pytest.mark.parametrize(
+    "data_cls", [DailyBaselineData, DailyReportingData, BillingBaselineData]
+)
+def test_station_daily_data(data_cls, temperature_data, daily_meter_data):
+    cache = TemperatureFeatureCache()
+    station = WeatherStation(temperature_data, "722880", cache=cache)
+
+    data = data_cls.from_series(daily_meter_data, station, True)
+    expected = data_cls.from_series(daily_meter_data, temperature_data, True)
+    _assert_data_equal(data, expected)
+    assert cache.cache_info().misses == 1
+
+    # a second meter served by the station reuses its features
+    meter_data = daily_meter_data["2016-01-01":"2016-08-31"]
+    data = data_cls.from_series(meter_data, station, True)
+    expected = data_cls.from_series(meter_data, temperature_data, True)
+    _assert_data_equal(data, expected)
+    assert cache.cache_info() == (1, 1, 128, 1)
+
+
+@pytest.mark.parametrize("data_cls", [DailyBaselineData, DailyReportingData])
+def test_station_daily_data_from_arrays(data_cls, temperature_data):
+    # a station series from midnight resamples to the same days as the station
+    temperature_data = temperature_data["2015-12-01":]
+    index = pd.date_range("2015-11-25", "2016-06-30", freq="D", tz="UTC")
+    observed = np.arange(len(index), dtype=float)
+    cache = TemperatureFeatureCache()
+    station = WeatherStation(temperature_data, "722880", cache=cache)
+
+    resampled = as_freq(
+        temperature_data, "D", series_type="instantaneous", include_coverage=True
+    ).reindex(index)
+    data = data_cls.from_arrays(index, observed, station, True)
+    expected = data_cls.from_arrays(
+        index,
+        observed,
+        resampled["value"].to_numpy(),
+        True,
+        temperature_coverage=resampled["coverage"].fillna(0).to_numpy(),
+    )
+    _assert_data_equal(data, expected)
+    assert data.df["temperature"].isna().sum() > 0
+    assert cache.cache_info() == (0, 1, 128, 1)
+
+    with pytest.raises(ValueError):
+        data_cls.from_arrays(
+            index, observed, station, True, temperature_coverage=np.ones(len(index))
+        )
+
+
+@pytest.mark.parametrize("data_cls", [DailyReportingData, BillingReportingData])
+def test_station_reporting_data_without_meter(data_cls, temperature_data):
+    temperature_data = temperature_data["2016-01-01":"2016-06-30"]
+    station = WeatherStation(temperature_data, cache=TemperatureFeatureCache())
+
+    data = data_cls.from_series(None, station, True)
+    expected = data_cls.from_series(None, temperature_data, True)
+    _assert_data_equal(data, expected)
+
+
+def test_station_hourly_data(il_electricity_cdd_hdd_hourly):
+    meter_data = il_electricity_cdd_hdd_hourly["meter_data"]["2016-01-01":"2016-03-31"]
+    temperature_data = il_electricity_cdd_hdd_hourly["temperature_data"]
+    cache = TemperatureFeatureCache()
+    station = WeatherStation(temperature_data, "722880", cache=cache)
+
+    data = HourlyBaselineData.from_series(meter_data, station, True)
+    expected = HourlyBaselineData.from_series(meter_data, temperature_data, True)
+    assert_frame_equal(data.df, expected.df, check_names=False)
+
+    data = HourlyReportingData.from_series(meter_data, station, True)
+    expected = HourlyReportingData.from_series(meter_data, temperature_data, True)
+    assert_frame_equal(data.df, expected.df, check_names=False)
+    assert cache.cache_info() == (1, 1, 128, 1)
+
+
+@pytest.mark.parametrize("data_cls", [DailyBaselineData, BillingBaselineData])
+def test_station_daily_data_temperature_gaps(data_cls, temperature_data):
+    # hourly temperature with missing rows is resampled with as_freq
+    temperature_data = temperature_data.drop(
+        temperature_data.index[temperature_data.index.hour % 5 == 3][::7]
+    )
+    meter_data = pd.Series(
+        1.0, index=pd.date_range("2016-01-01", "2016-06-30", freq="D", tz="UTC")
+    ).to_frame("value")
+    cache = TemperatureFeatureCache()
+    station = WeatherStation(temperature_data, "722880", cache=cache)
+
+    for data in [meter_data, meter_data["2016-03-01":"2016-05-15"]]:
+        _assert_data_equal(
+            data_cls.from_series(data, station, True),
+            data_cls.from_series(data, temperature_data, True),
+        )
+    assert cache.cache_info() == (1, 1, 128, 1)
+    assert (station.key, "UTC", "as_freq") in cache._entries
+
+    # days with a meter reading which is missing from the temperature data are
+    # resampled without the cache
+    temperature_data = temperature_data.drop(pd.Timestamp("2016-01-03", tz="UTC"))
+    _assert_data_equal(
+        data_cls.from_series(
+            meter_data, WeatherStation(temperature_data, cache=cache), True
+        ),
+        data_cls.from_series(meter_data, temperature_data, True),
+    )
@@ -794,6 +794,28 @@ def test_as_freq_hourly_to_daily_include_coverage(il_electricity_cdd_hdd_hourly)
     assert round(meter_data.value.sum(), 1) == round(as_daily.value.sum(), 1) == 21926.0
 
 
+def test_as_freq_offset_cumulative_spreads_across_days():
+    index = pd.date_range("2020-01-01 12:00", periods=3, freq="D", tz="UTC")
+    series = pd.Series([24.0, 48.0, np.nan], index=index, name="value")
+    as_daily = as_freq(series, freq="D", include_coverage=True)
+    assert list(as_daily.index) == list(
+        pd.date_range("2020-01-01", periods=4, freq="D", tz="UTC")
+    )
+    assert as_daily.value.tolist()[:3] == [12.0, 36.0, 24.0]
+    assert as_daily.coverage.tolist()[:3] == [0.5, 1.0, 0.5]
+    assert as_daily.iloc[-1].isnull().all()
+
+
+def test_as_freq_instantaneous_include_coverage():
+    index = pd.date_range("2020-01-01 12:00", periods=3, freq="D", tz="UTC")
+    series = pd.Series([10.0, 20.0, np.nan], index=index, name="temperature")
+    as_daily = as_freq(
+        series, freq="D", series_type="instantaneous", include_coverage=True
+    )
+    assert as_daily.value.tolist()[:3] == [10.0, 15.0, 20.0]
+    assert as_daily.coverage.tolist()[:3] == [0.5, 1.0, 0.5]
+
+
 def test_clean_caltrack_billing_daily_data_billing(
     il_electricity_cdd_hdd_billing_monthly,
 ):